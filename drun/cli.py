@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import re
 import shutil
@@ -10,16 +11,20 @@ from pathlib import Path
 from typing import List, Optional, Tuple
 
 import click
+import httpx
 import typer
 
 from drun.commands.check import run_check
 from drun.commands.convert import apply_convert_filters, convert_curl, convert_har, convert_postman
 from drun.commands.fix import run_fix
+from drun.commands.load import run_load_test
+from drun.commands.run_workers import resolve_worker_count
 from drun.commands.run import run_cases
 from drun.commands.tags import run_tags
 from drun.commands.yaml_dump import build_cases_from_import, write_imported_cases
 from drun.extensions import require_importer
 from drun.utils.files import has_exact_child
+from drun.utils.logging import get_logger, setup_logging
 
 from drun.commands.quick import quick
 
@@ -217,6 +222,8 @@ _DEPRECATED_TO_LETTER = {
     "convert-openapi": "w",
     "server": "s",
     "export": "e",
+    "load": "l",
+    "worker": "d",
 }
 
 
@@ -640,6 +647,84 @@ def r(
         help="dry-run 参数实例最多展示数量",
         metavar="",
     ),
+    workers: int = typer.Option(
+        1,
+        "-workers",
+        help="并发执行的用例实例数，0 表示按 CPU 核数；大于 1 时各实例使用独立的环境/提取变量副本，-failfast 不中断已在执行的实例。例: -workers 8",
+        metavar="",
+    ),
+    parallel: str = typer.Option(
+        "thread",
+        "-parallel",
+        help="并发模式：thread(线程池)、process(多进程分片) 或 async(单事件循环)。例: -parallel async",
+        metavar="",
+    ),
+    max_connections: int = typer.Option(
+        100,
+        "-max-conns",
+        help="全局连接池最大连接数（所有用例实例共享）。例: -max-conns 200",
+        metavar="",
+    ),
+    max_keepalive: int = typer.Option(
+        20,
+        "-keepalive",
+        help="连接池保留的最大空闲长连接数，0 表示不复用连接。例: -keepalive 50",
+        metavar="",
+    ),
+    keepalive_expiry: float = typer.Option(
+        5.0,
+        "-keepalive-expiry",
+        help="空闲长连接保留时长（秒）。例: -keepalive-expiry 30",
+        metavar="",
+    ),
+    http2: bool = typer.Option(
+        False,
+        "-http2",
+        help="启用 HTTP/2 多路复用（需安装 drun[http2]）",
+        show_default=False,
+    ),
+    distribute: Optional[str] = typer.Option(
+        None,
+        "-distribute",
+        help="作为协调者监听 HOST:PORT，把用例实例分发给 drun d 工作节点执行；非本机地址需设置 DRUN_DIST_TOKEN。例: -distribute 0.0.0.0:8765",
+        metavar="",
+    ),
+    lease_timeout: float = typer.Option(
+        60.0,
+        "-lease-timeout",
+        help="工作节点租约超时（秒），超时未续约的批次重新入队。例: -lease-timeout 120",
+        metavar="",
+    ),
+    cassette: Optional[str] = typer.Option(
+        None,
+        "-cassette",
+        help="响应录制/回放文件（SQLite）。例: -cassette .drun/cassettes/api.db",
+        metavar="",
+    ),
+    cassette_mode: str = typer.Option(
+        "auto",
+        "-cassette-mode",
+        help="录制回放模式 record|replay|auto（auto 命中即回放，未命中则录制）。例: -cassette-mode replay",
+        metavar="",
+    ),
+    cassette_match: Optional[str] = typer.Option(
+        None,
+        "-cassette-match",
+        help="请求匹配规则（逗号分隔），默认 method,url,body。例: -cassette-match method,path,header:X-Tenant,ignore-query:ts",
+        metavar="",
+    ),
+    warmup: bool = typer.Option(
+        False,
+        "-warmup",
+        help="执行前预热：解析所有 base_url 并预先建立连接，预热耗时单独统计。例: -warmup",
+        show_default=False,
+    ),
+    dns_ttl: float = typer.Option(
+        30.0,
+        "-dns-ttl",
+        help="DNS 解析结果缓存秒数，0 表示不缓存。例: -dns-ttl 300",
+        metavar="",
+    ),
 ):
     """Run test cases or suites."""
     secrets_mode = (secrets or "plain").strip().lower()
@@ -654,6 +739,50 @@ def r(
         )
         raise typer.Exit(code=2)
 
+    if workers < 0:
+        typer.echo("[ERROR] Invalid -workers value. Use an integer >= 0.")
+        raise typer.Exit(code=2)
+
+    if dns_ttl < 0:
+        typer.echo("[ERROR] Invalid -dns-ttl value. Use a number >= 0.")
+        raise typer.Exit(code=2)
+
+    if max_connections < 1 or max_keepalive < 0 or keepalive_expiry < 0:
+        typer.echo(
+            "[ERROR] Invalid connection pool limits. Use -max-conns >= 1, -keepalive >= 0 and -keepalive-expiry >= 0."
+        )
+        raise typer.Exit(code=2)
+
+    parallel_mode = (parallel or "thread").strip().lower()
+    if parallel_mode not in {"thread", "process", "async"}:
+        typer.echo("[ERROR] Invalid -parallel value. Use one of: thread, process, async.")
+        raise typer.Exit(code=2)
+    if cassette and parallel_mode == "process":
+        # Each process would keep its own occurrence counters on one SQLite file.
+        typer.echo("[ERROR] -cassette cannot be combined with -parallel process.")
+        raise typer.Exit(code=2)
+
+    if distribute:
+        from drun.commands.run_distributed import check_bind_token, parse_bind
+        from drun.server.coordinator import TOKEN_ENV
+
+        try:
+            check_bind_token(parse_bind(distribute)[0], os.environ.get(TOKEN_ENV))
+        except ValueError as exc:
+            typer.echo(f"[ERROR] {exc}")
+            raise typer.Exit(code=2)
+        if lease_timeout <= 0:
+            typer.echo("[ERROR] Invalid -lease-timeout value. Use a number > 0.")
+            raise typer.Exit(code=2)
+        if cassette:
+            typer.echo("[ERROR] -cassette cannot be combined with -distribute.")
+            raise typer.Exit(code=2)
+
+    resolved_cassette_mode = (cassette_mode or "auto").strip().lower()
+    if resolved_cassette_mode not in {"record", "replay", "auto"}:
+        typer.echo("[ERROR] Invalid -cassette-mode value. Use one of: record, replay, auto.")
+        raise typer.Exit(code=2)
+
     resolved_reveal_secrets = secrets_mode == "plain"
     resolved_no_snippet = snippet_mode == "off"
     resolved_snippet_lang = (
@@ -684,9 +813,149 @@ def r(
         snippet_lang=resolved_snippet_lang,
         dry_run=dry_run,
         dry_run_limit=dry_run_limit,
+        workers=workers,
+        parallel=parallel_mode,
+        max_connections=max_connections,
+        max_keepalive=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2,
+        distribute=distribute,
+        lease_timeout=lease_timeout,
+        cassette=cassette,
+        cassette_mode=resolved_cassette_mode,
+        cassette_match=cassette_match,
+        warmup=warmup,
+        dns_ttl=dns_ttl,
     )
 
 
+@app.command("d")
+def worker(
+    url: str = typer.Argument(..., help="协调者地址（drun r -distribute 启动）。例: http://10.0.0.5:8765"),
+    batch: int = typer.Option(4, "-batch", help="每次领取的用例实例数。例: -batch 8", metavar=""),
+    workers: int = typer.Option(
+        1, "-workers", help="本节点并发执行的用例实例数，0 表示按 CPU 核数。例: -workers 8", metavar=""
+    ),
+    parallel: str = typer.Option(
+        "thread", "-parallel", help="本节点并发模式 thread|process|async。例: -parallel async", metavar=""
+    ),
+    name: Optional[str] = typer.Option(None, "-name", help="工作节点名称，默认 主机名-进程号。例: -name runner-1", metavar=""),
+    log_level: str = typer.Option("INFO", "-log-level", help="日志级别。例: -log-level DEBUG", metavar=""),
+):
+    """Distributed worker: pull case instances from a drun r -distribute coordinator."""
+    if batch < 1 or workers < 0:
+        typer.echo("[ERROR] Invalid -batch/-workers value. Use -batch >= 1 and -workers >= 0.")
+        raise typer.Exit(code=2)
+    parallel_mode = (parallel or "thread").strip().lower()
+    if parallel_mode not in {"thread", "process", "async"}:
+        typer.echo("[ERROR] Invalid -parallel value. Use one of: thread, process, async.")
+        raise typer.Exit(code=2)
+
+    from drun.commands.run_distributed import run_worker
+
+    setup_logging(log_level, log_file=None)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    try:
+        run_worker(
+            url,
+            batch=batch,
+            workers=resolve_worker_count(workers),
+            parallel=parallel_mode,
+            name=name,
+            log=get_logger("drun.commands.worker"),
+        )
+    except httpx.HTTPError as exc:
+        typer.echo(f"[ERROR] Coordinator request failed: {exc}")
+        raise typer.Exit(code=1)
+
+
+@app.command("l")
+def load(
+    path: str = typer.Argument(
+        ...,
+        help="压测目标（与 drun r 相同的文件/目录；支持 <path>:<case[,case]>）。例: tcases:登录",
+    ),
+    k: Optional[str] = typer.Option(
+        None, "-k", help='标签过滤表达式。例: -k "smoke and not slow"', metavar=""
+    ),
+    vars: List[str] = typer.Option([], "-vars", help="变量覆盖 k=v（可重复）。例: -vars token=abc", metavar=""),
+    env: Optional[str] = typer.Option(None, "-env", help="环境名（对应 .env.<name>）。例: -env dev", metavar=""),
+    env_file: Optional[str] = typer.Option(
+        None, "-env-file", help="显式环境文件路径。例: -env-file .env.local", metavar=""
+    ),
+    concurrency: int = typer.Option(
+        10,
+        "-c",
+        help="并发虚拟用户数；配合 -rps 时为最大在途请求数。例: -c 50",
+        metavar="",
+    ),
+    rps: Optional[float] = typer.Option(
+        None,
+        "-rps",
+        help="开环模式目标速率（每秒启动的用例实例数）。例: -rps 200",
+        metavar="",
+    ),
+    duration: float = typer.Option(30.0, "-duration", help="压测时长（秒）。例: -duration 60", metavar=""),
+    ramp_up: float = typer.Option(
+        0.0, "-ramp-up", help="爬坡时长（秒），期间并发或速率线性增长。例: -ramp-up 10", metavar=""
+    ),
+    max_error_rate: float = typer.Option(
+        0.0,
+        "-max-error-rate",
+        help="允许的失败比例，超过则退出码为 1。例: -max-error-rate 0.01",
+        metavar="",
+    ),
+    report: Optional[str] = typer.Option(
+        None, "-report", help="输出 JSON 压测结果。例: -report reports/load.json", metavar=""
+    ),
+    log_level: str = typer.Option("INFO", "-log-level", help="日志级别；DEBUG 时输出每个步骤日志。例: -log-level DEBUG", metavar=""),
+    max_connections: int = typer.Option(
+        100, "-max-conns", help="连接池最大连接数（至少为 -c）。例: -max-conns 200", metavar=""
+    ),
+    max_keepalive: int = typer.Option(
+        20, "-keepalive", help="连接池保留的最大空闲长连接数。例: -keepalive 50", metavar=""
+    ),
+    http2: bool = typer.Option(
+        False, "-http2", help="启用 HTTP/2 多路复用（需安装 drun[http2]）", show_default=False
+    ),
+):
+    """Load-test cases: reuse YAML cases, checks and extracts under concurrency."""
+    if concurrency < 1:
+        typer.echo("[ERROR] Invalid -c value. Use an integer >= 1.")
+        raise typer.Exit(code=2)
+    if rps is not None and rps <= 0:
+        typer.echo("[ERROR] Invalid -rps value. Use a number > 0.")
+        raise typer.Exit(code=2)
+    if duration <= 0 or ramp_up < 0:
+        typer.echo("[ERROR] Invalid timing. Use -duration > 0 and -ramp-up >= 0.")
+        raise typer.Exit(code=2)
+    if not 0 <= max_error_rate <= 1:
+        typer.echo("[ERROR] Invalid -max-error-rate value. Use a number between 0 and 1.")
+        raise typer.Exit(code=2)
+    if max_connections < 1 or max_keepalive < 0:
+        typer.echo("[ERROR] Invalid connection pool limits. Use -max-conns >= 1 and -keepalive >= 0.")
+        raise typer.Exit(code=2)
+
+    stats = run_load_test(
+        path,
+        k=k,
+        vars=vars,
+        env=env,
+        env_file=env_file,
+        concurrency=concurrency,
+        rps=rps,
+        duration=duration,
+        ramp_up=ramp_up,
+        report=report,
+        log_level=log_level,
+        max_connections=max_connections,
+        max_keepalive=max_keepalive,
+        http2=http2,
+    )
+    if stats.to_dict()["iterations"]["error_rate"] > max_error_rate:
+        raise typer.Exit(code=1)
+
+
 @app.command("c")
 def check(
     path: str = typer.Argument(..., help="要验证的文件或目录"),
@@ -93,14 +93,19 @@ def _preview_step(step: Step, global_vars: Dict[str, Any], env_store: Dict[str,
         # Build the step header
         retry_suffix = ""
         if step.retry is not None:
-            from drun.models.retry import get_retry_max, get_retry_every
-            rm = get_retry_max(step.retry)
-            re = get_retry_every(step.retry)
-            if rm > 1:
-                parts = [f"retry={rm}"]
-                if re != "0s":
-                    parts.append(f"every={re}")
-                retry_suffix = f" ({" ".join(parts)})"
+            from drun.models.retry import get_retry_config
+            rc = get_retry_config(step.retry)
+            if rc.max > 1:
+                parts = [f"retry={rc.max}"]
+                if rc.every != "0s":
+                    parts.append(f"every={rc.every}")
+                if rc.backoff != "constant":
+                    parts.append(f"backoff={rc.backoff}")
+                if rc.max_delay:
+                    parts.append(f"max_delay={rc.max_delay}")
+                if rc.budget:
+                    parts.append(f"budget={rc.budget}")
+                retry_suffix = " (" + " ".join(parts) + ")"
         lines.append(f"{indent}request  {method} {path_rendered}{retry_suffix}")
 
         # Headers
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer
+
+from drun.commands.run import (
+    _apply_host_limit_defaults,
+    _parse_kv,
+    _parse_run_target_with_case_selector,
+    _resolve_runtime_env_file,
+)
+from drun.commands.run_workers import CaseInstanceJob
+from drun.engine.pool import ClientPool, http2_available
+from drun.loader.collector import AmbiguousTestTargetError, InvalidTestPathError, discover, match_tags
+from drun.loader.env import load_environment
+from drun.loader.hooks import get_functions_for
+from drun.loader.yaml_loader import expand_parameters, load_yaml_file
+from drun.runner.async_runner import AsyncRunner
+from drun.runner.load import LoadProfile, LoadStats, run_load
+from drun.templating.engine import TemplateEngine
+from drun.utils.errors import LoadError
+from drun.utils.logging import get_logger, setup_logging
+
+
+def collect_load_jobs(
+    path: str,
+    *,
+    k: Optional[str],
+    global_vars: Dict[str, Any],
+    env_store: Dict[str, Any],
+) -> List[CaseInstanceJob]:
+    """Load cases the same way ``drun r`` does and expand their parameters."""
+    path, selected_case_names = _parse_run_target_with_case_selector(path)
+    selected = set(selected_case_names or [])
+    templater = TemplateEngine()
+    base_url = (
+        global_vars.get("BASE_URL")
+        or global_vars.get("base_url")
+        or env_store.get("BASE_URL")
+        or env_store.get("base_url")
+    )
+
+    jobs: List[CaseInstanceJob] = []
+    for f in discover([path]):
+        cases, meta = load_yaml_file(f)
+        hooks_anchor = Path(meta.get("file", path)).resolve()
+        funcs = get_functions_for(hooks_anchor)
+        for case in cases:
+            if selected and (case.config.name or "Unnamed Case") not in selected:
+                continue
+            if not match_tags(case.config.tags or [], k):
+                continue
+            if not case.config.base_url and base_url:
+                case.config.base_url = base_url
+            if case.config.base_url and ("{{" in case.config.base_url or "${" in case.config.base_url):
+                case.config.base_url = templater.render_value(
+                    case.config.base_url, global_vars, funcs, envmap=env_store
+                )
+            _apply_host_limit_defaults(case.config, global_vars, env_store, templater, funcs)
+            for params in expand_parameters(case.parameters, source_path=meta.get("file")):
+                jobs.append(
+                    CaseInstanceJob(
+                        index=len(jobs),
+                        case=case,
+                        params=params,
+                        source=meta.get("file"),
+                        hooks_anchor=hooks_anchor,
+                        funcs=funcs,
+                    )
+                )
+    return jobs
+
+
+def build_load_summary_text(stats: LoadStats, profile: LoadProfile) -> str:
+    data = stats.to_dict()
+    total = data["iterations"]
+    mode = f"open loop @ {profile.rps:g} rps" if profile.open_loop else f"closed loop x{profile.concurrency}"
+    lines = [
+        f"[LOAD] {mode} | duration={data['elapsed_s']:.1f}s ramp_up={profile.ramp_up:g}s",
+        (
+            f"[LOAD] Iterations: {total['count']} | Errors: {total['errors']} "
+            f"({total['error_rate']:.2%}) | Throughput: {total['throughput']:.1f}/s "
+            f"| Requests: {data['requests_per_second']:.1f}/s"
+        ),
+    ]
+    header = f"{'name':<48} {'count':>7} {'err%':>7} {'rps':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+    lines.append(header)
+    for title, rows in (("case", data["cases"]), ("step", data["steps"])):
+        for name, row in rows.items():
+            label = f"{title}: {name}"
+            if len(label) > 48:
+                label = label[:47] + "…"
+            lines.append(
+                f"{label:<48} {row['count']:>7} {row['error_rate']:>7.2%} {row['throughput']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+            )
+    return "\n".join(lines)
+
+
+def run_load_test(
+    path: str,
+    *,
+    k: Optional[str],
+    vars: List[str],
+    env: Optional[str],
+    env_file: Optional[str],
+    concurrency: int,
+    rps: Optional[float],
+    duration: float,
+    ramp_up: float,
+    report: Optional[str],
+    log_level: str,
+    max_connections: int = 100,
+    max_keepalive: int = 20,
+    keepalive_expiry: float = 5.0,
+    http2: bool = False,
+) -> LoadStats:
+    setup_logging(log_level, log_file=None)
+    log = get_logger("drun.commands.load")
+    # Per-step lines would drown the summary; they are shown at DEBUG only.
+    case_log = get_logger("drun.load.case")
+    case_log.setLevel(logging.DEBUG if log_level.upper() == "DEBUG" else logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    runtime_env_file = _resolve_runtime_env_file(env, env_file)
+    env_store = load_environment(env, str(runtime_env_file) if runtime_env_file is not None else None)
+    global_vars: Dict[str, Any] = {}
+    for key, value in _parse_kv(vars).items():
+        global_vars[key] = value
+        global_vars[key.lower()] = value
+
+    try:
+        jobs = collect_load_jobs(path, k=k, global_vars=global_vars, env_store=env_store)
+    except (ValueError, InvalidTestPathError, AmbiguousTestTargetError, LoadError) as exc:
+        typer.echo(f"[ERROR] {exc}")
+        raise typer.Exit(code=2)
+    if not jobs:
+        typer.echo(f"[ERROR] No cases matched for load test: {path}")
+        raise typer.Exit(code=2)
+    if (http2 or any(job.case.config.http2 for job in jobs)) and not http2_available():
+        typer.echo("[ERROR] HTTP/2 was requested but the 'h2' package is not installed.")
+        typer.echo("        Install it with: pip install 'drun[http2]'")
+        raise typer.Exit(code=2)
+
+    profile = LoadProfile(duration=duration, concurrency=concurrency, rps=rps, ramp_up=ramp_up)
+    client_pool = ClientPool(
+        max_connections=max(max_connections, concurrency),
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2,
+    )
+    runner = AsyncRunner(
+        log=case_log,
+        failfast=False,
+        log_debug=False,
+        reveal_secrets=False,
+        log_response_headers=False,
+        persist_env_file=None,
+        client_pool=client_pool,
+        report_response_bodies=False,
+    )
+
+    async def iteration(job: CaseInstanceJob):
+        return await runner.run_case_async(
+            job.case,
+            global_vars=global_vars,
+            params=job.params,
+            funcs=job.funcs,
+            envmap=dict(env_store),
+            source=job.source,
+        )
+
+    async def main() -> LoadStats:
+        try:
+            return await run_load(
+                jobs,
+                profile,
+                iteration,
+                case_name=lambda job: job.case.config.name or "Unnamed Case",
+            )
+        finally:
+            await client_pool.aclose()
+
+    log.info("[LOAD] Target: %s | Case instances: %s", path, len(jobs))
+    stats = asyncio.run(main())
+    log.info(build_load_summary_text(stats, profile))
+
+    if report:
+        report_path = Path(report)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(stats.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        log.info("[LOAD] JSON report written to: %s", report_path)
+    return stats
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
 import time
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import typer
 
@@ -21,14 +22,19 @@ from drun.commands.run_outputs import (
     write_report_artifacts,
     write_snippet_artifacts,
 )
+from drun.commands.run_workers import (
+    CaseInstanceJob,
+    resolve_worker_count,
+    run_case_instances,
+)
+from drun.engine.cassette import CassetteError, CassetteStore, MatchRules
+from drun.engine.pool import ClientPool, http2_available
+from drun.engine.throttle import parse_rate
+from drun.engine.warmup import WarmupTarget, warm_up
 from drun.loader.collector import AmbiguousTestTargetError, InvalidTestPathError, discover, match_tags
 from drun.loader.env import load_environment
 from drun.loader.hooks import get_functions_for
-from drun.loader.yaml_loader import (
-    expand_parameters,
-    format_variables_multiline,
-    load_yaml_file,
-)
+from drun.loader.yaml_loader import expand_parameters, load_yaml_file
 from drun.models.case import Case
 from drun.models.report import NotifyResult, RunReport
 from drun.runner.runner import Runner
@@ -38,16 +44,6 @@ from drun.utils.errors import LoadError
 from drun.utils.logging import get_logger, setup_logging
 
 
-def _iter_unique_env_items(env: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
-    seen: set[str] = set()
-    for key, value in env.items():
-        lowered = key.lower()
-        if lowered in seen:
-            continue
-        seen.add(lowered)
-        yield key, value
-
-
 def _parse_kv(items: List[str]) -> Dict[str, str]:
     out: Dict[str, str] = {}
     for it in items:
@@ -147,6 +143,101 @@ def _resolve_runtime_env_file(
     return None
 
 
+def _apply_host_limit_defaults(
+    config: Any,
+    global_vars: Dict[str, Any],
+    env_store: Dict[str, Any],
+    templater: TemplateEngine,
+    funcs: Dict[str, Any] | None,
+) -> None:
+    """Fill ``rate_limit`` / ``host_concurrency`` from RATE_LIMIT / HOST_CONCURRENCY and validate them.
+
+    Raises ``ValueError`` for an invalid rate or concurrency.
+    """
+
+    def _env_value(name: str) -> Any:
+        for source in (global_vars, env_store):
+            value = source.get(name) or source.get(name.lower())
+            if value not in (None, ""):
+                return value
+        return None
+
+    if config.rate_limit is None:
+        config.rate_limit = _env_value("RATE_LIMIT")
+    if config.rate_limit is not None and "${" in str(config.rate_limit):
+        config.rate_limit = templater.render_value(config.rate_limit, global_vars, funcs, envmap=env_store)
+    if config.rate_limit is not None:
+        config.rate_limit = str(config.rate_limit)
+        parse_rate(config.rate_limit)
+    if config.host_concurrency is None and (concurrency := _env_value("HOST_CONCURRENCY")) is not None:
+        config.host_concurrency = int(concurrency)
+        if config.host_concurrency < 1:
+            raise ValueError(f"Invalid HOST_CONCURRENCY {concurrency!r}: use an integer >= 1")
+
+
+def _run_warmup(
+    jobs: List[CaseInstanceJob],
+    *,
+    runner: Runner,
+    client_pool: ClientPool,
+    default_base_url: Any,
+    connections: int,
+    open_connections: bool,
+    log,
+) -> Dict[str, Any]:
+    """Resolve and pre-connect every distinct base_url before the cases start."""
+    targets: List[WarmupTarget] = []
+    if isinstance(default_base_url, str) and default_base_url.startswith(("http://", "https://")):
+        targets.append(WarmupTarget(default_base_url))
+    for job in jobs:
+        cfg = job.case.config
+        if cfg.base_url and str(cfg.base_url).startswith(("http://", "https://")):
+            options = tuple(
+                sorted((k, v) for k, v in runner._connection_options(job.case).items() if v is not None)
+            )
+            targets.append(WarmupTarget(str(cfg.base_url), cfg.verify, options))
+
+    summary = warm_up(
+        targets,
+        client_pool,
+        connections=max(connections, 1),
+        open_connections=open_connections,
+    )
+    for entry in summary["targets"]:
+        log.info(
+            "[WARMUP] %s | dns=%s ms connect=%s ms connections=%s%s",
+            entry["base_url"],
+            entry["dns_ms"] if entry["dns_ms"] is not None else "-",
+            entry["connect_ms"] if entry["connect_ms"] is not None else "-",
+            entry["connections"],
+            f" | error={entry['error']}" if entry["error"] else "",
+        )
+    log.info("[WARMUP] %s target(s) in %.1f ms", len(summary["targets"]), summary["total_ms"])
+    return summary
+
+
+_CASSETTE_LOG_LIMIT = 10
+
+
+def _log_cassette_summary(store: CassetteStore, log) -> None:
+    """Log cassette usage and write the stale-entry report next to the cassette."""
+    summary = store.summary()
+    report_path = Path(f"{store.path}.report.json")
+    report_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    log.info(
+        "[CASSETTE] Entries: %s Used: %s Stale: %s Misses: %s | Report: %s",
+        summary["entries"],
+        summary["used"],
+        len(summary["stale"]),
+        len(summary["misses"]),
+        report_path,
+    )
+    for entry in summary["stale"][:_CASSETTE_LOG_LIMIT]:
+        log.info("[CASSETTE] stale: %s %s (#%s)", entry["method"], entry["url"], entry["occurrence"])
+    for entry in summary["misses"][:_CASSETTE_LOG_LIMIT]:
+        log.warning("[CASSETTE] miss: %s %s", entry["method"], entry["url"])
+
+
 def run_cases(
     path: str,
     k: Optional[str],
@@ -171,8 +262,22 @@ def run_cases(
     snippet_lang: str,
     dry_run: bool = False,
     dry_run_limit: int = 20,
+    workers: int = 1,
+    parallel: str = "thread",
+    max_connections: int = 100,
+    max_keepalive: int = 20,
+    keepalive_expiry: float = 5.0,
+    http2: bool = False,
+    distribute: Optional[str] = None,
+    lease_timeout: float = 60.0,
+    cassette: Optional[str] = None,
+    cassette_mode: str = "auto",
+    cassette_match: Optional[str] = None,
+    warmup: bool = False,
+    dns_ttl: float = 30.0,
 ) -> None:
     input_path = path
+    workers = resolve_worker_count(workers)
     try:
         path, selected_case_names = _parse_run_target_with_case_selector(path)
     except ValueError as exc:
@@ -454,6 +559,8 @@ def run_cases(
                 response_headers=response_headers,
                 httpx_logs=httpx_logs,
                 snippet_lang=snippet_lang,
+                workers=workers,
+                parallel=parallel,
             )
         )
     )
@@ -464,21 +571,49 @@ def run_cases(
         or (str(runtime_env_file) if runtime_env_file is not None else ".env")
     )
 
-    runner = Runner(
-        log=log,
-        failfast=failfast,
-        log_debug=(log_level.upper() == "DEBUG"),
-        reveal_secrets=reveal_secrets,
-        log_response_headers=response_headers,
-        persist_env_file=persist_file,
+    cassette_store: Optional[CassetteStore] = None
+    if cassette:
+        try:
+            cassette_store = CassetteStore(
+                cassette, mode=cassette_mode, rules=MatchRules.parse(cassette_match)
+            )
+        except CassetteError as exc:
+            typer.echo(f"[ERROR] {exc}")
+            raise typer.Exit(code=2)
+        log.info(
+            "[CASSETTE] %s | mode=%s | match=%s",
+            cassette_store.path,
+            cassette_store.mode,
+            cassette_store.rules.spec(),
+        )
+
+    client_pool = ClientPool(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2,
+        cassette=cassette_store,
+        dns_ttl=dns_ttl or None,
     )
+    runner_options: Dict[str, Any] = {
+        "failfast": failfast,
+        "log_debug": log_level.upper() == "DEBUG",
+        "reveal_secrets": reveal_secrets,
+        "log_response_headers": response_headers,
+        "persist_env_file": persist_file,
+        "client_pool": client_pool,
+        # Response bodies are decoded only for the reports that show them.
+        "report_response_bodies": bool(report or output_plan.html_path or allure_results),
+    }
+    runner = Runner(log=log, **runner_options)
     templater = TemplateEngine()
-    instance_results = []
     log.info(
-        "[RUN] Discovered files: %s | Matched cases: %s | Failfast=%s",
+        "[RUN] Discovered files: %s | Matched cases: %s | Failfast=%s | Workers=%s (%s)",
         len(files),
         len(items),
         failfast,
+        workers,
+        parallel,
     )
 
     def _need_base_url(case: Case) -> bool:
@@ -496,8 +631,17 @@ def run_cases(
         except Exception:
             return False
 
+    http2_cases = [c for c, _meta, _ps in parameterized_items if c.config.http2]
+    if (http2 or http2_cases) and not http2_available():
+        source = "-http2" if http2 else f"config.http2 in case '{http2_cases[0].config.name or 'Unnamed'}'"
+        typer.echo(f"[ERROR] HTTP/2 was requested by {source} but the 'h2' package is not installed.")
+        typer.echo("        Install it with: pip install 'drun[http2]'")
+        raise typer.Exit(code=2)
+
+    jobs: List[CaseInstanceJob] = []
     for c, meta, param_sets in parameterized_items:
-        funcs = get_functions_for(Path(meta.get("file", path)).resolve())
+        hooks_anchor = Path(meta.get("file", path)).resolve()
+        funcs = get_functions_for(hooks_anchor)
         for ps in param_sets:
             if (not c.config.base_url) and (
                 base := global_vars.get("BASE_URL")
@@ -512,6 +656,11 @@ def run_cases(
                 c.config.base_url = templater.render_value(
                     c.config.base_url, global_vars, funcs, envmap=env_store
                 )
+            try:
+                _apply_host_limit_defaults(c.config, global_vars, env_store, templater, funcs)
+            except ValueError as exc:
+                typer.echo(f"[ERROR] {exc} | Case: {c.config.name or 'Unnamed'}")
+                raise typer.Exit(code=2)
             if _need_base_url(c) and not (
                 c.config.base_url and str(c.config.base_url).strip()
             ):
@@ -532,42 +681,84 @@ def run_cases(
                 for line in msg_lines:
                     typer.echo(line)
                 raise typer.Exit(code=2)
-            log.info("[CASE] Start: %s | params=%s", c.config.name or "Unnamed", ps)
-
-            if env_store and log.isEnabledFor(logging.DEBUG):
-                for key, value in _iter_unique_env_items(env_store):
-                    logged_value = value if reveal_secrets else "***"
-                    log.debug("[ENV] %s = %r", key, logged_value)
-
-            if c.config.base_url:
-                log.info("[CONFIG] base_url: %s", c.config.base_url)
-
-            if c.config.variables:
-                vars_str = format_variables_multiline(
-                    c.config.variables, "[CONFIG] variables: "
+            jobs.append(
+                CaseInstanceJob(
+                    index=len(jobs),
+                    case=c,
+                    params=ps,
+                    source=meta.get("file"),
+                    hooks_anchor=hooks_anchor,
+                    funcs=funcs,
                 )
-                log.info(vars_str)
+            )
 
-            res = runner.run_case(
-                c,
+    warmup_summary: Dict[str, Any] | None = None
+    if warmup and not distribute:
+        warmup_summary = _run_warmup(
+            jobs,
+            runner=runner,
+            client_pool=client_pool,
+            default_base_url=base_url_candidate,
+            connections=min(workers, max_keepalive),
+            # a cassette would record (or miss) the warm-up requests
+            open_connections=parallel == "thread" and max_keepalive > 0 and cassette_store is None,
+            log=log,
+        )
+
+    try:
+        if distribute:
+            from drun.commands.run_distributed import serve_case_instances
+
+            instance_results = serve_case_instances(
+                jobs,
+                bind=distribute,
+                session={
+                    "global_vars": global_vars,
+                    "envmap": env_store,
+                    "runner": {
+                        "log_debug": runner_options["log_debug"],
+                        "reveal_secrets": reveal_secrets,
+                        "log_response_headers": response_headers,
+                        "report_response_bodies": runner_options["report_response_bodies"],
+                    },
+                    # Workers build their own pool (and HostThrottle) from these.
+                    "pool": {
+                        "max_connections": max_connections,
+                        "max_keepalive_connections": max_keepalive,
+                        "keepalive_expiry": keepalive_expiry,
+                        "http2": http2,
+                        "dns_ttl": dns_ttl or None,
+                    },
+                },
+                failfast=failfast,
+                log=log,
+                lease_timeout=lease_timeout,
+            )
+        else:
+            instance_results = run_case_instances(
+                jobs,
+                runner=runner,
+                make_runner=lambda instance_log: Runner(log=instance_log, **runner_options),
                 global_vars=global_vars,
-                params=ps,
-                funcs=funcs,
                 envmap=env_store,
-                source=meta.get("file"),
-            )
-            log.info(
-                "[CASE] Result: %s | status=%s | duration=%.1fms",
-                res.name,
-                res.status,
-                res.duration_ms,
+                reveal_secrets=reveal_secrets,
+                failfast=failfast,
+                workers=workers,
+                log=log,
+                mode=parallel,
+                runner_options=runner_options,
             )
-            instance_results.append(res)
-            if failfast and res.status == "failed":
-                break
+    finally:
+        client_pool.close()
+        if cassette_store is not None:
+            _log_cassette_summary(cassette_store, log)
+            cassette_store.close()
 
     report_obj: RunReport = runner.build_report(instance_results)
     s = report_obj.summary
+    if warmup_summary is not None:
+        s["warmup_ms"] = warmup_summary["total_ms"]
+        s["warmup"] = warmup_summary["targets"]
     log.info(
         "[CASE] Total: %s Passed: %s Failed: %s Skipped: %s",
         s["total"],
@@ -0,0 +1,271 @@
+"""Coordinator and worker sides of distributed runs.
+
+``drun r PATH -distribute HOST:PORT`` resolves and expands case instances
+as usual, then serves them from a ``WorkQueue`` instead of running them
+locally; ``drun d URL`` workers lease batches, run them with the regular
+``run_case_instances`` scheduler and post the ``CaseInstanceResult`` JSON
+back.  The coordinator merges the results in job order, so reports look
+exactly like a local run.
+
+Workers need the same project checkout as the coordinator: hook modules
+(``dhook.py``) and file references resolve against paths relative to the
+coordinator's working directory.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import logging
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from drun.commands.run_workers import CaseInstanceJob, _log_instance_result, run_case_instances
+from drun.engine.pool import ClientPool
+from drun.loader.hooks import get_functions_for
+from drun.models.case import Case
+from drun.models.report import CaseInstanceResult
+from drun.runner.runner import Runner
+from drun.server.coordinator import TOKEN_ENV, TOKEN_HEADER, WorkQueue, create_coordinator_app
+
+
+def parse_bind(value: str) -> Tuple[str, int]:
+    host, sep, port = (value or "").strip().rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid -distribute address {value!r}; use HOST:PORT, e.g. 0.0.0.0:8765")
+    return host or "0.0.0.0", int(port)
+
+
+def check_bind_token(host: str, token: str | None) -> None:
+    """Refuse to serve the run's variables off this machine without a token."""
+    if token:
+        return
+    if host == "localhost":
+        return
+    try:
+        if ipaddress.ip_address(host).is_loopback:
+            return
+    except ValueError:
+        pass
+    raise ValueError(
+        f"-distribute on {host} exposes env-file variables to the network; "
+        f"set {TOKEN_ENV} on the coordinator and every worker, or bind 127.0.0.1"
+    )
+
+
+def _portable_path(path: Path | str | None, root: Path) -> str | None:
+    if path is None:
+        return None
+    resolved = Path(path).resolve()
+    try:
+        return str(resolved.relative_to(root))
+    except ValueError:
+        return str(resolved)
+
+
+def job_payload(job: CaseInstanceJob, root: Path) -> Dict[str, Any]:
+    return {
+        "index": job.index,
+        "case": job.case.model_dump(mode="json", by_alias=True),
+        "params": job.params,
+        "source": _portable_path(job.source, root),
+        "hooks_anchor": _portable_path(job.hooks_anchor, root),
+    }
+
+
+def serve_case_instances(
+    jobs: List[CaseInstanceJob],
+    *,
+    bind: str,
+    session: Dict[str, Any],
+    failfast: bool,
+    log: logging.Logger,
+    lease_timeout: float = 60.0,
+    grace: float = 2.0,
+) -> List[CaseInstanceResult]:
+    """Serve *jobs* to ``drun d`` workers and return their results in job order."""
+    import uvicorn
+
+    host, port = parse_bind(bind)
+    check_bind_token(host, os.environ.get(TOKEN_ENV))
+    root = Path.cwd().resolve()
+    results: Dict[int, CaseInstanceResult] = {}
+
+    def on_result(index: int, payload: Dict[str, Any]) -> None:
+        res = CaseInstanceResult.model_validate(payload)
+        results[index] = res
+        _log_instance_result(res, log)
+        log.info("[DIST] Progress: %s/%s", len(results), len(jobs))
+        if failfast and res.status == "failed":
+            queue.stop()
+
+    session = {**session, "lease_timeout": lease_timeout}
+    queue = WorkQueue(
+        [job_payload(job, root) for job in jobs],
+        lease_timeout=lease_timeout,
+        on_result=on_result,
+    )
+    app = create_coordinator_app(queue, session)
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="drun-coordinator", daemon=True)
+    thread.start()
+    log.info(
+        "[DIST] Coordinator listening on http://%s:%s | case instances: %s | lease timeout: %ss",
+        host,
+        port,
+        len(jobs),
+        lease_timeout,
+    )
+    log.info("[DIST] Start workers with: drun d http://<this-host>:%s", port)
+    try:
+        queue.wait()
+        # Let idle workers see "done" before the port closes.
+        time.sleep(grace)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+    return [results[index] for index in sorted(results)]
+
+
+def run_worker(
+    url: str,
+    *,
+    batch: int = 4,
+    workers: int = 1,
+    parallel: str = "thread",
+    name: str | None = None,
+    log: logging.Logger,
+    client: httpx.Client | None = None,
+    reconnect_attempts: int = 5,
+) -> int:
+    """Pull batches from the coordinator at *url* until the run is done.
+
+    The connection pool uses the coordinator's ``-max-conns`` /
+    ``-keepalive`` / ``-keepalive-expiry`` / ``-http2`` / ``-dns-ttl``.
+    Rate limits are enforced per worker.  Returns the number of case
+    instances this worker ran.
+    """
+    worker_name = name or f"{socket.gethostname()}-{os.getpid()}"
+    headers = {TOKEN_HEADER: os.environ[TOKEN_ENV]} if os.environ.get(TOKEN_ENV) else {}
+    http = client or httpx.Client(base_url=url.rstrip("/"), timeout=30.0)
+    http.headers.update(headers)
+
+    def call(method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            try:
+                resp = http.request(method, path, **kwargs)
+                resp.raise_for_status()
+                return resp.json()
+            except httpx.TransportError as exc:
+                attempt += 1
+                if attempt >= reconnect_attempts:
+                    raise
+                log.warning("[DIST] Coordinator unreachable (%s); retrying", exc)
+                time.sleep(min(0.5 * 2 ** (attempt - 1), 5.0))
+
+    session = call("GET", "/dist/session")
+    global_vars = session.get("global_vars") or {}
+    envmap = session.get("envmap") or {}
+    client_pool = ClientPool(**(session.get("pool") or {}))
+    runner_options: Dict[str, Any] = {
+        **(session.get("runner") or {}),
+        "failfast": False,
+        "persist_env_file": None,
+        "client_pool": client_pool,
+    }
+    runner = Runner(log=log, **runner_options)
+    funcs_by_anchor: Dict[str, Any] = {}
+    done_count = 0
+    log.info("[DIST] Worker %s connected to %s", worker_name, url)
+
+    try:
+        while True:
+            try:
+                reply = call("POST", "/dist/lease", json={"worker": worker_name, "max": batch})
+            except httpx.TransportError:
+                if done_count:
+                    log.info("[DIST] Coordinator closed; assuming the run finished")
+                    break
+                raise
+            if reply.get("done"):
+                break
+            payloads = reply.get("jobs") or []
+            if not payloads:
+                time.sleep(float(reply.get("retry_after") or 0.5))
+                continue
+
+            lease_id = reply["lease_id"]
+            jobs = [_job_from_payload(p, funcs_by_anchor) for p in payloads]
+            stop_beat = _start_heartbeat(call, lease_id, session.get("lease_timeout") or 60.0, log)
+            try:
+                instance_results = run_case_instances(
+                    jobs,
+                    runner=runner,
+                    make_runner=lambda instance_log: Runner(log=instance_log, **runner_options),
+                    global_vars=global_vars,
+                    envmap=dict(envmap),
+                    reveal_secrets=bool(runner_options.get("reveal_secrets", True)),
+                    failfast=False,
+                    workers=workers,
+                    log=log,
+                    mode=parallel,
+                    runner_options=runner_options,
+                )
+            finally:
+                stop_beat.set()
+            call(
+                "POST",
+                "/dist/complete",
+                json={
+                    "lease_id": lease_id,
+                    "results": {
+                        str(job.index): res.model_dump(mode="json")
+                        for job, res in zip(jobs, instance_results)
+                    },
+                },
+            )
+            done_count += len(instance_results)
+    finally:
+        client_pool.close()
+        if client is None:
+            http.close()
+    log.info("[DIST] Worker %s finished: %s case instances", worker_name, done_count)
+    return done_count
+
+
+def _job_from_payload(payload: Dict[str, Any], funcs_by_anchor: Dict[str, Any]) -> CaseInstanceJob:
+    anchor_text = payload.get("hooks_anchor") or "."
+    hooks_anchor = Path(anchor_text).resolve()
+    if anchor_text not in funcs_by_anchor:
+        funcs_by_anchor[anchor_text] = get_functions_for(hooks_anchor)
+    return CaseInstanceJob(
+        index=int(payload["index"]),
+        case=Case.model_validate(payload["case"]),
+        params=payload.get("params") or {},
+        source=payload.get("source"),
+        hooks_anchor=hooks_anchor,
+        funcs=funcs_by_anchor[anchor_text],
+    )
+
+
+def _start_heartbeat(call, lease_id: str, lease_timeout: float, log: logging.Logger) -> threading.Event:
+    stop = threading.Event()
+    interval = max(float(lease_timeout) / 3.0, 0.5)
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            try:
+                if not call("POST", "/dist/heartbeat", json={"lease_id": lease_id}).get("active"):
+                    log.warning("[DIST] Lease %s expired; results may be discarded", lease_id)
+                    return
+            except Exception as exc:  # keep running the batch; complete() will retry
+                log.warning("[DIST] Heartbeat failed: %s", exc)
+
+    threading.Thread(target=beat, name="drun-heartbeat", daemon=True).start()
+    return stop
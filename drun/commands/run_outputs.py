@@ -46,6 +46,8 @@ class RunPlanContext:
     response_headers: bool
     httpx_logs: bool
     snippet_lang: str
+    workers: int = 1
+    parallel: str = "thread"
 
 
 SnippetWriter = Callable[
@@ -133,6 +135,8 @@ def build_run_plan_text(context: RunPlanContext) -> str:
         ("Tag filter", _display_value(context.tag_filter)),
         ("Case selector", case_selector),
         ("Failfast", _bool_text(context.failfast)),
+        ("Workers", context.workers),
+        ("Parallel", context.parallel),
         ("CLI vars", ", ".join(cli_var_keys) if cli_var_keys else "(none)"),
         ("Output mode", _output_mode_text(context.output_plan)),
         ("Project root", _project_root_text(context.output_plan)),
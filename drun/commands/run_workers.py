@@ -0,0 +1,445 @@
+"""Case-instance scheduling for ``drun r``.
+
+A Case Instance is one Case under one parameter set.  Instances are
+independent: each ``Runner.run_case`` call builds its own ``VarContext`` and
+HTTP client, so they can run serially, on a ``-workers N`` thread pool,
+sharded across worker processes (``-parallel process``), or as coroutines on
+one event loop (``-parallel async``).  Results are always
+returned in job order so reports and ``-failfast`` stay deterministic
+regardless of completion order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+import logging
+import multiprocessing
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from drun.loader.hooks import get_functions_for
+from drun.loader.yaml_loader import format_variables_multiline
+from drun.models.case import Case
+from drun.models.report import CaseInstanceResult
+from drun.runner.async_runner import AsyncRunner
+from drun.runner.runner import Runner
+from drun.utils.logging import BufferedLogger
+
+
+PARALLEL_MODES = ("thread", "process", "async")
+
+
+@dataclass(frozen=True)
+class CaseInstanceJob:
+    """One (Case, parameter set) pair scheduled for execution."""
+
+    index: int
+    case: Case
+    params: Dict[str, Any]
+    source: str | None
+    hooks_anchor: Path
+    funcs: Dict[str, Any] | None = None
+
+
+def iter_unique_env_items(env: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    seen: set[str] = set()
+    for key, value in env.items():
+        lowered = key.lower()
+        if lowered in seen:
+            continue
+        seen.add(lowered)
+        yield key, value
+
+
+def run_case_instance(
+    job: CaseInstanceJob,
+    *,
+    runner: Any,
+    global_vars: Dict[str, Any],
+    envmap: Dict[str, Any] | None,
+    reveal_secrets: bool,
+    log: Any,
+) -> CaseInstanceResult:
+    _log_instance_start(job, envmap=envmap, reveal_secrets=reveal_secrets, log=log)
+    res = runner.run_case(
+        job.case,
+        global_vars=global_vars,
+        params=job.params,
+        funcs=job.funcs,
+        envmap=envmap,
+        source=job.source,
+    )
+    _log_instance_result(res, log)
+    return res
+
+
+def _log_instance_start(
+    job: CaseInstanceJob,
+    *,
+    envmap: Dict[str, Any] | None,
+    reveal_secrets: bool,
+    log: Any,
+) -> None:
+    case = job.case
+    log.info("[CASE] Start: %s | params=%s", case.config.name or "Unnamed", job.params)
+
+    if envmap and log.isEnabledFor(logging.DEBUG):
+        for key, value in iter_unique_env_items(envmap):
+            logged_value = value if reveal_secrets else "***"
+            log.debug("[ENV] %s = %r", key, logged_value)
+
+    if case.config.base_url:
+        log.info("[CONFIG] base_url: %s", case.config.base_url)
+
+    if case.config.variables:
+        log.info(format_variables_multiline(case.config.variables, "[CONFIG] variables: "))
+
+
+def _log_instance_result(res: CaseInstanceResult, log: Any) -> None:
+    log.info(
+        "[CASE] Result: %s | status=%s | duration=%.1fms",
+        res.name,
+        res.status,
+        res.duration_ms,
+    )
+
+
+def resolve_worker_count(workers: int) -> int:
+    """Translate the ``-workers`` value; ``0`` means one worker per CPU core."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def run_case_instances(
+    jobs: List[CaseInstanceJob],
+    *,
+    runner: Any,
+    make_runner: Callable[[Any], Any],
+    global_vars: Dict[str, Any],
+    envmap: Dict[str, Any] | None,
+    reveal_secrets: bool,
+    failfast: bool,
+    workers: int,
+    log: logging.Logger,
+    mode: str = "thread",
+    runner_options: Dict[str, Any] | None = None,
+) -> List[CaseInstanceResult]:
+    """Run *jobs* and return their results in job order.
+
+    With ``workers <= 1`` the shared *runner* executes every instance on the
+    calling thread, exactly like a plain loop.  In ``thread`` mode each
+    instance gets a fresh runner from *make_runner* whose log lines are
+    buffered and emitted as one block when the instance finishes.  In
+    ``process`` mode the jobs are split into shards that worker processes run
+    with ``Runner(**runner_options)``; in ``async`` mode every instance is a
+    coroutine on one event loop and *workers* caps how many are in flight.
+    """
+    if mode not in PARALLEL_MODES:
+        raise ValueError(f"Unknown parallel mode: {mode!r}")
+
+    if workers <= 1 or len(jobs) <= 1:
+        results: List[CaseInstanceResult] = []
+        for job in jobs:
+            res = run_case_instance(
+                job,
+                runner=runner,
+                global_vars=global_vars,
+                envmap=envmap,
+                reveal_secrets=reveal_secrets,
+                log=log,
+            )
+            results.append(res)
+            if failfast and res.status == "failed":
+                break
+        return results
+
+    if mode == "process":
+        return _run_in_processes(
+            jobs,
+            runner_options=runner_options or {},
+            global_vars=global_vars,
+            envmap=envmap,
+            reveal_secrets=reveal_secrets,
+            failfast=failfast,
+            workers=workers,
+            log=log,
+        )
+
+    if mode == "async":
+        return asyncio.run(
+            _run_async(
+                jobs,
+                runner_options=runner_options or {},
+                global_vars=global_vars,
+                envmap=envmap,
+                reveal_secrets=reveal_secrets,
+                failfast=failfast,
+                workers=workers,
+                log=log,
+            )
+        )
+
+    return _run_threaded(
+        jobs,
+        make_runner=make_runner,
+        global_vars=global_vars,
+        envmap=envmap,
+        reveal_secrets=reveal_secrets,
+        failfast=failfast,
+        workers=workers,
+        log=log,
+    )
+
+
+def _run_threaded(
+    jobs: List[CaseInstanceJob],
+    *,
+    make_runner: Callable[[Any], Any],
+    global_vars: Dict[str, Any],
+    envmap: Dict[str, Any] | None,
+    reveal_secrets: bool,
+    failfast: bool,
+    workers: int,
+    log: logging.Logger,
+) -> List[CaseInstanceResult]:
+    flush_lock = threading.Lock()
+
+    def _work(job: CaseInstanceJob) -> CaseInstanceResult:
+        buffered = BufferedLogger(log)
+        try:
+            # Extracts are written into envmap; keep each instance's copy private.
+            return run_case_instance(
+                job,
+                runner=make_runner(buffered),
+                global_vars=global_vars,
+                envmap=dict(envmap) if envmap is not None else None,
+                reveal_secrets=reveal_secrets,
+                log=buffered,
+            )
+        finally:
+            with flush_lock:
+                buffered.flush()
+
+    results: List[CaseInstanceResult] = []
+    executor = ThreadPoolExecutor(
+        max_workers=min(workers, len(jobs)),
+        thread_name_prefix="drun-case",
+    )
+    try:
+        futures = [executor.submit(_work, job) for job in jobs]
+        for future in futures:
+            res = future.result()
+            results.append(res)
+            if failfast and res.status == "failed":
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def split_jobs(jobs: List[CaseInstanceJob], workers: int) -> List[List[CaseInstanceJob]]:
+    """Split *jobs* into contiguous shards, several per worker for balance."""
+    if not jobs:
+        return []
+    shard_count = min(len(jobs), max(workers, 1) * 4)
+    size, extra = divmod(len(jobs), shard_count)
+    shards: List[List[CaseInstanceJob]] = []
+    start = 0
+    for idx in range(shard_count):
+        end = start + size + (1 if idx < extra else 0)
+        shards.append(jobs[start:end])
+        start = end
+    return shards
+
+
+@dataclass
+class ShardStop:
+    """``-failfast`` across worker processes: the lowest shard that failed.
+
+    A serial run would have executed every shard before the failing one, so
+    only shards after it stop (before their next instance); earlier shards
+    run to the end.  ``first_failed`` and ``lock`` are manager proxies.
+    """
+
+    first_failed: Any
+    lock: Any
+
+    def should_stop(self, shard: int) -> bool:
+        return self.first_failed.value < shard
+
+    def mark_failed(self, shard: int) -> None:
+        with self.lock:
+            if shard < self.first_failed.value:
+                self.first_failed.value = shard
+
+
+def _init_process_worker(log_name: str, log_level: int) -> None:
+    logging.getLogger(log_name).setLevel(log_level)
+
+
+def run_job_shard(
+    jobs: List[CaseInstanceJob],
+    *,
+    runner_options: Dict[str, Any],
+    global_vars: Dict[str, Any],
+    envmap: Dict[str, Any] | None,
+    reveal_secrets: bool,
+    failfast: bool,
+    log_name: str,
+    shard: int = 0,
+    stop: ShardStop | None = None,
+) -> Tuple[List[CaseInstanceResult], List[Tuple[int, str]]]:
+    """Run one shard inside a worker process.
+
+    Hook functions cannot be pickled, so they are resolved here through the
+    cached ``get_functions_for``: each ``dhook.py`` is imported once per
+    worker process.  Log records travel back with the results, so the
+    parent emits them one shard at a time.
+    """
+    buffered = BufferedLogger(logging.getLogger(log_name))
+    runner = Runner(log=buffered, **runner_options)
+    results: List[CaseInstanceResult] = []
+    try:
+        for job in jobs:
+            if stop is not None and stop.should_stop(shard):
+                break
+            job = replace(job, funcs=get_functions_for(job.hooks_anchor))
+            res = run_case_instance(
+                job,
+                runner=runner,
+                global_vars=global_vars,
+                envmap=dict(envmap) if envmap is not None else None,
+                reveal_secrets=reveal_secrets,
+                log=buffered,
+            )
+            results.append(res)
+            if failfast and res.status == "failed":
+                if stop is not None:
+                    stop.mark_failed(shard)
+                break
+    finally:
+        # The pool arrives unpickled as an empty per-process copy.
+        if runner.client_pool is not None:
+            runner.client_pool.close()
+    return results, buffered.records
+
+
+def _run_in_processes(
+    jobs: List[CaseInstanceJob],
+    *,
+    runner_options: Dict[str, Any],
+    global_vars: Dict[str, Any],
+    envmap: Dict[str, Any] | None,
+    reveal_secrets: bool,
+    failfast: bool,
+    workers: int,
+    log: logging.Logger,
+) -> List[CaseInstanceResult]:
+    shards = split_jobs([replace(job, funcs=None) for job in jobs], workers)
+    results: List[CaseInstanceResult] = []
+    mp_context = multiprocessing.get_context("spawn")
+    manager = mp_context.Manager() if failfast else None
+    stop = ShardStop(manager.Value("q", len(shards)), manager.Lock()) if manager is not None else None
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)),
+        mp_context=mp_context,
+        initializer=_init_process_worker,
+        initargs=(log.name, log.getEffectiveLevel()),
+    )
+    try:
+        futures: List[Future] = [
+            executor.submit(
+                run_job_shard,
+                shard,
+                runner_options=runner_options,
+                global_vars=global_vars,
+                envmap=envmap,
+                reveal_secrets=reveal_secrets,
+                failfast=failfast,
+                log_name=log.name,
+                shard=shard_index,
+                stop=stop,
+            )
+            for shard_index, shard in enumerate(shards)
+        ]
+        stopped = False
+        for future in futures:
+            shard_results, records = future.result()
+            buffered = BufferedLogger(log)
+            buffered.records = records
+            buffered.flush()
+            for res in shard_results:
+                results.append(res)
+                if failfast and res.status == "failed":
+                    stopped = True
+                    break
+            if stopped:
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+    return results
+
+
+async def _run_async(
+    jobs: List[CaseInstanceJob],
+    *,
+    runner_options: Dict[str, Any],
+    global_vars: Dict[str, Any],
+    envmap: Dict[str, Any] | None,
+    reveal_secrets: bool,
+    failfast: bool,
+    workers: int,
+    log: logging.Logger,
+) -> List[CaseInstanceResult]:
+    limit = asyncio.Semaphore(workers)
+
+    async def _work(job: CaseInstanceJob) -> CaseInstanceResult:
+        async with limit:
+            buffered = BufferedLogger(log)
+            instance_envmap = dict(envmap) if envmap is not None else None
+            try:
+                _log_instance_start(
+                    job,
+                    envmap=instance_envmap,
+                    reveal_secrets=reveal_secrets,
+                    log=buffered,
+                )
+                runner = AsyncRunner(log=buffered, **runner_options)
+                res = await runner.run_case_async(
+                    job.case,
+                    global_vars=global_vars,
+                    params=job.params,
+                    funcs=job.funcs,
+                    envmap=instance_envmap,
+                    source=job.source,
+                )
+                _log_instance_result(res, buffered)
+                return res
+            finally:
+                buffered.flush()
+
+    tasks = [asyncio.create_task(_work(job)) for job in jobs]
+    results: List[CaseInstanceResult] = []
+    try:
+        for task in tasks:
+            res = await task
+            results.append(res)
+            if failfast and res.status == "failed":
+                break
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        # Async transports are bound to this loop; release them before it ends.
+        client_pool = runner_options.get("client_pool")
+        if client_pool is not None:
+            await client_pool.aclose()
+    return results
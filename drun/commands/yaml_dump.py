@@ -56,7 +56,7 @@ def to_yaml_case_dict(case: Case) -> Dict[str, object]:
     # Drop empty config blocks (variables/headers/tags) to keep YAML clean.
     cfg = d.get("config")
     if isinstance(cfg, dict):
-        for field in ("variables", "headers", "tags"):
+        for field in ("variables", "headers", "tags", "parallel_steps"):
             if not cfg.get(field):
                 cfg.pop(field, None)
 
@@ -80,7 +80,7 @@ def to_yaml_case_dict(case: Case) -> Dict[str, object]:
         if "check" in step:
             step.pop("check", None)
 
-        for field in ("variables", "extract", "setup_hooks", "teardown_hooks"):
+        for field in ("variables", "extract", "setup_hooks", "teardown_hooks", "parallel"):
             if field in step and not step.get(field):
                 step.pop(field, None)
 
@@ -154,6 +154,8 @@ def to_yaml_case_dict(case: Case) -> Dict[str, object]:
             req.pop("stream", None)
         if "stream_timeout" in req and req.get("stream_timeout") is None:
             req.pop("stream_timeout", None)
+        if "stream_keep" in req and req.get("stream_keep") is None:
+            req.pop("stream_keep", None)
 
         if step_checks:
             step["check"] = step_checks
@@ -0,0 +1,396 @@
+"""Record HTTP exchanges to an on-disk cassette and replay them offline.
+
+A cassette is a SQLite file with one row per recorded response, keyed by a
+hash of the normalized request (see :class:`MatchRules`) plus an occurrence
+number, so a step polled three times replays three recorded responses in
+order.  Response bodies are stored raw (still content-encoded) and
+zlib-compressed.
+
+Modes:
+
+- ``record``: always send, (re)record every exchange;
+- ``replay``: never touch the network; an unmatched request fails with
+  :class:`CassetteMiss`;
+- ``auto``: replay what is recorded, send and record the rest.
+
+The cassette sits below ``httpx.Client`` as a transport wrapper (installed
+by :class:`drun.engine.pool.ClientPool`), so streaming, timing and download
+modes behave the same on replay.  Every row remembers the last run that
+used it; :meth:`CassetteStore.summary` lists rows this run did not use
+(stale) and requests it could not replay (misses).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+import zlib
+
+import httpx
+
+
+CASSETTE_MODES = ("record", "replay", "auto")
+DEFAULT_MATCH = "method,url,body"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    http_version TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    recorded_at REAL NOT NULL,
+    last_used REAL,
+    PRIMARY KEY (key, seq)
+);
+CREATE TABLE IF NOT EXISTS misses (
+    run_id REAL NOT NULL,
+    key TEXT NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL
+);
+"""
+
+
+class CassetteError(ValueError):
+    """Raised for invalid cassette settings."""
+
+
+class CassetteMiss(httpx.TransportError):
+    """Replay mode found no recorded response for a request."""
+
+
+@dataclass(frozen=True)
+class MatchRules:
+    """Which parts of a request identify a recorded exchange.
+
+    Built from a comma separated spec such as
+    ``"method,url,body,header:X-Tenant,ignore-query:ts"``:
+
+    - ``method`` / ``url`` / ``path`` (URL without query) / ``body``;
+    - ``header:<name>`` adds a request header to the key;
+    - ``ignore-query:<name>`` drops a query parameter (timestamps, nonces).
+
+    URLs are compared with sorted query parameters; JSON bodies are compared
+    after key sorting, so formatting differences still match.
+    """
+
+    fields: Tuple[str, ...] = ("method", "url", "body")
+    headers: Tuple[str, ...] = ()
+    ignore_query: Tuple[str, ...] = ()
+
+    @classmethod
+    def parse(cls, spec: str | None) -> "MatchRules":
+        fields: List[str] = []
+        headers: List[str] = []
+        ignore_query: List[str] = []
+        for token in (spec or DEFAULT_MATCH).split(","):
+            token = token.strip()
+            if not token:
+                continue
+            name, _, arg = token.partition(":")
+            name = name.strip().lower()
+            if name in ("method", "url", "path", "body") and not arg:
+                fields.append(name)
+            elif name == "header" and arg.strip():
+                headers.append(arg.strip().lower())
+            elif name == "ignore-query" and arg.strip():
+                ignore_query.append(arg.strip())
+            else:
+                raise CassetteError(
+                    f"Invalid cassette match rule '{token}'. "
+                    "Use method, url, path, body, header:<name> or ignore-query:<name>."
+                )
+        return cls(fields=tuple(fields), headers=tuple(headers), ignore_query=tuple(ignore_query))
+
+    def key(self, request: httpx.Request, body_digest: str) -> str:
+        digest = hashlib.sha256()
+        for part in self._parts(request, body_digest):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _parts(self, request: httpx.Request, body_digest: str) -> Iterable[str]:
+        url = request.url
+        for name in self.fields:
+            if name == "method":
+                yield request.method.upper()
+            elif name == "url":
+                query = [
+                    (k, v)
+                    for k, v in parse_qsl(url.query.decode("ascii", "replace"), keep_blank_values=True)
+                    if k not in self.ignore_query
+                ]
+                yield f"{url.scheme}://{url.netloc.decode('ascii', 'replace').lower()}{url.path}?{urlencode(sorted(query))}"
+            elif name == "path":
+                yield f"{url.scheme}://{url.netloc.decode('ascii', 'replace').lower()}{url.path}"
+            elif name == "body":
+                yield body_digest
+        for header in self.headers:
+            yield f"{header}={request.headers.get(header, '')}"
+
+    def spec(self) -> str:
+        tokens = list(self.fields)
+        tokens += [f"header:{h}" for h in self.headers]
+        tokens += [f"ignore-query:{q}" for q in self.ignore_query]
+        return ",".join(tokens)
+
+
+@dataclass
+class _Recorded:
+    status: int
+    http_version: Optional[str]
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        extensions: Dict[str, Any] = {}
+        if self.http_version:
+            extensions["http_version"] = self.http_version.encode("ascii")
+        return httpx.Response(
+            self.status,
+            headers=self.headers,
+            content=self.body,
+            request=request,
+            extensions=extensions,
+        )
+
+
+@dataclass
+class CassetteStore:
+    path: str
+    mode: str = "auto"
+    rules: MatchRules = field(default_factory=MatchRules)
+    run_id: float = field(default_factory=time.time)
+
+    def __post_init__(self) -> None:
+        if self.mode not in CASSETTE_MODES:
+            raise CassetteError(f"Invalid cassette mode '{self.mode}'. Use one of: {', '.join(CASSETTE_MODES)}.")
+        if self.mode == "replay" and not Path(self.path).is_file():
+            raise CassetteError(f"Cassette not found for replay: {self.path}")
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def uses_network(self) -> bool:
+        return self.mode != "replay"
+
+    def _next_seq(self, key: str) -> int:
+        seq = self._seen.get(key, 0)
+        self._seen[key] = seq + 1
+        return seq
+
+    def lookup(self, key: str) -> Optional[_Recorded]:
+        """Recorded response for the next occurrence of *key* (the last one repeats)."""
+        with self._lock:
+            seq = self._seen.get(key, 0)
+            row = self._db.execute(
+                "SELECT seq, status, http_version, headers, body FROM exchanges "
+                "WHERE key = ? AND seq <= ? ORDER BY seq DESC LIMIT 1",
+                (key, seq),
+            ).fetchone()
+            if row is None:
+                return None
+            self._seen[key] = seq + 1
+            self._db.execute(
+                "UPDATE exchanges SET last_used = ? WHERE key = ? AND seq = ?", (self.run_id, key, row[0])
+            )
+            self._db.commit()
+        return _Recorded(
+            status=row[1],
+            http_version=row[2],
+            headers=[tuple(pair) for pair in json.loads(row[3])],
+            body=zlib.decompress(row[4]),
+        )
+
+    def record(self, key: str, request: httpx.Request, response: httpx.Response, raw_body: bytes) -> None:
+        http_version = response.extensions.get("http_version")
+        if isinstance(http_version, bytes):
+            http_version = http_version.decode("ascii", "replace")
+        with self._lock:
+            seq = self._next_seq(key)
+            if seq == 0:
+                self._db.execute("DELETE FROM exchanges WHERE key = ?", (key,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO exchanges "
+                "(key, seq, method, url, status, http_version, headers, body, recorded_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    seq,
+                    request.method,
+                    str(request.url),
+                    response.status_code,
+                    http_version,
+                    json.dumps(list(response.headers.multi_items())),
+                    zlib.compress(raw_body),
+                    time.time(),
+                    self.run_id,
+                ),
+            )
+            self._db.commit()
+
+    def note_miss(self, key: str, request: httpx.Request) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO misses (run_id, key, method, url) VALUES (?, ?, ?, ?)",
+                (self.run_id, key, request.method, str(request.url)),
+            )
+            self._db.commit()
+
+    def summary(self) -> Dict[str, Any]:
+        """Entry counts plus stale rows (unused this run) and misses of this run."""
+        with self._lock:
+            total = self._db.execute("SELECT COUNT(*) FROM exchanges").fetchone()[0]
+            used = self._db.execute(
+                "SELECT COUNT(*) FROM exchanges WHERE last_used = ?", (self.run_id,)
+            ).fetchone()[0]
+            stale = self._db.execute(
+                "SELECT method, url, seq, recorded_at FROM exchanges "
+                "WHERE last_used IS NULL OR last_used != ? ORDER BY url, seq",
+                (self.run_id,),
+            ).fetchall()
+            misses = self._db.execute(
+                "SELECT DISTINCT method, url FROM misses WHERE run_id = ? ORDER BY url", (self.run_id,)
+            ).fetchall()
+        return {
+            "cassette": self.path,
+            "mode": self.mode,
+            "match": self.rules.spec(),
+            "entries": total,
+            "used": used,
+            "stale": [
+                {"method": m, "url": u, "occurrence": seq + 1, "recorded_at": recorded_at}
+                for m, u, seq, recorded_at in stale
+            ],
+            "misses": [{"method": m, "url": u} for m, u in misses],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # A pickled copy reopens the same file and keeps the run id.  Its
+    # occurrence counters are its own, so ``drun r`` rejects ``-cassette``
+    # with ``-parallel process``.
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "mode": self.mode, "rules": self.rules, "run_id": self.run_id}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+
+# JSON bodies up to this size are hashed in canonical form (sorted keys).
+_JSON_CANONICAL_LIMIT = 1024 * 1024
+
+
+def _body_digest(chunks: Iterable[bytes]) -> str:
+    digest = hashlib.sha256()
+    buffered: List[bytes] = []
+    size = 0
+    for chunk in chunks:
+        digest.update(chunk)
+        if size <= _JSON_CANONICAL_LIMIT:
+            buffered.append(chunk)
+        size += len(chunk)
+    if 0 < size <= _JSON_CANONICAL_LIMIT:
+        try:
+            parsed = json.loads(b"".join(buffered))
+        except ValueError:
+            pass
+        else:
+            return hashlib.sha256(
+                json.dumps(parsed, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            ).hexdigest()
+    return digest.hexdigest()
+
+
+def _sync_request_body(request: httpx.Request) -> Iterable[bytes]:
+    try:
+        return [request.content]
+    except httpx.RequestNotRead:
+        return request.stream  # type: ignore[return-value]
+
+
+class CassetteTransport(httpx.BaseTransport):
+    def __init__(self, store: CassetteStore, inner: Optional[httpx.BaseTransport]) -> None:
+        self.store = store
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.store.rules.key(request, _body_digest(_sync_request_body(request)))
+        if self.store.mode != "record":
+            recorded = self.store.lookup(key)
+            if recorded is not None:
+                return recorded.to_response(request)
+        if self.inner is None or self.store.mode == "replay":
+            self.store.note_miss(key, request)
+            raise CassetteMiss(f"No recorded response in cassette for {request.method} {request.url}", request=request)
+        response = self.inner.handle_request(request)
+        try:
+            # Iterate the stream itself: it yields the raw (still encoded) bytes and,
+            # unlike iter_raw(), also works for responses a transport already read.
+            raw_body = b"".join(response.stream)  # type: ignore[arg-type]
+        finally:
+            response.close()
+        self.store.record(key, request, response, raw_body)
+        return _replayable(response, raw_body, request)
+
+    def close(self) -> None:
+        if self.inner is not None:
+            self.inner.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    def __init__(self, store: CassetteStore, inner: Optional[httpx.AsyncBaseTransport]) -> None:
+        self.store = store
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            chunks: List[bytes] = [request.content]
+        except httpx.RequestNotRead:
+            chunks = [chunk async for chunk in request.stream]  # type: ignore[union-attr]
+        key = self.store.rules.key(request, _body_digest(chunks))
+        if self.store.mode != "record":
+            recorded = self.store.lookup(key)
+            if recorded is not None:
+                return recorded.to_response(request)
+        if self.inner is None or self.store.mode == "replay":
+            self.store.note_miss(key, request)
+            raise CassetteMiss(f"No recorded response in cassette for {request.method} {request.url}", request=request)
+        response = await self.inner.handle_async_request(request)
+        try:
+            raw_body = b"".join([chunk async for chunk in response.stream])  # type: ignore[union-attr]
+        finally:
+            await response.aclose()
+        self.store.record(key, request, response, raw_body)
+        return _replayable(response, raw_body, request)
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
+
+
+def _replayable(response: httpx.Response, raw_body: bytes, request: httpx.Request) -> httpx.Response:
+    # The upstream stream is consumed; hand the client an equivalent buffered response.
+    return httpx.Response(
+        response.status_code,
+        headers=response.headers.multi_items(),
+        content=raw_body,
+        request=request,
+        extensions=response.extensions,
+    )
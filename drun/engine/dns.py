@@ -0,0 +1,167 @@
+"""DNS cache behind the pooled HTTP transports.
+
+httpcore resolves the host again for every new connection.  With the cache
+installed (``install_dns_cache``) the transport's network backend asks
+:class:`DnsCache` first (one cache per ``ClientPool``), so repeated connections to the same ``base_url``
+(new pool slots, HTTP/1.1 connections opened by parallel workers, hosts
+re-dialled after ``keepalive_expiry``) skip the lookup until the TTL runs
+out.  Addresses are tried in resolver order; a host whose addresses all
+fail to connect is dropped from the cache.  TLS still verifies and sends
+SNI for the original host name.
+
+httpx has no public way to pass a network backend to ``HTTPTransport``, so
+the backend of its httpcore pool (``ConnectionPool._network_backend``, a
+constructor argument of httpcore 1.x) is wrapped in place.  httpcore is
+pinned to 1.x and ``install_dns_cache`` fails loudly if that hook moves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+
+class DnsCache:
+    def __init__(self, ttl: float = 30.0) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    def lookup(self, host: str, port: int) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def store(self, host: str, port: int, infos: Iterable[Any]) -> List[str]:
+        addresses: List[str] = []
+        for info in infos:
+            address = info[4][0]
+            if address not in addresses:
+                addresses.append(address)
+        with self._lock:
+            self.misses += 1
+            if self.ttl > 0 and addresses:
+                self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        cached = self.lookup(host, port)
+        if cached is not None:
+            return cached
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as exc:
+            raise httpcore.ConnectError(f"DNS lookup failed for {host}: {exc}") from exc
+        return self.store(host, port, infos)
+
+    async def resolve_async(self, host: str, port: int) -> List[str]:
+        cached = self.lookup(host, port)
+        if cached is not None:
+            return cached
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as exc:
+            raise httpcore.ConnectError(f"DNS lookup failed for {host}: {exc}") from exc
+        return self.store(host, port, infos)
+
+    def forget(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class _CachingBackend(httpcore.NetworkBackend):
+    def __init__(self, inner: httpcore.NetworkBackend, cache: DnsCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Any = None,
+    ) -> httpcore.NetworkStream:
+        error: Exception | None = None
+        for address in self.cache.resolve(host, port):
+            try:
+                return self.inner.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                error = exc
+        self.cache.forget(host, port)
+        raise error or httpcore.ConnectError(f"No address for {host}")
+
+    def connect_unix_socket(self, path: str, timeout: float | None = None, socket_options: Any = None) -> httpcore.NetworkStream:
+        return self.inner.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds: float) -> None:
+        self.inner.sleep(seconds)
+
+
+class _AsyncCachingBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, inner: httpcore.AsyncNetworkBackend, cache: DnsCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Any = None,
+    ) -> httpcore.AsyncNetworkStream:
+        error: Exception | None = None
+        for address in await self.cache.resolve_async(host, port):
+            try:
+                return await self.inner.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                error = exc
+        self.cache.forget(host, port)
+        raise error or httpcore.ConnectError(f"No address for {host}")
+
+    async def connect_unix_socket(
+        self, path: str, timeout: float | None = None, socket_options: Any = None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.inner.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.inner.sleep(seconds)
+
+
+def install_dns_cache(transport: httpx.HTTPTransport | httpx.AsyncHTTPTransport, cache: DnsCache) -> None:
+    """Route new connections of an httpx transport through *cache*."""
+    if not isinstance(transport, (httpx.HTTPTransport, httpx.AsyncHTTPTransport)):
+        raise TypeError(f"Cannot install a DNS cache on {type(transport).__name__}")
+    pool = getattr(transport, "_pool", None)
+    backend = getattr(pool, "_network_backend", None)
+    if isinstance(transport, httpx.AsyncHTTPTransport):
+        expected, wrapper = httpcore.AsyncNetworkBackend, _AsyncCachingBackend
+    else:
+        expected, wrapper = httpcore.NetworkBackend, _CachingBackend
+    if not isinstance(pool, (httpcore.ConnectionPool, httpcore.AsyncConnectionPool)) or not isinstance(
+        backend, expected
+    ):
+        raise RuntimeError(
+            f"httpcore {httpcore.__version__} does not expose ConnectionPool._network_backend; "
+            "the DNS cache (-dns-ttl) needs httpcore 1.x (use -dns-ttl 0 to turn it off)"
+        )
+    if not isinstance(backend, wrapper):
+        pool._network_backend = wrapper(backend, cache)  # type: ignore[arg-type]
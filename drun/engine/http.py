@@ -1,21 +1,32 @@
 from __future__ import annotations
 
 import base64
+from collections import deque
+from dataclasses import dataclass
+import hashlib
+import mmap
+import os
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+import tempfile
+from typing import Any, Deque, Dict, Optional, List
+import weakref
 import httpx
 import json
 import time
 
 from drun.engine.request_files import RequestFilesError, _close_opened_files, normalize_request_files
+from drun.engine.throttle import HostThrottle, host_key
+from drun.engine.upload import RequestUploadError, UploadSource, build_upload_source
 
 
 class HTTPClient:
-    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None, verify: Optional[bool] = None, headers: Optional[Dict[str, str]] = None) -> None:
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None, verify: Optional[bool] = None, headers: Optional[Dict[str, str]] = None, transport: Optional[httpx.BaseTransport] = None, http2: bool = False, limits: Optional[httpx.Limits] = None, throttle: Optional[HostThrottle] = None) -> None:
         self.base_url = base_url or ""
         self.timeout = timeout
         self.verify = verify
         self.headers = headers or {}
+        self.throttle = throttle
+        self._base_host = host_key(self.base_url)
         event_hooks: Dict[str, list] = {}
         # httpstat 功能已移除，保留空 hooks
 
@@ -26,262 +37,823 @@ class HTTPClient:
             timeout=self.timeout or 10.0,
             verify=self.verify if self.verify is not None else True,
             headers=self.headers,
-            event_hooks=event_hooks
+            event_hooks=event_hooks,
+            transport=transport,
+            http2=http2,
+            limits=limits or httpx.Limits(max_connections=100, max_keepalive_connections=20),
         )
 
     def close(self) -> None:
         self.client.close()
 
-    def _parse_sse_stream(self, response: httpx.Response, start_time: float) -> Dict[str, Any]:
+    def _parse_sse_stream(self, response: httpx.Response, start_time: float, keep: Any = "all") -> Dict[str, Any]:
         """Parse Server-Sent Events (SSE) stream"""
-        events: List[Dict[str, Any]] = []
-        raw_chunks: List[str] = []
-        
+        parser = _SSEStreamParser(start_time, keep)
         try:
-            current_event: Dict[str, Any] = {}
-            current_data_lines: List[str] = []
-            
             for line in response.iter_lines():
-                current_time_ms = (time.perf_counter() - start_time) * 1000.0
-                raw_chunks.append(line + "\n")
-                
-                # Empty line marks end of event
-                if not line or line.strip() == "":
-                    if current_data_lines:
-                        # Join data lines and try to parse as JSON
-                        data_str = "\n".join(current_data_lines)
-                        
-                        # Handle [DONE] marker
-                        if data_str.strip() == "[DONE]":
-                            events.append({
-                                "index": len(events),
-                                "timestamp_ms": current_time_ms,
-                                "event": current_event.get("event", "done"),
-                                "data": None
-                            })
-                        else:
-                            # Try to parse as JSON
-                            try:
-                                data_obj = json.loads(data_str)
-                            except json.JSONDecodeError:
-                                data_obj = data_str
-                            
-                            events.append({
-                                "index": len(events),
-                                "timestamp_ms": current_time_ms,
-                                "event": current_event.get("event", "message"),
-                                "data": data_obj
-                            })
-                        
-                        # Reset for next event
-                        current_event = {}
-                        current_data_lines = []
-                    continue
-                
-                # Parse SSE fields
-                if ":" in line:
-                    field, _, value = line.partition(":")
-                    field = field.strip()
-                    value = value.lstrip()
-                    
-                    if field == "data":
-                        current_data_lines.append(value)
-                    elif field == "event":
-                        current_event["event"] = value
-                    elif field == "id":
-                        current_event["id"] = value
-                    elif field == "retry":
-                        current_event["retry"] = value
-        
+                parser.feed(line)
         except Exception as e:
             # Add error event if stream parsing fails
-            events.append({
-                "index": len(events),
-                "timestamp_ms": (time.perf_counter() - start_time) * 1000.0,
-                "event": "error",
-                "data": {"error": str(e)}
-            })
-        
-        # Calculate summary
+            parser.fail(e)
+        return parser.result()
+
+    def request(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = _prepare_request(req, self.timeout)
+        limit = self.throttle.for_host(_request_host(prepared, self._base_host)) if self.throttle else None
+        throttled = None
+        try:
+            if limit is not None:
+                throttled = limit.acquire()
+            timer = _PhaseTimer()
+            prepared.kwargs["extensions"] = {"trace": timer.trace}
+            try:
+                result = self._send(prepared)
+            finally:
+                if limit is not None:
+                    limit.release()
+        finally:
+            _close_opened_files(prepared.opened_files)
+        result["timing"] = timer.timing(throttled)
+        return result
+
+    def _send(self, prepared: _PreparedRequest) -> Dict[str, Any]:
+        if prepared.is_stream:
+            start_time = time.perf_counter()
+            with self.client.stream(**prepared.stream_kwargs()) as resp:
+                elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+                # Parse SSE stream
+                stream_data = self._parse_sse_stream(resp, start_time, prepared.stream_keep)
+                return _build_stream_result(resp, prepared.method, elapsed_ms, stream_data)
+
+        if prepared.max_memory_bytes is not None:
+            start_time = time.perf_counter()
+            with self.client.stream(**prepared.request_kwargs()) as resp:
+                spool = _SpooledBody(prepared.max_memory_bytes)
+                try:
+                    for chunk in resp.iter_bytes():
+                        spool.write(chunk)
+                except BaseException:
+                    spool.discard()
+                    raise
+                return spool.build_result(resp, (time.perf_counter() - start_time) * 1000.0)
+
+        # Non-streaming request (original behavior)
+        start_time = time.perf_counter()
+        resp = self.client.request(**prepared.request_kwargs())
+        return _build_response_result(resp, (time.perf_counter() - start_time) * 1000.0)
+
+
+class AsyncHTTPClient:
+    """``httpx.AsyncClient`` counterpart of :class:`HTTPClient`.
+
+    ``request()`` is a coroutine returning the same response dict, so the
+    step lifecycle can await it while other case instances share the loop.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None, verify: Optional[bool] = None, headers: Optional[Dict[str, str]] = None, transport: Optional[httpx.AsyncBaseTransport] = None, http2: bool = False, limits: Optional[httpx.Limits] = None, throttle: Optional[HostThrottle] = None) -> None:
+        self.base_url = base_url or ""
+        self.timeout = timeout
+        self.verify = verify
+        self.headers = headers or {}
+        self.throttle = throttle
+        self._base_host = host_key(self.base_url)
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout or 10.0,
+            verify=self.verify if self.verify is not None else True,
+            headers=self.headers,
+            transport=transport,
+            http2=http2,
+            limits=limits or httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _parse_sse_stream(self, response: httpx.Response, start_time: float, keep: Any = "all") -> Dict[str, Any]:
+        parser = _SSEStreamParser(start_time, keep)
+        try:
+            async for line in response.aiter_lines():
+                parser.feed(line)
+        except Exception as e:
+            parser.fail(e)
+        return parser.result()
+
+    async def request(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = _prepare_request(req, self.timeout)
+        if isinstance(prepared.kwargs.get("content"), UploadSource):
+            prepared.kwargs["content"] = prepared.kwargs["content"].aiter()
+        limit = self.throttle.for_host(_request_host(prepared, self._base_host)) if self.throttle else None
+        throttled = None
+        try:
+            if limit is not None:
+                throttled = await limit.acquire_async()
+            timer = _PhaseTimer()
+            prepared.kwargs["extensions"] = {"trace": timer.atrace}
+            try:
+                result = await self._send(prepared)
+            finally:
+                if limit is not None:
+                    limit.release_async()
+        finally:
+            _close_opened_files(prepared.opened_files)
+        result["timing"] = timer.timing(throttled)
+        return result
+
+    async def _send(self, prepared: _PreparedRequest) -> Dict[str, Any]:
+        if prepared.is_stream:
+            start_time = time.perf_counter()
+            async with self.client.stream(**prepared.stream_kwargs()) as resp:
+                elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+                stream_data = await self._parse_sse_stream(resp, start_time, prepared.stream_keep)
+                return _build_stream_result(resp, prepared.method, elapsed_ms, stream_data)
+
+        if prepared.max_memory_bytes is not None:
+            start_time = time.perf_counter()
+            async with self.client.stream(**prepared.request_kwargs()) as resp:
+                spool = _SpooledBody(prepared.max_memory_bytes)
+                try:
+                    async for chunk in resp.aiter_bytes():
+                        spool.write(chunk)
+                except BaseException:
+                    spool.discard()
+                    raise
+                return spool.build_result(resp, (time.perf_counter() - start_time) * 1000.0)
+
+        start_time = time.perf_counter()
+        resp = await self.client.request(**prepared.request_kwargs())
+        return _build_response_result(resp, (time.perf_counter() - start_time) * 1000.0)
+
+
+@dataclass
+class _PreparedRequest:
+    method: str
+    kwargs: Dict[str, Any]
+    is_stream: bool
+    stream_timeout: Any
+    opened_files: List[Any]
+    max_memory_bytes: Optional[int] = None
+    stream_keep: Any = "all"
+
+    def request_kwargs(self) -> Dict[str, Any]:
+        return {"method": self.method, **self.kwargs}
+
+    def stream_kwargs(self) -> Dict[str, Any]:
+        # Use streaming timeout if specified
+        kwargs = self.request_kwargs()
+        if self.stream_timeout:
+            kwargs["timeout"] = self.stream_timeout
+        return kwargs
+
+
+def _prepare_request(req: Dict[str, Any], default_timeout: Optional[float]) -> _PreparedRequest:
+    method = req.get("method", "GET")
+    path = req.get("path", "")
+    # Ensure path is not None or empty when no base_url
+    if not path:
+        path = "/"
+    params = req.get("params")
+    headers = req.get("headers") or {}
+    # 'body' holds JSON object or raw content from test step
+    json_data = req.get("body")
+    data = req.get("data")
+    files = req.get("files")
+    # Raw body streamed from a file, bytes or an iterator (see drun.engine.upload)
+    upload = req.get("upload")
+    timeout = req.get("timeout", default_timeout)
+    allow_redirects = req.get("allow_redirects", True)
+    auth = req.get("auth")
+
+    # Check if streaming mode is enabled
+    is_stream = req.get("stream", False)
+    stream_timeout = req.get("stream_timeout", 30.0)
+    stream_keep = req.get("stream_keep", "all")
+    # Download mode: bodies larger than this are spooled to a temp file
+    max_memory_bytes = req.get("max_memory_bytes")
+
+    # auth support: basic, bearer
+    if auth and isinstance(auth, dict):
+        if auth.get("type") == "basic":
+            username = auth.get("username", "")
+            password = auth.get("password", "")
+            auth_tuple = (username, password)
+        elif auth.get("type") == "bearer":
+            token = auth.get("token", "")
+            headers = {**headers, "Authorization": f"Bearer {token}"}
+            auth_tuple = None
+        else:
+            auth_tuple = None
+    else:
+        auth_tuple = None
+
+    if files is not None and json_data is not None:
+        raise RequestFilesError(
+            "request.body cannot be used with request.files. Use request.data for multipart form fields."
+        )
+
+    upload_source = None
+    if upload is not None:
+        if json_data is not None or data is not None or files is not None:
+            raise RequestUploadError(
+                "request.upload cannot be combined with request.body, request.data or request.files"
+            )
+        upload_source, upload_type = build_upload_source(upload, cwd=Path.cwd())
+        present = {str(k).lower() for k in headers}
+        headers = dict(headers)
+        if upload_source.content_length is not None and "content-length" not in present:
+            headers["Content-Length"] = str(upload_source.content_length)
+        if upload_type and "content-type" not in present:
+            headers["Content-Type"] = upload_type
+
+    normalized_files = None
+    opened_files: List[Any] = []
+    if files is not None:
+        normalized_files, opened_files = normalize_request_files(
+            files,
+            cwd=Path.cwd(),
+            source="request.files",
+        )
+
+    return _PreparedRequest(
+        method=method,
+        kwargs={
+            "url": path,
+            "params": params,
+            "headers": headers,
+            "json": json_data,
+            "data": data,
+            "files": normalized_files,
+            "content": upload_source,
+            "timeout": timeout,
+            "follow_redirects": bool(allow_redirects),
+            "auth": auth_tuple,
+        },
+        is_stream=bool(is_stream),
+        stream_timeout=stream_timeout,
+        opened_files=opened_files,
+        max_memory_bytes=max_memory_bytes,
+        stream_keep=stream_keep,
+    )
+
+
+class _PhaseTimer:
+    """Per-phase request timings taken from httpcore ``trace`` events.
+
+    Values are milliseconds.  ``connect_ms`` includes DNS resolution, which
+    httpcore performs inside ``connect_tcp``; ``connect_ms`` and ``tls_ms``
+    are ``None`` when a pooled connection was reused.  Transports that emit
+    no trace events (e.g. ``httpx.MockTransport``) only get ``total_ms``.
+    After a redirect the phases describe the final hop.  ``throttle_ms`` is
+    the client-side rate limit wait before the request (``None`` when the
+    host has no limit) and is not part of ``total_ms``.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        name = event_name.split(".", 1)[-1]  # drop the "connection." / "http11." / "http2." prefix
+        if name == "connect_tcp.started" or (
+            name == "send_request_headers.started" and "receive_response_headers.complete" in self.marks
+        ):
+            self.marks.clear()
+        self.marks[name] = now
+
+    async def atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self.trace(event_name, info)
+
+    def _span(self, start: str, end: str) -> float | None:
+        if start not in self.marks or end not in self.marks:
+            return None
+        return round((self.marks[end] - self.marks[start]) * 1000.0, 3)
+
+    def timing(self, throttled: float | None = None) -> Dict[str, Any]:
+        marks = self.marks
+        headers_at = marks.get("receive_response_headers.complete")
+        return {
+            "connect_ms": self._span("connect_tcp.started", "connect_tcp.complete"),
+            "tls_ms": self._span("start_tls.started", "start_tls.complete"),
+            "send_ms": self._span("send_request_headers.started", "send_request_body.complete"),
+            "wait_ms": self._span("send_request_body.complete", "receive_response_headers.complete"),
+            "ttfb_ms": round((headers_at - self.start) * 1000.0, 3) if headers_at is not None else None,
+            "receive_ms": self._span("receive_response_body.started", "receive_response_body.complete"),
+            "total_ms": round((time.perf_counter() - self.start) * 1000.0, 3),
+            "connection_reused": (
+                "connect_tcp.started" not in marks if "send_request_headers.started" in marks else None
+            ),
+            # Client-side rate limit / host concurrency wait before the request started
+            "throttle_ms": round(throttled * 1000.0, 3) if throttled is not None else None,
+        }
+
+
+def _request_host(prepared: "_PreparedRequest", base_host: str | None) -> str | None:
+    return host_key(prepared.kwargs.get("url")) or base_host
+
+
+def stream_event_text(data: Any) -> str | None:
+    """Text carried by one SSE event: OpenAI ``choices[0].delta.content`` or plain ``content``/``text``."""
+    if not isinstance(data, dict):
+        return None
+    try:
+        choice = data.get("choices", [{}])[0] if "choices" in data else {}
+        delta = choice.get("delta", {}) if "delta" in choice else choice
+        content = delta.get("content") or delta.get("text") or data.get("content") or data.get("text")
+    except (IndexError, KeyError, TypeError, AttributeError):
+        return None
+    return str(content) if content else None
+
+
+class _SSEStreamParser:
+    """Incremental SSE parser shared by the sync and async clients.
+
+    Every event is folded into the summary, latency stats and merged content
+    as soon as it completes, so only the retained events are held in memory.
+    ``keep`` selects what is retained: ``"all"`` (every event and raw line),
+    an integer ``N`` (the first and last N events with their raw lines) or
+    ``"summary"`` (no events, no raw lines).
+
+    ``progressive_content`` entries store ``offset`` / ``delta``; the
+    accumulated ``content`` of earlier releases is derived from the merged
+    text when ``entry["content"]`` is read and is never stored or serialized.
+    """
+
+    def __init__(self, start_time: float, keep: Any = "all") -> None:
+        self.start_time = start_time
+        self.keep_all = keep in (None, "all")
+        self.edge_size = keep if isinstance(keep, int) and not isinstance(keep, bool) else 0
+        self.events: List[Dict[str, Any]] = []
+        self.raw_chunks: List[str] = []
+        self._tail: Deque[tuple[Dict[str, Any], List[str]]] = deque(maxlen=self.edge_size or None)
+        self._current_event: Dict[str, Any] = {}
+        self._current_data_lines: List[str] = []
+        self._current_raw: List[str] = []
+        self.event_count = 0
+        self.first_ms: float | None = None
+        self.last_ms: float | None = None
+        self._gap_min: float | None = None
+        self._gap_max = 0.0
+        self._content = _MergedText()
+        self.progressive_content: List[Dict[str, Any]] = []
+
+    def feed(self, line: str) -> None:
+        current_time_ms = (time.perf_counter() - self.start_time) * 1000.0
+        if self.keep_all:
+            self.raw_chunks.append(line + "\n")
+        elif self.edge_size:
+            self._current_raw.append(line + "\n")
+
+        # Empty line marks end of event
+        if not line or line.strip() == "":
+            if self._current_data_lines:
+                # Join data lines and try to parse as JSON
+                data_str = "\n".join(self._current_data_lines)
+
+                # Handle [DONE] marker
+                if data_str.strip() == "[DONE]":
+                    self._emit(current_time_ms, self._current_event.get("event", "done"), None)
+                else:
+                    # Try to parse as JSON
+                    try:
+                        data_obj = json.loads(data_str)
+                    except json.JSONDecodeError:
+                        data_obj = data_str
+                    self._emit(current_time_ms, self._current_event.get("event", "message"), data_obj)
+
+                # Reset for next event
+                self._current_event = {}
+                self._current_data_lines = []
+            return
+
+        # Parse SSE fields
+        if ":" in line:
+            field, _, value = line.partition(":")
+            field = field.strip()
+            value = value.lstrip()
+
+            if field == "data":
+                self._current_data_lines.append(value)
+            elif field == "event":
+                self._current_event["event"] = value
+            elif field == "id":
+                self._current_event["id"] = value
+            elif field == "retry":
+                self._current_event["retry"] = value
+
+    def fail(self, error: Exception) -> None:
+        self._emit(
+            (time.perf_counter() - self.start_time) * 1000.0,
+            "error",
+            {"error": str(error)},
+        )
+
+    def _emit(self, timestamp_ms: float, event_name: str, data: Any) -> None:
+        event = {
+            "index": self.event_count,
+            "timestamp_ms": timestamp_ms,
+            "event": event_name,
+            "data": data,
+        }
+        self.event_count += 1
+        if self.first_ms is None:
+            self.first_ms = timestamp_ms
+        else:
+            gap = timestamp_ms - (self.last_ms or 0.0)
+            self._gap_min = gap if self._gap_min is None else min(self._gap_min, gap)
+            self._gap_max = max(self._gap_max, gap)
+        self.last_ms = timestamp_ms
+
+        text = stream_event_text(data)
+        if text:
+            if self.keep_all:
+                self.progressive_content.append(_ProgressiveEntry(
+                    self._content,
+                    index=len(self.progressive_content) + 1,
+                    timestamp_ms=timestamp_ms,
+                    offset=len(self._content),
+                    delta=text,
+                ))
+            self._content.append(text)
+
+        if self.keep_all:
+            self.events.append(event)
+        elif self.edge_size:
+            raw, self._current_raw = self._current_raw, []
+            if len(self.events) < self.edge_size:
+                self.events.append(event)
+                self.raw_chunks.extend(raw)
+            else:
+                self._tail.append((event, raw))
+
+    def _latency(self) -> Dict[str, Any]:
+        gaps = self.event_count - 1
+        if gaps < 1 or self.first_ms is None or self.last_ms is None:
+            return {"count": 0, "min": 0, "max": 0, "avg": 0}
+        return {
+            "count": gaps,
+            "min": self._gap_min or 0.0,
+            "max": self._gap_max,
+            "avg": (self.last_ms - self.first_ms) / gaps,
+        }
+
+    def result(self) -> Dict[str, Any]:
+        events = self.events
+        raw_chunks = self.raw_chunks
+        if self.edge_size:
+            dropped = self.event_count - len(events) - len(self._tail)
+            events = list(events)
+            raw_chunks = list(raw_chunks)
+            if dropped:
+                raw_chunks.append(f": {dropped} events omitted\n\n")
+            for event, raw in self._tail:
+                events.append(event)
+                raw_chunks.extend(raw)
+            raw_chunks.extend(self._current_raw)
+
         summary = {
-            "event_count": len(events),
-            "first_chunk_ms": events[0]["timestamp_ms"] if events else 0,
-            "last_chunk_ms": events[-1]["timestamp_ms"] if events else 0
+            "event_count": self.event_count,
+            "first_chunk_ms": self.first_ms or 0,
+            "last_chunk_ms": self.last_ms or 0,
+            "inter_event_ms": self._latency(),
+            "retained_events": len(events),
+            "content_length": len(self._content),
         }
-        
-        # Extract progressive content for display (OpenAI format)
-        progressive_content = []
-        accumulated = ""
-        for event in events:
-            data = event.get("data")
-            if data and isinstance(data, dict):
-                # Try to extract content from OpenAI streaming format
-                choices = data.get("choices", [])
-                if choices and isinstance(choices, list) and len(choices) > 0:
-                    delta = choices[0].get("delta", {})
-                    if isinstance(delta, dict):
-                        content = delta.get("content", "")
-                        if content:  # Only record non-empty content
-                            accumulated += content
-                            progressive_content.append({
-                                "index": len(progressive_content) + 1,
-                                "timestamp_ms": event.get("timestamp_ms", 0),
-                                "content": accumulated
-                            })
-        
+
         return {
             "stream_events": events,
             "stream_raw_chunks": raw_chunks,
             "stream_summary": summary,
-            "progressive_content": progressive_content
+            "stream_content": self._content.until(len(self._content)),
+            "progressive_content": self.progressive_content,
         }
 
-    def request(self, req: Dict[str, Any]) -> Dict[str, Any]:
-        method = req.get("method", "GET")
-        path = req.get("path", "")
-        # Ensure path is not None or empty when no base_url
-        if not path:
-            path = "/"
-        params = req.get("params")
-        headers = req.get("headers") or {}
-        # 'body' holds JSON object or raw content from test step
-        json_data = req.get("body")
-        data = req.get("data")
-        files = req.get("files")
-        timeout = req.get("timeout", self.timeout)
-        verify = req.get("verify", self.verify)
-        allow_redirects = req.get("allow_redirects", True)
-        auth = req.get("auth")
-        
-        # Check if streaming mode is enabled
-        is_stream = req.get("stream", False)
-        stream_timeout = req.get("stream_timeout", 30.0)
-
-        # auth support: basic, bearer
-        if auth and isinstance(auth, dict):
-            if auth.get("type") == "basic":
-                username = auth.get("username", "")
-                password = auth.get("password", "")
-                auth_tuple = (username, password)
-            elif auth.get("type") == "bearer":
-                token = auth.get("token", "")
-                headers = {**headers, "Authorization": f"Bearer {token}"}
-                auth_tuple = None
-            else:
-                auth_tuple = None
-        else:
-            auth_tuple = None
 
-        if files is not None and json_data is not None:
-            raise RequestFilesError(
-                "request.body cannot be used with request.files. Use request.data for multipart form fields."
-            )
+class _MergedText:
+    """Stream text kept as parts and joined once when a prefix is needed."""
 
-        normalized_files = None
-        opened_files = []
-        if files is not None:
-            normalized_files, opened_files = normalize_request_files(
-                files,
-                cwd=Path.cwd(),
-                source="request.files",
-            )
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+        self._length = 0
+        self._joined = ""
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, text: str) -> None:
+        self._parts.append(text)
+        self._length += len(text)
+
+    def until(self, end: int) -> str:
+        if len(self._joined) != self._length:
+            self._joined = "".join(self._parts)
+        return self._joined[:end]
+
+
+class _ProgressiveEntry(dict):
+    """``progressive_content`` item; ``["content"]`` is the text so far.
+
+    Only ``index`` / ``timestamp_ms`` / ``offset`` / ``delta`` are stored,
+    so iterating, copying or dumping a list of entries stays linear in the
+    stream length.
+    """
 
-        # Handle streaming requests
+    def __init__(self, text: _MergedText, **fields: Any) -> None:
+        super().__init__(fields)
+        self._text = text
+
+    def __missing__(self, key: str) -> Any:
+        if key != "content":
+            raise KeyError(key)
+        return self._text.until(self["offset"] + len(self["delta"]))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key == "content" else dict.get(self, key, default)
+
+
+def _build_stream_result(resp: httpx.Response, method: str, elapsed_ms: float, stream_data: Dict[str, Any]) -> Dict[str, Any]:
+    result = {
+        "status_code": resp.status_code,
+        "headers": dict(resp.headers),
+        "content_type": resp.headers.get("content-type"),
+        "body_size": 0,
+        "raw_bytes": b"",
+        "is_stream": True,
+        "elapsed_ms": elapsed_ms,
+        "url": str(resp.url),
+        "method": method,
+        "http_version": resp.http_version,
+    }
+    result.update(stream_data)
+    return result
+
+
+class LazyResponse(dict):
+    """Response dict whose costly keys are computed on first access.
+
+    ``body`` (JSON parse / text decode) and ``body_bytes_b64`` are produced
+    by loaders the first time they are read and then stored like any other
+    key.  Operations that need every key (iteration, ``len``, copying,
+    comparison, pickling) load the remaining ones first.
+    """
+
+    def __init__(self, data: Dict[str, Any], loaders: Dict[str, Any]) -> None:
+        super().__init__(data)
+        self._loaders: Dict[str, Any] = dict(loaders)
+
+    def __missing__(self, key: str) -> Any:
+        loader = self._loaders.pop(key, None)
+        if loader is None:
+            raise KeyError(key)
+        value = loader()
+        dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
         try:
-            if is_stream:
-                start_time = time.perf_counter()
-
-                # Use streaming timeout if specified
-                actual_timeout = stream_timeout if stream_timeout else timeout
-
-                with self.client.stream(
-                    method=method,
-                    url=path,
-                    params=params,
-                    headers=headers,
-                    json=json_data,
-                    data=data,
-                    files=normalized_files,
-                    timeout=actual_timeout,
-                    follow_redirects=bool(allow_redirects),
-                    auth=auth_tuple,
-                ) as resp:
-                    elapsed_ms = (time.perf_counter() - start_time) * 1000.0
-
-                    # Parse SSE stream
-                    stream_data = self._parse_sse_stream(resp, start_time)
-
-                    result = {
-                        "status_code": resp.status_code,
-                        "headers": dict(resp.headers),
-                        "content_type": resp.headers.get("content-type"),
-                        "body_size": 0,
-                        "raw_bytes": b"",
-                        "is_stream": True,
-                        "elapsed_ms": elapsed_ms,
-                        "url": str(resp.url),
-                        "method": method,
-                    }
-                    result.update(stream_data)
-                    return result
-
-            # Non-streaming request (original behavior)
-            resp = self.client.request(
-                method=method,
-                url=path,
-                params=params,
-                headers=headers,
-                json=json_data,
-                data=data,
-                files=normalized_files,
-                timeout=timeout,
-                follow_redirects=bool(allow_redirects),
-                auth=auth_tuple,
-            )
+            return self[key]
+        except KeyError:
+            return default
 
-            content_type = resp.headers.get("content-type")
-            raw_bytes = resp.content
-            body_text: Optional[str] = None
-            body_json: Any = None
+    def load_all(self) -> "LazyResponse":
+        for key in list(self._loaders):
+            self[key]
+        return self
 
-            if _should_try_json(content_type):
-                try:
-                    body_json = resp.json()
-                except Exception:
-                    body_json = None
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._loaders
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._loaders.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.load_all()
+        dict.__delitem__(self, key)
+
+    def __iter__(self):
+        return dict.__iter__(self.load_all())
 
-            if body_json is None and _should_decode_text(content_type, raw_bytes):
-                try:
-                    body_text = resp.text
-                except Exception:
-                    body_text = None
+    def __len__(self) -> int:
+        return dict.__len__(self.load_all())
+
+    def __bool__(self) -> bool:
+        # ``resp or {}`` must not decode the body.
+        return bool(self._loaders) or dict.__len__(self) > 0
 
-            if body_json is None and body_text is None and content_type is None:
-                try:
-                    body_json = resp.json()
-                except Exception:
-                    if _should_decode_text(content_type, raw_bytes):
-                        try:
-                            body_text = resp.text
-                        except Exception:
-                            body_text = None
-
-            result = {
+    def __eq__(self, other: object) -> bool:
+        return dict.__eq__(self.load_all(), other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self.load_all())
+
+    def __reduce__(self):
+        return (dict, (dict(self.load_all().items()),))
+
+    def keys(self):
+        return dict.keys(self.load_all())
+
+    def values(self):
+        return dict.values(self.load_all())
+
+    def items(self):
+        return dict.items(self.load_all())
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.load_all().items())
+
+    def pop(self, key: str, *default: Any) -> Any:
+        self.load_all()
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class _BodyDecoder:
+    """Decode a buffered response once, on first use."""
+
+    def __init__(self, resp: httpx.Response, content_type: str | None, raw_bytes: bytes) -> None:
+        self.resp = resp
+        self.content_type = content_type
+        self.raw_bytes = raw_bytes
+        self._decoded: tuple[Any, Optional[str]] | None = None
+
+    # Same results as ``resp.json()`` / ``resp.text``, but from the bytes we
+    # hold: a response read through ``client.stream`` has no ``.content``.
+    def _json(self) -> Any:
+        return json.loads(self.raw_bytes)
+
+    def _text(self) -> str:
+        return self.raw_bytes.decode(self.resp.encoding or "utf-8", errors="replace")
+
+    def decode(self) -> tuple[Any, Optional[str]]:
+        if self._decoded is not None:
+            return self._decoded
+        content_type, raw_bytes = self.content_type, self.raw_bytes
+        body_text: Optional[str] = None
+        body_json: Any = None
+
+        if _should_try_json(content_type):
+            try:
+                body_json = self._json()
+            except Exception:
+                body_json = None
+
+        if body_json is None and _should_decode_text(content_type, raw_bytes):
+            try:
+                body_text = self._text()
+            except Exception:
+                body_text = None
+
+        if body_json is None and body_text is None and content_type is None:
+            try:
+                body_json = self._json()
+            except Exception:
+                if _should_decode_text(content_type, raw_bytes):
+                    try:
+                        body_text = self._text()
+                    except Exception:
+                        body_text = None
+
+        self._decoded = (body_json, body_text)
+        return self._decoded
+
+    def body(self) -> Any:
+        body_json, body_text = self.decode()
+        return body_json if body_json is not None else body_text
+
+    def body_bytes_b64(self) -> Optional[str]:
+        body_json, body_text = self.decode()
+        if not _should_capture_binary_payload(self.content_type, body_json, body_text, self.raw_bytes):
+            return None
+        return base64.b64encode(self.raw_bytes).decode("ascii")
+
+
+def _build_response_result(
+    resp: httpx.Response,
+    measured_ms: float,
+    raw_bytes: bytes | None = None,
+    extra: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    content_type = resp.headers.get("content-type")
+    if raw_bytes is None:
+        raw_bytes = resp.content
+    decoder = _BodyDecoder(resp, content_type, raw_bytes)
+
+    elapsed_ms = _get_elapsed_ms(resp)
+    return LazyResponse(
+        {
+            "status_code": resp.status_code,
+            "headers": dict(resp.headers),
+            "content_type": content_type,
+            "body_size": len(raw_bytes),
+            "raw_bytes": raw_bytes,
+            "elapsed_ms": elapsed_ms if elapsed_ms is not None else measured_ms,
+            "url": str(resp.request.url),
+            "method": str(resp.request.method),
+            "http_version": resp.http_version,
+            **(extra or {}),
+        },
+        loaders={"body": decoder.body, "body_bytes_b64": decoder.body_bytes_b64},
+    )
+
+
+class _SpooledBody:
+    """Collect a streamed body, moving it to a temp file past ``limit`` bytes.
+
+    ``body_size`` and ``body_sha256`` are computed chunk by chunk.  Bodies
+    within the limit are returned like a buffered response; larger ones are
+    exposed as a read-only ``mmap`` view of the file (``body_path``), are not
+    decoded and get no ``body_bytes_b64``.  The mapping is closed and the
+    file removed when the response dict is garbage collected;
+    ``response.save_body_to`` copies the file out before that.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.chunks: List[bytes] = []
+        self.file: Any = None
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self.size += len(chunk)
+        self.sha256.update(chunk)
+        if self.file is None:
+            self.chunks.append(chunk)
+            if self.size <= self.limit:
+                return
+            self.file = tempfile.NamedTemporaryFile(prefix="drun-body-", suffix=".part", delete=False)
+            chunk_list, self.chunks = self.chunks, []
+            for pending in chunk_list:
+                self.file.write(pending)
+            return
+        self.file.write(chunk)
+
+    def discard(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            _remove_spool_file(self.file.name)
+            self.file = None
+
+    def build_result(self, resp: httpx.Response, measured_ms: float) -> Dict[str, Any]:
+        extra = {"body_sha256": self.sha256.hexdigest()}
+        if self.file is None:
+            return _build_response_result(resp, measured_ms, b"".join(self.chunks), extra)
+
+        path = self.file.name
+        self.file.close()
+        with open(path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        elapsed_ms = _get_elapsed_ms(resp)
+        result = LazyResponse(
+            {
                 "status_code": resp.status_code,
                 "headers": dict(resp.headers),
-                "body": body_json if body_json is not None else body_text,
-                "content_type": content_type,
-                "body_size": len(raw_bytes),
-                "raw_bytes": raw_bytes,
-                "elapsed_ms": _get_elapsed_ms(resp),
+                "content_type": resp.headers.get("content-type"),
+                "body_size": self.size,
+                "raw_bytes": view,
+                "elapsed_ms": elapsed_ms if elapsed_ms is not None else measured_ms,
                 "url": str(resp.request.url),
                 "method": str(resp.request.method),
-            }
-            if _should_capture_binary_payload(content_type, body_json, body_text, raw_bytes):
-                result["body_bytes_b64"] = base64.b64encode(raw_bytes).decode("ascii")
-            return result
-        finally:
-            _close_opened_files(opened_files)
+                "http_version": resp.http_version,
+                "body_path": path,
+                **extra,
+            },
+            loaders={"body": lambda: None, "body_bytes_b64": lambda: None},
+        )
+        weakref.finalize(result, _release_spool, view, mapped, path)
+        return result
+
+
+def _release_spool(view: memoryview, mapped: mmap.mmap, path: str) -> None:
+    try:
+        view.release()
+        mapped.close()
+    except BufferError:
+        # A slice of raw_bytes outlived the response; the mapping goes with it.
+        pass
+    _remove_spool_file(path)
+
+
+def _remove_spool_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
 
 
 def _should_try_json(content_type: str | None) -> bool:
@@ -0,0 +1,226 @@
+"""Run-scoped connection pool shared by every case instance.
+
+Each case keeps its own ``httpx.Client`` (and therefore its own cookie jar,
+base_url, default headers and timeout), but all clients with the same TLS
+settings send through one shared transport, so keep-alive connections and
+TLS sessions survive from one case instance to the next.  Closing a case's
+client leaves the shared transport open; the pool owner closes it once at
+the end of the run.  Transports are keyed by TLS verification, HTTP/2 and
+connection limits, so ``config.http2`` or per-case limits get their own pool.
+
+httpx only honours ``HTTP(S)_PROXY``/``ALL_PROXY`` when a client builds its own
+transport, so the pool steps aside (``transport()`` returns ``None``) while
+any of those variables is set.
+
+With a cassette (``-cassette``) every transport is wrapped in a
+:class:`~drun.engine.cassette.CassetteTransport`; in ``replay`` mode no
+network transport is created at all, and while proxy variables are set the
+recording transport sends through the ``HTTPS_PROXY``/``HTTP_PROXY``/
+``ALL_PROXY`` URL (``NO_PROXY`` is not consulted).
+
+``dns_ttl`` routes new connections of every pooled transport through the
+process-wide :mod:`drun.engine.dns` cache.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import httpx
+
+from drun.engine.cassette import AsyncCassetteTransport, CassetteStore, CassetteTransport
+from drun.engine.dns import DnsCache, install_dns_cache
+from drun.engine.throttle import HostThrottle
+
+
+class _SharedTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport) -> None:
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.inner.handle_request(request)
+
+    def close(self) -> None:
+        # Owned by ClientPool; a case client closing must not drop the pool.
+        return None
+
+
+class _SharedAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        return None
+
+
+class ClientPool:
+    def __init__(
+        self,
+        *,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+        cassette: CassetteStore | None = None,
+        dns_ttl: float | None = None,
+    ) -> None:
+        self.http2 = http2
+        self.cassette = cassette
+        self.dns_ttl = dns_ttl
+        self.dns_cache: DnsCache | None = DnsCache(dns_ttl) if dns_ttl else None
+        # Per-host rate limits / concurrency caps shared by every case instance
+        self.throttle = HostThrottle()
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._lock = threading.Lock()
+        self._transports: Dict[Hashable, Tuple[Optional[httpx.HTTPTransport], _SharedTransport]] = {}
+        self._async_transports: Dict[
+            Hashable, Tuple[Optional[httpx.AsyncHTTPTransport], _SharedAsyncTransport]
+        ] = {}
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def resolve(
+        self,
+        *,
+        http2: bool | None = None,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+    ) -> Tuple[bool, httpx.Limits]:
+        """Apply per-case ``config`` overrides on top of the run defaults."""
+        return (
+            self.http2 if http2 is None else http2,
+            httpx.Limits(
+                max_connections=self.max_connections if max_connections is None else max_connections,
+                max_keepalive_connections=(
+                    self.max_keepalive_connections
+                    if max_keepalive_connections is None
+                    else max_keepalive_connections
+                ),
+                keepalive_expiry=self.keepalive_expiry if keepalive_expiry is None else keepalive_expiry,
+            ),
+        )
+
+    def transport(self, *, verify: bool | None = None, **overrides: Any) -> Optional[httpx.BaseTransport]:
+        proxy = _env_proxy_url()
+        if proxy and self.cassette is None:
+            return None
+        http2, limits = self.resolve(**overrides)
+        key = _pool_key(verify, http2, limits)
+        with self._lock:
+            entry = self._transports.get(key)
+            if entry is None:
+                inner: Optional[httpx.HTTPTransport] = None
+                if self.cassette is None or self.cassette.uses_network:
+                    inner = httpx.HTTPTransport(verify=_verify(verify), http2=http2, limits=limits, proxy=proxy)
+                    if self.dns_cache is not None:
+                        install_dns_cache(inner, self.dns_cache)
+                outer: httpx.BaseTransport = inner  # type: ignore[assignment]
+                if self.cassette is not None:
+                    outer = CassetteTransport(self.cassette, inner)
+                entry = (inner, _SharedTransport(outer))
+                self._transports[key] = entry
+        return entry[1]
+
+    def async_transport(self, *, verify: bool | None = None, **overrides: Any) -> Optional[httpx.AsyncBaseTransport]:
+        proxy = _env_proxy_url()
+        if proxy and self.cassette is None:
+            return None
+        http2, limits = self.resolve(**overrides)
+        key = _pool_key(verify, http2, limits)
+        with self._lock:
+            entry = self._async_transports.get(key)
+            if entry is None:
+                inner: Optional[httpx.AsyncHTTPTransport] = None
+                if self.cassette is None or self.cassette.uses_network:
+                    inner = httpx.AsyncHTTPTransport(
+                        verify=_verify(verify), http2=http2, limits=limits, proxy=proxy
+                    )
+                    if self.dns_cache is not None:
+                        install_dns_cache(inner, self.dns_cache)
+                outer: httpx.AsyncBaseTransport = inner  # type: ignore[assignment]
+                if self.cassette is not None:
+                    outer = AsyncCassetteTransport(self.cassette, inner)
+                entry = (inner, _SharedAsyncTransport(outer))
+                self._async_transports[key] = entry
+        return entry[1]
+
+    def close(self) -> None:
+        with self._lock:
+            transports, self._transports = self._transports, {}
+        for inner, _shared in transports.values():
+            if inner is not None:
+                inner.close()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            transports, self._async_transports = self._async_transports, {}
+        for inner, _shared in transports.values():
+            if inner is not None:
+                await inner.aclose()
+
+    # Worker processes get an empty pool with the same limits (and reopen the cassette).
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "http2": self.http2,
+            "cassette": self.cassette,
+            "dns_ttl": self.dns_ttl,
+            "throttle": self.throttle,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        throttle = state.pop("throttle", None)
+        self.__init__(**state)
+        if throttle is not None:
+            self.throttle = throttle
+
+
+def _verify(verify: bool | None) -> bool:
+    return verify if verify is not None else True
+
+
+def _pool_key(verify: bool | None, http2: bool, limits: httpx.Limits) -> Hashable:
+    return (
+        _verify(verify),
+        http2,
+        limits.max_connections,
+        limits.max_keepalive_connections,
+        limits.keepalive_expiry,
+    )
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install 'drun[http2]'``)."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _env_proxy_url() -> Optional[str]:
+    for name in ("HTTPS_PROXY", "HTTP_PROXY", "ALL_PROXY"):
+        value = os.environ.get(name) or os.environ.get(name.lower())
+        if value:
+            return value
+    return None
+
+
+def _env_proxies_configured() -> bool:
+    return _env_proxy_url() is not None
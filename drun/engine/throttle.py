@@ -0,0 +1,196 @@
+"""Client-side per-host rate limits and concurrency caps.
+
+``config.rate_limit: 200/s`` and ``config.host_concurrency: 20`` (or
+``RATE_LIMIT`` / ``HOST_CONCURRENCY`` in the env file) register a limit for
+the host of the case's ``base_url`` on the run's :class:`HostThrottle`,
+which lives on :class:`drun.engine.pool.ClientPool` and is therefore shared
+by every case instance of the run.  ``HTTPClient`` acquires the host's
+limit before each request and releases it once the response body is read;
+the time spent waiting is reported as ``timing.throttle_ms`` and is not
+part of ``elapsed_ms``.
+
+Rates are token buckets holding up to the spec's count (``200/s`` allows a
+burst of 200, then one request every 5 ms).  When several cases register
+different limits for one host the strictest applies.  With
+``-parallel process`` each worker process keeps its own buckets.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+
+_RATE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)?\s*(ms|s|sec|m|min|h)\s*$", re.IGNORECASE)
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "sec": 1.0, "m": 60.0, "min": 60.0, "h": 3600.0}
+
+
+class RateLimitError(ValueError):
+    """Raised for an invalid rate limit spec."""
+
+
+def parse_rate(spec: Any) -> Tuple[float, float]:
+    """``"200/s"`` -> ``(200.0, 1.0)``; also ``10/min``, ``5/100ms``, ``1/2s``, ``3/h``."""
+    match = _RATE.match(str(spec))
+    if match is None:
+        raise RateLimitError(f"Invalid rate limit {spec!r} (expected e.g. '200/s', '10/min' or '5/100ms')")
+    count = float(match.group(1))
+    period = float(match.group(2) or 1) * _UNIT_SECONDS[match.group(3).lower()]
+    if count <= 0 or period <= 0:
+        raise RateLimitError(f"Invalid rate limit {spec!r}: count and period must be > 0")
+    return count, period
+
+
+class TokenBucket:
+    def __init__(self, count: float, period: float) -> None:
+        self.count = count
+        self.period = period
+        self.capacity = max(count, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.count / self.period
+
+    def reserve(self) -> float:
+        """Take one token; seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1.0
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class HostLimit:
+    """Rate bucket and concurrency cap for one host."""
+
+    def __init__(self, bucket: TokenBucket | None, concurrency: int | None) -> None:
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self._semaphore = threading.BoundedSemaphore(concurrency) if concurrency else None
+        self._async_semaphores: Dict[int, asyncio.Semaphore] = {}
+
+    def acquire(self) -> float:
+        """Block until the request may go out; returns the seconds waited."""
+        start = time.perf_counter()
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        if self.bucket is not None:
+            delay = self.bucket.reserve()
+            if delay > 0:
+                time.sleep(delay)
+        return time.perf_counter() - start
+
+    def release(self) -> None:
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    async def acquire_async(self) -> float:
+        start = time.perf_counter()
+        semaphore = self._loop_semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        if self.bucket is not None:
+            delay = self.bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return time.perf_counter() - start
+
+    def release_async(self) -> None:
+        semaphore = self._loop_semaphore()
+        if semaphore is not None:
+            semaphore.release()
+
+    def _loop_semaphore(self) -> asyncio.Semaphore | None:
+        if not self.concurrency:
+            return None
+        key = id(asyncio.get_running_loop())
+        semaphore = self._async_semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._async_semaphores.setdefault(key, asyncio.Semaphore(self.concurrency))
+        return semaphore
+
+
+@dataclass(frozen=True)
+class _LimitSpec:
+    rate: Optional[Tuple[float, float]] = None
+    concurrency: Optional[int] = None
+
+    def merge(self, other: "_LimitSpec") -> "_LimitSpec":
+        rate = self.rate
+        if other.rate is not None and (rate is None or other.rate[0] / other.rate[1] < rate[0] / rate[1]):
+            rate = other.rate
+        concurrency = self.concurrency
+        if other.concurrency is not None and (concurrency is None or other.concurrency < concurrency):
+            concurrency = other.concurrency
+        return _LimitSpec(rate, concurrency)
+
+
+class HostThrottle:
+    """Run-wide registry of :class:`HostLimit` objects keyed by ``host:port``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._specs: Dict[str, _LimitSpec] = {}
+        self._limits: Dict[str, HostLimit] = {}
+
+    def configure(self, url: str, *, rate_limit: Any = None, concurrency: int | None = None) -> None:
+        """Register limits for the host of *url*; the strictest registration wins."""
+        if rate_limit is None and not concurrency:
+            return
+        host = host_key(url)
+        if host is None:
+            return
+        spec = _LimitSpec(parse_rate(rate_limit) if rate_limit is not None else None, concurrency or None)
+        with self._lock:
+            current = self._specs.get(host)
+            merged = current.merge(spec) if current is not None else spec
+            if merged == current:
+                return
+            self._specs[host] = merged
+            # Requests already waiting on the old limit finish with it.
+            self._limits[host] = HostLimit(
+                TokenBucket(*merged.rate) if merged.rate else None,
+                merged.concurrency,
+            )
+
+    def for_host(self, host: str | None) -> HostLimit | None:
+        if not self._limits or host is None:
+            return None
+        return self._limits.get(host)
+
+    def __bool__(self) -> bool:
+        return bool(self._limits)
+
+    # Worker processes rebuild the same limits with their own buckets.
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"specs": dict(self._specs)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__()
+        for host, spec in state["specs"].items():
+            self._specs[host] = spec
+            self._limits[host] = HostLimit(TokenBucket(*spec.rate) if spec.rate else None, spec.concurrency)
+
+
+def host_key(url: Any) -> str | None:
+    """``host:port`` of an absolute URL, ``None`` for relative ones."""
+    try:
+        parsed = httpx.URL(str(url))
+    except (httpx.InvalidURL, TypeError):
+        return None
+    if not parsed.host:
+        return None
+    port = parsed.port or {"http": 80, "https": 443}.get(parsed.scheme)
+    return f"{parsed.host.lower()}:{port}"
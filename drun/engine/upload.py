@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+from os import PathLike
+from pathlib import Path
+import tempfile
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional, Tuple
+import weakref
+
+from drun.engine.request_files import DEFAULT_BINARY_CONTENT_TYPE
+
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class RequestUploadError(ValueError):
+    """Raised when request.upload cannot be turned into a streamed body."""
+
+
+class UploadSource:
+    """Raw request body streamed in chunks and replayable from the start.
+
+    Every iteration starts over, so httpx can resend the body after a
+    redirect and a retried attempt gets the full payload again:
+
+    - a file path is reopened and read in ``UPLOAD_CHUNK_SIZE`` chunks;
+    - a callable is called again for a fresh iterable;
+    - a one-shot iterator (generator) is copied to a temp file while it is
+      first consumed, and later iterations replay that copy.
+
+    Memory use is one chunk regardless of the body size.  ``content_length``
+    is known up front for files and bytes; other sources are sent chunked.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: Path | None = None,
+        factory: Callable[[], Iterable[Any]] | None = None,
+        iterator: Iterator[Any] | None = None,
+        content_length: int | None = None,
+    ) -> None:
+        self.path = path
+        self.factory = factory
+        self.iterator = iterator
+        self.content_length = content_length
+        self._spool: Any = None
+        self._spooled = 0
+        self._exhausted = False
+        if iterator is not None:
+            self._spool = tempfile.NamedTemporaryFile(prefix="drun-upload-", delete=False)
+            weakref.finalize(self, _discard_spool, self._spool)
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.path is not None:
+            with open(self.path, "rb") as fh:
+                while True:
+                    chunk = fh.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+        elif self.factory is not None:
+            for chunk in self.factory():
+                yield _to_bytes(chunk)
+        else:
+            yield from self._replay_and_spool()
+
+    def _replay_and_spool(self) -> Iterator[bytes]:
+        with open(self._spool.name, "rb") as replay:
+            remaining = self._spooled
+            while remaining > 0:
+                chunk = replay.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        if self._exhausted:
+            return
+        assert self.iterator is not None
+        for item in self.iterator:
+            chunk = _to_bytes(item)
+            self._spool.write(chunk)
+            self._spool.flush()
+            self._spooled += len(chunk)
+            yield chunk
+        self._exhausted = True
+        self.content_length = self._spooled
+        # Drop the reference so the _ONE_SHOT_SOURCES entry can go with the iterator
+        self.iterator = None
+
+    def aiter(self) -> "_AsyncUpload":
+        """Async view for ``httpx.AsyncClient``; chunks come from the same source."""
+        return _AsyncUpload(self)
+
+
+class _AsyncUpload:
+    # Not an async generator itself, so httpx may iterate it more than once.
+    def __init__(self, source: UploadSource) -> None:
+        self.source = source
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.source:
+            yield chunk
+
+
+# A generator stored in a variable is seen again on every retry; keep its
+# spooled copy so later attempts replay it instead of sending an empty body.
+_ONE_SHOT_SOURCES: "weakref.WeakKeyDictionary[Any, UploadSource]" = weakref.WeakKeyDictionary()
+
+
+def build_upload_source(
+    value: Any,
+    *,
+    cwd: Path | None = None,
+    source: str = "request.upload",
+) -> Tuple[UploadSource, Optional[str]]:
+    """Turn a ``request.upload`` value into ``(UploadSource, content_type)``.
+
+    Accepted values: a path, ``[path, content_type]``, bytes, a callable
+    returning an iterable of chunks, or an iterable / iterator of chunks.
+    """
+    base_dir = (cwd or Path.cwd()).resolve()
+
+    if isinstance(value, list) and len(value) == 2 and isinstance(value[0], (str, PathLike)) and isinstance(value[1], str):
+        upload, _ = _file_source(value[0], base_dir=base_dir, source=source)
+        return upload, value[1]
+
+    if isinstance(value, (str, PathLike)):
+        return _file_source(value, base_dir=base_dir, source=source)
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        payload = bytes(value)
+        return UploadSource(factory=lambda: (payload,), content_length=len(payload)), None
+
+    if callable(value):
+        return UploadSource(factory=value), None
+
+    if isinstance(value, Iterator):
+        cached = _ONE_SHOT_SOURCES.get(value)
+        if cached is None:
+            cached = UploadSource(iterator=value)
+            _ONE_SHOT_SOURCES[value] = cached
+        return cached, None
+
+    if isinstance(value, Iterable) and not isinstance(value, dict):
+        return UploadSource(factory=lambda: value), None
+
+    raise RequestUploadError(
+        f"{source} must be a path string, [path, content_type], bytes, a callable or an iterable of byte chunks"
+    )
+
+
+def describe_upload_value(value: Any) -> Any:
+    """JSON-safe description of a ``request.upload`` value for reports."""
+    if isinstance(value, (str, PathLike)):
+        return str(value)
+    if isinstance(value, list) and len(value) == 2:
+        return [str(value[0]), value[1]]
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"type": "bytes", "length": len(value)}
+    return {"type": "stream", "source": type(value).__name__}
+
+
+def _file_source(raw_path: str | PathLike[str], *, base_dir: Path, source: str) -> Tuple[UploadSource, str]:
+    path = Path(raw_path).expanduser()
+    if not path.is_absolute():
+        path = base_dir / path
+    path = path.resolve()
+    if not path.exists():
+        raise RequestUploadError(f"{source} path not found: {path}")
+    if not path.is_file():
+        raise RequestUploadError(f"{source} is not a file: {path}")
+    content_type = mimetypes.guess_type(str(path))[0] or DEFAULT_BINARY_CONTENT_TYPE
+    return UploadSource(path=path, content_length=path.stat().st_size), content_type
+
+
+def _to_bytes(chunk: Any) -> bytes:
+    if isinstance(chunk, bytes):
+        return chunk
+    if isinstance(chunk, str):
+        return chunk.encode("utf-8")
+    if isinstance(chunk, (bytearray, memoryview)):
+        return bytes(chunk)
+    raise RequestUploadError(f"request.upload chunks must be bytes or str, got {type(chunk).__name__}")
+
+
+def _discard_spool(spool: Any) -> None:
+    try:
+        spool.close()
+        os.unlink(spool.name)
+    except OSError:
+        pass
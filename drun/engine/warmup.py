@@ -0,0 +1,103 @@
+"""Warm-up phase: resolve hosts and pre-open pooled connections before a run.
+
+Every distinct ``base_url`` of the loaded cases is resolved (through the
+DNS cache when the pool has one) and, for pools whose connections outlive
+a single client (thread mode with keep-alive), ``connections`` concurrent
+``HEAD`` requests to the base URL open keep-alive connections, including
+the TLS handshake, on the same shared transport the cases will use.  The
+response status is ignored.  The time spent is reported by the caller
+separately from step latencies.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import socket
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+import httpx
+
+from drun.engine.pool import ClientPool
+
+
+@dataclass(frozen=True)
+class WarmupTarget:
+    base_url: str
+    verify: bool | None = None
+    # ClientPool.transport overrides (http2 / connection limits) as sorted items
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+
+def warm_up(
+    targets: Iterable[WarmupTarget],
+    pool: ClientPool,
+    *,
+    connections: int = 1,
+    timeout: float = 5.0,
+    open_connections: bool = True,
+) -> Dict[str, Any]:
+    """Warm every distinct target; returns ``{"total_ms", "targets": [...]}``."""
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    for target in dict.fromkeys(targets):
+        results.append(_warm_target(target, pool, connections, timeout, open_connections))
+    return {"total_ms": _ms_since(started), "targets": results}
+
+
+def _warm_target(
+    target: WarmupTarget,
+    pool: ClientPool,
+    connections: int,
+    timeout: float,
+    open_connections: bool,
+) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {
+        "base_url": target.base_url,
+        "dns_ms": None,
+        "connect_ms": None,
+        "connections": 0,
+        "error": None,
+    }
+    try:
+        url = httpx.URL(target.base_url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        started = time.perf_counter()
+        if pool.dns_cache is not None:
+            pool.dns_cache.resolve(url.host, port)
+        else:
+            socket.getaddrinfo(url.host, port, type=socket.SOCK_STREAM)
+        entry["dns_ms"] = _ms_since(started)
+    except Exception as exc:
+        entry["error"] = f"dns: {exc}"
+        return entry
+
+    if not open_connections:
+        return entry
+    transport = pool.transport(verify=target.verify, **dict(target.options))
+    if transport is None:
+        return entry
+
+    started = time.perf_counter()
+    errors: List[str] = []
+    with httpx.Client(transport=transport, timeout=timeout) as client:
+
+        def _open(_: int) -> bool:
+            try:
+                client.head(target.base_url)
+            except httpx.HTTPError as exc:
+                errors.append(str(exc) or type(exc).__name__)
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(connections, 1), thread_name_prefix="drun-warmup") as executor:
+            entry["connections"] = sum(executor.map(_open, range(max(connections, 1))))
+    entry["connect_ms"] = _ms_since(started)
+    if errors:
+        entry["error"] = errors[0]
+    return entry
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
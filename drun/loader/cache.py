@@ -0,0 +1,111 @@
+"""On-disk cache of loaded YAML case files.
+
+``load_yaml_file`` parses, diagnoses and validates every file on each
+``drun r`` / ``drun c`` / ``drun t``.  The result only depends on the file
+content, its path (diagnostics and ``meta`` carry it) and the code that
+builds it, so it is pickled under a per-user cache directory keyed by a
+hash of the drun version, a fingerprint of the loader and model sources,
+the path and the content; an unchanged file then costs one read, one hash
+and one unpickle.  Stale entries are never read again and can be removed
+by deleting the directory.
+
+Entries are pickles, so the cache lives outside the project (checked-out
+files are never unpickled) in ``$XDG_CACHE_HOME/drun/yaml`` (default
+``~/.cache/drun/yaml``), created with owner-only permissions.
+``DRUN_CACHE_DIR`` moves it, ``DRUN_NO_CACHE=1`` turns it off.  Any error
+reading or writing an entry falls back to a normal load.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+import drun
+from drun import __version__
+
+
+_FORMAT = 2
+_PACKAGE_ROOT = Path(drun.__file__).resolve().parent
+# Sources that shape the cached Case / Diagnostic objects and render plans.
+_SCHEMA_SOURCES = (
+    "models/*.py",
+    "loader/yaml_loader.py",
+    "loader/cache.py",
+    "templating/*.py",
+    "engine/request_files.py",
+    "utils/errors.py",
+)
+
+
+def default_cache_dir() -> Path:
+    base = (os.environ.get("XDG_CACHE_HOME") or "").strip()
+    return (Path(base) if base else Path.home() / ".cache") / "drun" / "yaml"
+
+
+def cache_dir() -> Optional[Path]:
+    """Directory for cache entries, ``None`` when caching is disabled."""
+    if (os.environ.get("DRUN_NO_CACHE") or "").strip().lower() in {"1", "true", "yes", "on"}:
+        return None
+    custom = (os.environ.get("DRUN_CACHE_DIR") or "").strip()
+    return Path(custom) if custom else default_cache_dir()
+
+
+@lru_cache(maxsize=1)
+def schema_fingerprint() -> str:
+    """Hash of the sources above; a dev install changes it without a version bump."""
+    digest = hashlib.sha256()
+    for pattern in _SCHEMA_SOURCES:
+        for source in sorted(_PACKAGE_ROOT.glob(pattern)):
+            digest.update(source.relative_to(_PACKAGE_ROOT).as_posix().encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(kind: str, path: Path, raw: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (f"{_FORMAT}:{__version__}:{schema_fingerprint()}:{kind}", str(path.resolve())):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+def _entry_path(root: Path, key: str) -> Path:
+    return root / key[:2] / f"{key}.pickle"
+
+
+def cache_get(kind: str, path: Path, raw: bytes) -> Any:
+    """Cached value for *path* with content *raw*, or ``None`` on a miss."""
+    root = cache_dir()
+    if root is None:
+        return None
+    try:
+        with _entry_path(root, cache_key(kind, path, raw)).open("rb") as fh:
+            return pickle.load(fh)
+    except Exception:
+        return None
+
+
+def cache_put(kind: str, path: Path, raw: bytes, value: Any) -> None:
+    root = cache_dir()
+    if root is None:
+        return
+    target = _entry_path(root, cache_key(kind, path, raw))
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        target.parent.mkdir(mode=0o700, exist_ok=True)
+        tmp.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        # Concurrent writers (-parallel process, several drun r) race benignly.
+        os.replace(tmp, target)
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
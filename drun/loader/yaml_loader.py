@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Tuple
 import yaml
 from pydantic import ValidationError
 
+from drun.loader.cache import cache_get, cache_put
 from drun.models.case import Case, Suite
 from drun.models.config import Config
 from drun.models.step import Step
@@ -17,6 +18,7 @@ from drun.templating.compat import (
     strip_escaped_template_quotes,
 )
 from drun.models.checks import normalize_checks
+from drun.templating.plan import compile_case_plans
 from drun.engine.request_files import RequestFilesError, validate_request_files_shape
 from drun.utils.errors import Diagnostic, DiagnosticError, LoadError
 
@@ -284,9 +286,20 @@ def _normalize_case_dict(d: Dict[str, Any], path: Path | None = None, raw_text:
     return dd
 
 
-def _parse_yaml_document(path: Path) -> tuple[str, str, Any]:
+def _read_source(path: Path) -> bytes | None:
     try:
-        raw = path.read_text(encoding="utf-8")
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _parse_yaml_document(path: Path, source: bytes | None = None) -> tuple[str, str, Any]:
+    try:
+        if source is None:
+            raw = path.read_text(encoding="utf-8")
+        else:
+            # Same newline handling as read_text
+            raw = source.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
         # Pre-process YAML to escape template expressions that may cause parsing issues
         # When template expressions like ${func(...)} appear in arrays/lists, they may confuse YAML parser
         # We temporarily wrap them in quotes to ensure safe parsing
@@ -311,18 +324,42 @@ def _parse_yaml_document(path: Path) -> tuple[str, str, Any]:
 
 
 def load_yaml_file(path: Path) -> Tuple[List[Case], Dict[str, Any]]:
-    raw, processed_raw, obj = _parse_yaml_document(path)
+    path = Path(path)
+    source = _read_source(path)
+    if source is not None:
+        cached = cache_get("load", path, source)
+        if cached is not None:
+            return cached
+
+    raw, processed_raw, obj = _parse_yaml_document(path, source)
     diagnostics = _collect_common_diagnostics(obj, path, raw)
     if diagnostics:
         _raise_diagnostic(diagnostics[0])
 
-    return _build_cases_from_obj(obj, path, raw)
+    cases, meta = _build_cases_from_obj(obj, path, raw)
+    compile_case_plans(cases)
+    if source is not None:
+        cache_put("load", path, source, (cases, meta))
+    return cases, meta
 
 
 def collect_yaml_diagnostics(path: Path) -> List[Diagnostic]:
     """Collect authoring diagnostics for a YAML file without stopping at one file."""
+    path = Path(path)
+    source = _read_source(path)
+    if source is not None:
+        cached = cache_get("diagnostics", path, source)
+        if cached is not None:
+            return cached
+    diagnostics = _collect_yaml_diagnostics(path, source)
+    if source is not None:
+        cache_put("diagnostics", path, source, diagnostics)
+    return diagnostics
+
+
+def _collect_yaml_diagnostics(path: Path, source: bytes | None) -> List[Diagnostic]:
     try:
-        raw, _processed_raw, obj = _parse_yaml_document(path)
+        raw, _processed_raw, obj = _parse_yaml_document(path, source)
     except LoadError as exc:
         return [exc.diagnostic] if exc.diagnostic else [
             _diagnostic(
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, List
 import re
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class Check(BaseModel):
@@ -11,6 +11,8 @@ class Check(BaseModel):
     check: Any
     comparator: str
     expect: Any
+    # drun.templating.plan.CheckRenderPlan, compiled at load time or on first render.
+    _render_plan: Any = PrivateAttr(default=None)
 
 
 def normalize_checks(items: List[Any]) -> List[Check]:
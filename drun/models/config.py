@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class Config(BaseModel):
@@ -11,5 +11,22 @@ class Config(BaseModel):
     headers: Dict[str, str] = Field(default_factory=dict)
     timeout: Optional[float] = None
     verify: Optional[bool] = None
+    http2: Optional[bool] = None
+    max_connections: Optional[int] = Field(default=None, ge=1)
+    max_keepalive_connections: Optional[int] = Field(default=None, ge=0)
+    keepalive_expiry: Optional[float] = Field(default=None, ge=0)
+    # Client-side limits for the base_url host, shared by the whole run
+    rate_limit: Optional[str] = None
+    host_concurrency: Optional[int] = Field(default=None, ge=1)
+    parallel_steps: bool = False
     tags: List[str] = Field(default_factory=list)
 
+
+    @field_validator("rate_limit")
+    @classmethod
+    def _check_rate_limit(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and "${" not in value:
+            from drun.engine.throttle import parse_rate
+
+            parse_rate(value)
+        return value
@@ -66,6 +66,10 @@ class StepResult(BaseModel):
     curl: Optional[str] = None
     status: str  # passed|failed|skipped
     duration_ms: float = 0.0
+    # Per-phase HTTP timings (connect_ms, tls_ms, send_ms, wait_ms, ttfb_ms, receive_ms, total_ms)
+    timing: Optional[Dict[str, Any]] = None
+    # Total time spent waiting between retry attempts (not part of duration_ms)
+    retry_wait_ms: Optional[float] = None
     error: Optional[str] = None
     # httpstat 字段已移除
 
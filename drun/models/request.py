@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Literal, Optional, Union
+from pydantic import BaseModel, Field, field_validator
 from pydantic.config import ConfigDict
 
 
@@ -15,9 +15,20 @@ class StepRequest(BaseModel):
     body: Optional[Any] = Field(default=None, alias="json")
     data: Optional[Any] = None
     files: Optional[Any] = None
+    # Streamed raw body: file path, [path, content_type], bytes or an iterable of chunks
+    upload: Optional[Any] = None
     auth: Optional[Dict[str, str]] = None  # {type: basic|bearer, username, password, token}
     timeout: Optional[float] = None
     verify: Optional[bool] = None
     allow_redirects: Optional[bool] = None
     stream: bool = False  # Enable streaming mode for SSE
     stream_timeout: Optional[float] = None  # Streaming timeout in seconds
+    # SSE retention: all events, first/last N events, or summary only
+    stream_keep: Optional[Union[Literal["all", "summary"], int]] = None
+
+    @field_validator("stream_keep")
+    @classmethod
+    def _check_stream_keep(cls, value: Any) -> Any:
+        if isinstance(value, int) and value < 1:
+            raise ValueError("stream_keep must be 'all', 'summary' or a positive number of events")
+        return value
@@ -1,14 +1,18 @@
 """Retry configuration model.
 
-``retry: 3`` is shorthand for ``{"max": 4}`` — 1 initial attempt + 3 retries.
+``retry: 3`` is shorthand for ``{"max": 4, "retry_after": false}`` — 1 initial
+attempt + 3 immediate retries.
 ``retry: {max: 10, every: "2s"}`` polls every 2 seconds up to 10 times.
+``retry: {max: 8, every: "200ms", backoff: exponential, max_delay: "5s", budget: "30s"}``
+doubles the wait after each attempt, caps single waits at 5s and stops
+retrying once 30s have been spent waiting.
 """
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class RetryConfig(BaseModel):
@@ -16,11 +20,33 @@ class RetryConfig(BaseModel):
 
     Fields:
         max: Total attempts (including the first).  Must be >= 1.
-        every: Duration string between attempts (e.g. "2s", "500ms").
+        every: Duration string between attempts (e.g. "2s", "500ms"); the
+            base delay for the exponential and decorrelated backoffs.
+        backoff: ``constant`` (default), ``exponential`` (every * 2^n) or
+            ``decorrelated`` (random between every and 3x the previous wait).
+        max_delay: Upper bound for a single wait, ``Retry-After`` included;
+            300s for the growing backoffs when unset.
+        budget: Upper bound for the total wait of the step; when the next
+            wait would exceed it the current attempt is the last one.
+        retry_after: Honour ``Retry-After`` on 429/503 responses (off for
+            the ``retry: N`` shorthand).
     """
 
     max: int = Field(ge=1)
     every: str = "0s"
+    backoff: Literal["constant", "exponential", "decorrelated"] = "constant"
+    max_delay: Optional[str] = None
+    budget: Optional[str] = None
+    retry_after: bool = True
+
+    @field_validator("every", "max_delay", "budget")
+    @classmethod
+    def _check_duration(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            from drun.runner.retry import parse_duration
+
+            parse_duration(value)
+        return value
 
 
 def get_retry_max(retry: int | RetryConfig | None) -> int:
@@ -34,6 +60,13 @@ def get_retry_max(retry: int | RetryConfig | None) -> int:
     return 1
 
 
+def get_retry_config(retry: int | RetryConfig | None) -> RetryConfig:
+    """Normalize the ``retry`` field to a full :class:`RetryConfig`."""
+    if isinstance(retry, RetryConfig):
+        return retry
+    return RetryConfig(max=get_retry_max(retry), retry_after=False)
+
+
 def get_retry_every(retry: int | RetryConfig | None) -> str:
     """Return the every duration string (default "0s")."""
     if isinstance(retry, RetryConfig):
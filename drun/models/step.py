@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import math
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 from pydantic.config import ConfigDict
 
 from .request import StepRequest
@@ -12,6 +12,8 @@ from .checks import Check, normalize_checks
 
 class StepResponseConfig(BaseModel):
     save_body_to: Optional[str] = None
+    # Stream the body; above this many bytes it goes to a temp file (mmap view)
+    max_memory_bytes: Optional[int] = Field(default=None, ge=0)
 
 
 class Step(BaseModel):
@@ -31,6 +33,10 @@ class Step(BaseModel):
     teardown_hooks: List[str] = Field(default_factory=list)
     skip: Optional[str | bool] = None
     retry: Union[int, RetryConfig, None] = None
+    # Opt-in to concurrent execution under config.parallel_steps.
+    parallel: bool = False
+    # drun.templating.plan.StepRenderPlan, compiled at load time or on first render.
+    _render_plan: Any = PrivateAttr(default=None)
 
     @model_validator(mode="before")
     @classmethod
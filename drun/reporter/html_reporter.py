@@ -99,6 +99,32 @@ def _build_check_table(checks: List[CheckResult]) -> str:
     return f"<table class='check-table'>{thead}<tbody>{''.join(rows)}</tbody></table>"
 
 
+_TIMING_PHASES = (
+    ("connect_ms", "TCP 连接（含 DNS）"),
+    ("tls_ms", "TLS 握手"),
+    ("send_ms", "发送请求"),
+    ("wait_ms", "等待响应"),
+    ("ttfb_ms", "首字节 (TTFB)"),
+    ("receive_ms", "读取响应体"),
+    ("total_ms", "总计"),
+)
+
+
+def _build_timing_table(timing: Dict[str, Any]) -> str:
+    rows = []
+    throttled = timing.get("throttle_ms")
+    if isinstance(throttled, (int, float)):
+        rows.append(f"<tr><td>限流等待</td><td><code>throttle_ms</code></td><td>{float(throttled):.1f} ms</td></tr>")
+    for key, label in _TIMING_PHASES:
+        value = timing.get(key)
+        shown = f"{float(value):.1f} ms" if isinstance(value, (int, float)) else "-"
+        rows.append(f"<tr><td>{_escape_html(label)}</td><td><code>{key}</code></td><td>{shown}</td></tr>")
+    if timing.get("connection_reused"):
+        rows.append("<tr><td colspan='3' class='muted'>复用已有连接</td></tr>")
+    thead = "<thead><tr><th>阶段</th><th>字段</th><th>耗时</th></tr></thead>"
+    return f"<table class='timing-table'>{thead}<tbody>{''.join(rows)}</tbody></table>"
+
+
 def _extract_merged_content(events: List[Dict[str, Any]]) -> str:
     """Extract and merge text content from stream events"""
     contents = []
@@ -127,19 +153,29 @@ def _build_stream_response_panel(response_map: Dict[str, Any]) -> str:
     stream_summary = response_map.get("stream_summary", {})
     raw_chunks = response_map.get("stream_raw_chunks", [])
     
-    event_count = len(stream_events)
+    event_count = stream_summary.get("event_count", len(stream_events))
     first_chunk_ms = stream_summary.get("first_chunk_ms", 0)
+    inter_event = stream_summary.get("inter_event_ms") or {}
     
     # Stats badges
-    stats_html = (
-        "<span class='stream-stats'>"
-        f"<span class='badge-mini'>{event_count} events</span>"
-        f"<span class='badge-mini'>首包 {first_chunk_ms:.0f}ms</span>"
-        "</span>"
-    )
+    badges = [
+        f"<span class='badge-mini'>{event_count} events</span>",
+        f"<span class='badge-mini'>首包 {first_chunk_ms:.0f}ms</span>",
+    ]
+    if inter_event.get("count"):
+        badges.append(
+            f"<span class='badge-mini'>间隔 avg {inter_event.get('avg', 0):.0f}ms / max {inter_event.get('max', 0):.0f}ms</span>"
+        )
+    if len(stream_events) < event_count:
+        badges.append(f"<span class='badge-mini'>保留 {len(stream_events)} events</span>")
+    stats_html = "<span class='stream-stats'>" + "".join(badges) + "</span>"
     
-    # Build View 1: Merged content
-    merged_content = _extract_merged_content(stream_events)
+    # Build View 1: Merged content (built by the client when the stream was read)
+    merged_content = response_map.get("stream_content")
+    if merged_content is None:
+        merged_content = _extract_merged_content(stream_events)
+    elif not merged_content:
+        merged_content = "(无文本内容)"
     merged_view = (
         "<div class='view-content' data-view='merged'>"
         f"<pre data-raw=\"{_escape_html(merged_content)}\"><code>{_escape_html(merged_content)}</code></pre>"
@@ -216,7 +252,7 @@ def _build_step(step: StepResult, step_idx: Optional[int] = None) -> str:
     if resp_body_payload is None and isinstance(response_map, dict):
         binary_meta = {
             key: response_map.get(key)
-            for key in ("content_type", "body_size", "body_bytes_b64", "saved_body_to", "save_error")
+            for key in ("content_type", "body_size", "body_sha256", "body_bytes_b64", "saved_body_to", "save_error")
             if response_map.get(key) is not None
         }
         if binary_meta:
@@ -245,6 +281,9 @@ def _build_step(step: StepResult, step_idx: Optional[int] = None) -> str:
     status_meta_text = None
     if resp_status is not None:
         status_meta_text = f"status={resp_status}"
+        resp_http_version = response_map.get("http_version") if isinstance(response_map, dict) else None
+        if resp_http_version:
+            status_meta_text = f"{status_meta_text} {resp_http_version}"
 
     req_title = "请求体"
     resp_title = "响应体"
@@ -265,10 +304,14 @@ def _build_step(step: StepResult, step_idx: Optional[int] = None) -> str:
         head_left += f" {left_meta_html}"
     head_left += "</div></div>"
 
+    retry_wait_html = ""
+    if step.retry_wait_ms:
+        retry_wait_html = f"<span class='st-head-duration muted'>重试等待 {step.retry_wait_ms:.1f} ms</span>"
     head_right = (
         "<div class='st-head-side'>"
         f"<span class='pill {step.status} st-head-status'>{step.status}</span>"
         f"<span class='st-head-duration muted'>{step.duration_ms:.1f} ms</span>"
+        f"{retry_wait_html}"
         f"<span class='st-head-checks muted'>检查: {pass_cnt} ✓ / {fail_cnt} ✗</span>"
         "</div>"
     )
@@ -335,6 +378,14 @@ def _build_step(step: StepResult, step_idx: Optional[int] = None) -> str:
             "</div>"
         )
 
+    if step.timing:
+        panels.append(
+            "<div class='panel' data-section='timing' style='margin-top:8px;'>"
+            "<div class='p-head'><span>耗时分解</span></div>"
+            + _build_timing_table(step.timing)
+            + "</div>"
+        )
+
     # Checks table
     panels.append(
         "<div class='panel' style='margin-top:8px;'>"
@@ -804,6 +855,9 @@ def write_html(report: RunReport, outfile: str | Path, environment: Optional[str
     head_parts.append("      <div class='badge failed'><span class='badge-label'>失败</span><span class='badge-value'>" + failed + "</span></div>\n")
     head_parts.append("      <div class='badge skipped'><span class='badge-label'>跳过</span><span class='badge-value'>" + skipped + "</span></div>\n")
     head_parts.append("      <div class='badge duration'><span class='badge-label'>耗时</span><span class='badge-value'>" + duration + "<span style='font-size:14px;font-weight:400;margin-left:4px;'>ms</span></span></div>\n")
+    if s.get("warmup_ms") is not None:
+        warmup = f"{float(s['warmup_ms']):.1f}"
+        head_parts.append("      <div class='badge duration'><span class='badge-label'>预热</span><span class='badge-value'>" + warmup + "<span style='font-size:14px;font-weight:400;margin-left:4px;'>ms</span></span></div>\n")
     head_parts.append("    </div>\n")
     head_parts.append("    <div class='toolbar'>\n      <div class='filters'>\n        <label class='chip'><input type='radio' name='status-filter' id='f-all' value='all' checked /> 全部</label>\n        <label class='chip'><input type='radio' name='status-filter' id='f-passed' value='passed' /> 通过</label>\n        <label class='chip'><input type='radio' name='status-filter' id='f-failed' value='failed' /> 失败</label>\n        <label class='chip'><input type='radio' name='status-filter' id='f-skipped' value='skipped' /> 跳过</label>\n      </div>\n      <button id='btn-toggle-expand' title='展开/收起全部' onclick=\"window.toggleAllSteps && window.toggleAllSteps(this)\">展开全部</button>\n    </div>\n  </div>\n")
 
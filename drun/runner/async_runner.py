@@ -0,0 +1,66 @@
+"""Event-loop runner: many case instances on one thread.
+
+``AsyncRunner`` drives the same case and step flows as ``Runner`` but awaits
+their effects: HTTP requests go through ``AsyncHTTPClient``, sleep steps and
+retry waits become ``asyncio.sleep``.  Hooks, templating and checks still run
+inline on the loop; invoke steps run the nested case on a worker thread.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict
+
+from drun.engine.http import AsyncHTTPClient
+from drun.engine.pool import ClientPool
+from drun.models.case import Case
+from drun.models.report import CaseInstanceResult
+from drun.runner.effects import drive_async
+from drun.runner.runner import Runner
+
+
+class AsyncRunner(Runner):
+    def _build_async_client(self, case: Case) -> AsyncHTTPClient:
+        cfg = case.config
+        base_url = cfg.base_url or "http://placeholder.local"
+        options = self._connection_options(case)
+        pool = self.client_pool or ClientPool()
+        http2, limits = pool.resolve(**options)
+        return AsyncHTTPClient(
+            base_url=base_url,
+            timeout=cfg.timeout,
+            verify=cfg.verify,
+            headers=cfg.headers,
+            transport=self.client_pool.async_transport(verify=cfg.verify, **options) if self.client_pool else None,
+            http2=http2,
+            limits=limits,
+            throttle=self._case_throttle(case, pool),
+        )
+
+    async def run_case_async(
+        self,
+        case: Case,
+        global_vars: Dict[str, Any],
+        params: Dict[str, Any],
+        *,
+        funcs: Dict[str, Any] | None = None,
+        envmap: Dict[str, Any] | None = None,
+        source: str | None = None,
+    ) -> CaseInstanceResult:
+        t0 = time.perf_counter()
+        ctx = self._prepare_variables(case, global_vars, params, funcs, envmap)
+        client = self._build_async_client(case)
+        try:
+            return await drive_async(
+                self._case_flow(case, global_vars, params, funcs, envmap, source, ctx, client, t0)
+            )
+        finally:
+            await _close_client(client)
+
+
+async def _close_client(client: Any) -> None:
+    aclose = getattr(client, "aclose", None)
+    if aclose is not None:
+        await aclose()
+        return
+    client.close()
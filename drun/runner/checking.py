@@ -6,6 +6,7 @@ from drun.models.report import CheckResult, to_report_safe
 from drun.models.checks import Check
 from drun.runner.checks import compare
 from drun.runner.protocols import RunnerProtocol
+from drun.templating.plan import check_render_plan
 
 
 def evaluate_checks(
@@ -16,7 +17,16 @@ def evaluate_checks(
     funcs: Dict[str, Any] | None,
     envmap: Dict[str, Any] | None,
     resp_obj: Dict[str, Any],
+    resolved: Dict[str, Any] | None = None,
 ) -> Tuple[List[CheckResult], bool]:
+    """Evaluate *check_rules*; *resolved* holds paths already read from the body."""
+    resolved = resolved or {}
+
+    def resolve(check_str: str) -> Any:
+        if check_str in resolved:
+            return resolved[check_str]
+        return runner._resolve_check(check_str, resp_obj)
+
     check_results: List[CheckResult] = []
     step_failed = False
     for v in check_rules:
@@ -25,14 +35,16 @@ def evaluate_checks(
         if not isinstance(rendered_check, str):
             if original_check and original_check.startswith("$") and rendered_check is None:
                 check_str = original_check
-                actual = runner._resolve_check(check_str, resp_obj)
+                actual = resolve(check_str)
             else:
                 actual = rendered_check
                 check_str = str(v.check)
         else:
             check_str = rendered_check
-            actual = runner._resolve_check(check_str, resp_obj)
-        expect_rendered = runner._render(v.expect, variables, funcs, envmap)
+            actual = resolve(check_str)
+        expect_rendered = runner._render_planned(
+            v.expect, check_render_plan(v).expect_plan, variables, funcs, envmap
+        )
         passed, err = compare(v.comparator, actual, expect_rendered)
         msg = err
         if not passed and msg is None:
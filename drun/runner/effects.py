@@ -0,0 +1,141 @@
+"""Waiting points of a case run, expressed as values.
+
+Case and step flows are generators that ``yield`` an effect whenever they
+have to wait — an HTTP round trip, a pause, or a blocking call — and receive
+its result (or its exception) back.  ``drive`` performs effects on the
+calling thread, which is what ``Runner.run_case`` does; ``drive_async``
+awaits them so many flows can share one event loop.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import inspect
+import time
+from typing import Any, Callable, Generator, List
+
+
+Flow = Generator["Effect", Any, Any]
+
+
+class Effect(ABC):
+    @abstractmethod
+    def run(self) -> Any:
+        """Perform the effect on the calling thread."""
+
+    @abstractmethod
+    async def run_async(self) -> Any:
+        """Perform the effect without blocking the event loop."""
+
+
+@dataclass
+class SendRequest(Effect):
+    client: Any
+    request: dict
+
+    def run(self) -> Any:
+        return self.client.request(self.request)
+
+    async def run_async(self) -> Any:
+        result = self.client.request(self.request)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+@dataclass
+class Pause(Effect):
+    seconds: float
+
+    def run(self) -> None:
+        if self.seconds > 0:
+            time.sleep(self.seconds)
+
+    async def run_async(self) -> None:
+        if self.seconds > 0:
+            await asyncio.sleep(self.seconds)
+
+
+@dataclass
+class Blocking(Effect):
+    """A synchronous call; the async driver moves it to a worker thread."""
+
+    func: Callable[[], Any]
+
+    def run(self) -> Any:
+        return self.func()
+
+    async def run_async(self) -> Any:
+        return await asyncio.to_thread(self.func)
+
+
+@dataclass
+class Concurrently(Effect):
+    """Run several flows at once; results keep the order of *flows*.
+
+    Every flow finishes before the first exception (in flow order) is
+    re-raised, so no step is left half-way through.
+    """
+
+    flows: List[Flow]
+
+    def run(self) -> List[Any]:
+        with ThreadPoolExecutor(
+            max_workers=max(len(self.flows), 1),
+            thread_name_prefix="drun-step",
+        ) as executor:
+            futures = [executor.submit(drive, flow) for flow in self.flows]
+        for future in futures:
+            error = future.exception()
+            if error is not None:
+                raise error
+        return [future.result() for future in futures]
+
+    async def run_async(self) -> List[Any]:
+        results = await asyncio.gather(
+            *(drive_async(flow) for flow in self.flows),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return list(results)
+
+
+def drive(flow: Flow) -> Any:
+    """Run *flow* to completion, performing each effect synchronously."""
+    value: Any = None
+    error: BaseException | None = None
+    while True:
+        try:
+            effect = flow.throw(error) if error is not None else flow.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        try:
+            value = effect.run()
+        except Exception as exc:
+            error = exc
+
+
+async def drive_async(flow: Flow) -> Any:
+    """Run *flow* to completion, awaiting each effect.
+
+    Cancellation is thrown into the flow as well so its ``finally`` blocks
+    (teardown hooks, result bookkeeping) still run.
+    """
+    value: Any = None
+    error: BaseException | None = None
+    while True:
+        try:
+            effect = flow.throw(error) if error is not None else flow.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        try:
+            value = await effect.run_async()
+        except BaseException as exc:  # noqa: BLE001 - re-raised inside the flow
+            error = exc
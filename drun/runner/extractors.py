@@ -1,14 +1,194 @@
 from __future__ import annotations
 
-from typing import Any
+from functools import lru_cache
+import re
+from typing import Any, Dict, List, Tuple, TypeVar, Union
+
 import jmespath
+from jmespath.parser import ParsedResult
+
+
+# Checks and extracts repeat the same few expressions on every step, retry
+# and poll; parse each one once.
+_EXPRESSION_CACHE_SIZE = 2048
+_NEEDS_QUOTING = re.compile(r"[^a-zA-Z0-9_]")
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_QUOTED_IDENTIFIER = re.compile(r'"([^"\\]+)"')
+_INDEX = re.compile(r"\[(-?[0-9]+)\]")
+
+Accessor = Union[str, int]
+K = TypeVar("K")
+
+
+@lru_cache(maxsize=_EXPRESSION_CACHE_SIZE)
+def compile_jmespath(expr: str) -> ParsedResult | None:
+    """``jmespath.compile`` with a cache; ``None`` when *expr* does not parse."""
+    try:
+        return jmespath.compile(expr)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=_EXPRESSION_CACHE_SIZE)
+def convert_jmespath_path(expr: str) -> str:
+    """Convert the part after ``$.`` to JMESPath, quoting special field names."""
+    # Split expression by dots, but preserve array access like [0]
+    parts: List[str] = []
+    i = 0
+    n = len(expr)
+
+    while i < n:
+        if expr[i] == '[':
+            # Found array access, find the closing bracket
+            j = expr.find(']', i)
+            if j == -1:
+                # Unclosed bracket: keep the rest verbatim and let JMESPath reject it
+                parts.append(expr[i:])
+                break
+
+            # Extract array access part
+            array_part = expr[i:j+1]
+            parts.append(array_part)
+            i = j + 1
+
+            # Skip dot after array access if present
+            if i < n and expr[i] == '.':
+                i += 1
+        else:
+            # Regular field access, find next dot or array access
+            j = i
+            while j < n and expr[j] != '.' and expr[j] != '[':
+                j += 1
+
+            field_name = expr[i:j]
+            # Check if field name needs quoting (contains special chars)
+            if _NEEDS_QUOTING.search(field_name):
+                field_name = f'"{field_name}"'
+            parts.append(field_name)
+
+            if j < n and expr[j] == '.':
+                i = j + 1
+            else:
+                i = j
+
+    # Join parts with dots for field access (array parts already include brackets)
+    result: List[str] = []
+    for i, part in enumerate(parts):
+        if '[' in part and ']' in part:
+            # Array access, don't add dot before it
+            if i > 0:
+                result[-1] = result[-1] + part
+            else:
+                result.append(part)
+        else:
+            # Regular field access
+            if i == 0:
+                result.append(part)
+            else:
+                result.append('.' + part)
+
+    return ''.join(result)
+
+
+@lru_cache(maxsize=_EXPRESSION_CACHE_SIZE)
+def compile_simple_path(expr: str) -> Tuple[Accessor, ...] | None:
+    """Accessors for a plain JMESPath path such as ``data.items[0]."user-id"``.
+
+    Only fields (bare or quoted without escapes) and integer indexes are
+    accepted; anything else returns ``None`` and goes through JMESPath.
+    """
+    accessors: List[Accessor] = []
+    pos = 0
+    n = len(expr)
+    expect_field = not expr.startswith("[")
+    while pos < n:
+        if expect_field:
+            m = _IDENTIFIER.match(expr, pos) or _QUOTED_IDENTIFIER.match(expr, pos)
+            if m is None:
+                return None
+            accessors.append(m.group(1) if m.re is _QUOTED_IDENTIFIER else m.group(0))
+            pos = m.end()
+            expect_field = False
+        elif expr[pos] == "[":
+            m = _INDEX.match(expr, pos)
+            if m is None:
+                return None
+            accessors.append(int(m.group(1)))
+            pos = m.end()
+        elif expr[pos] == "." and pos + 1 < n and expr[pos + 1] != "[":
+            pos += 1
+            expect_field = True
+        else:
+            return None
+    if expect_field or not accessors:
+        return None
+    return tuple(accessors)
+
+
+def _apply_accessor(data: Any, accessor: Accessor) -> Any:
+    if data is None:
+        return None
+    if isinstance(accessor, int):
+        if not isinstance(data, list):
+            return None
+        try:
+            return data[accessor]
+        except IndexError:
+            return None
+    try:
+        return data.get(accessor)
+    except AttributeError:
+        return None
+
+
+def search_simple_path(accessors: Tuple[Accessor, ...], data: Any) -> Any:
+    """Apply accessors with JMESPath semantics: mismatches yield ``None``."""
+    for accessor in accessors:
+        data = _apply_accessor(data, accessor)
+        if data is None:
+            return None
+    return data
+
+
+_LEAF = object()
+
+
+def resolve_simple_paths(paths: Dict[K, Tuple[Accessor, ...]], data: Any) -> Dict[K, Any]:
+    """Resolve many simple paths in one walk, sharing common prefixes.
+
+    ``{"a": ("data", "items", 0), "b": ("data", "items", 1)}`` looks up
+    ``data`` and ``items`` once.  Results equal ``search_simple_path``.
+    """
+    trie: Dict[Any, Any] = {}
+    for key, accessors in paths.items():
+        node = trie
+        for accessor in accessors:
+            node = node.setdefault(accessor, {})
+        node.setdefault(_LEAF, []).append(key)
+
+    resolved: Dict[K, Any] = {}
+    stack: List[Tuple[Dict[Any, Any], Any]] = [(trie, data)]
+    while stack:
+        node, value = stack.pop()
+        for accessor, child in node.items():
+            if accessor is _LEAF:
+                for key in child:
+                    resolved[key] = value
+            else:
+                stack.append((child, _apply_accessor(value, accessor)))
+    return resolved
 
 
 def extract_from_body(body: Any, expr: str) -> Any:
     if body is None:
         return None
+    accessors = compile_simple_path(expr)
+    if accessors is not None:
+        return search_simple_path(accessors, body)
+    compiled = compile_jmespath(expr)
+    if compiled is None:
+        return None
     try:
-        return jmespath.search(expr, body)
+        return compiled.search(body)
     except Exception:
         return None
-
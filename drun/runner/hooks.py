@@ -5,6 +5,17 @@ import re
 from typing import Any, Dict, List
 
 
+_SHARED_VIEW_KEYS = ("step_variables", "session_variables")
+
+
+def _hook_meta(meta: Dict[str, Any] | None) -> Dict[str, Any]:
+    meta_data = {k: v for k, v in (meta or {}).items() if v is not None}
+    for key in _SHARED_VIEW_KEYS:
+        if isinstance(meta_data.get(key), dict):
+            meta_data[key] = dict(meta_data[key])
+    return meta_data
+
+
 def run_setup_hooks(
     *,
     names: List[str],
@@ -20,7 +31,9 @@ def run_setup_hooks(
     updated: Dict[str, Any] = {}
     fdict = funcs or {}
     env_ctx = envmap or {}
-    meta_data = {k: v for k, v in (meta or {}).items() if v is not None}
+    # Merged views from VarContext are cached and shared; hooks get copies.
+    variables = dict(variables or {})
+    meta_data = _hook_meta(meta)
     hook_ctx: Dict[str, Any] = {
         "request": req,
         "variables": variables,
@@ -72,7 +85,9 @@ def run_teardown_hooks(
     updated: Dict[str, Any] = {}
     fdict = funcs or {}
     env_ctx = envmap or {}
-    meta_data = {k: v for k, v in (meta or {}).items() if v is not None}
+    # Merged views from VarContext are cached and shared; hooks get copies.
+    variables = dict(variables or {})
+    meta_data = _hook_meta(meta)
     hook_ctx: Dict[str, Any] = {
         "response": resp,
         "variables": variables,
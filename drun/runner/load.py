@@ -0,0 +1,246 @@
+"""Load generation for ``drun l``.
+
+Case instances are the unit of work: every iteration runs one full case
+through ``AsyncRunner``, so setup hooks, checks and extracts behave exactly as
+they do under ``drun r`` and a failed check counts as an error.
+
+Two scheduling models are supported:
+
+* closed loop (``concurrency``): N virtual users each run case after case,
+  started evenly over ``ramp_up`` seconds;
+* open loop (``rps``): iterations start on a fixed arrival schedule that
+  ramps linearly to the target rate, whether or not earlier ones finished.
+  ``concurrency`` caps the iterations in flight; an iteration that waits for
+  a slot is still timed from its scheduled start, so a saturated target
+  shows up as latency instead of silently lowering the offered load.
+
+Iterations start until ``duration`` elapses; those in flight then finish.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import itertools
+import math
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Set
+
+from drun.models.report import CaseInstanceResult
+
+
+@dataclass
+class LoadProfile:
+    duration: float
+    concurrency: int = 1
+    rps: Optional[float] = None
+    ramp_up: float = 0.0
+
+    @property
+    def open_loop(self) -> bool:
+        return self.rps is not None
+
+
+# Log-scale buckets: every latency maps to bucket ceil(log_gamma(ms)) and is
+# reported as that bucket's midpoint, within 1% of the true value.  Memory is
+# bounded by the latency range (~2.3k buckets from 1µs to 1h), not the run
+# length.
+_RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + _RELATIVE_ACCURACY) / (1 - _RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+_MIN_MS = 0.001
+
+
+def _bucket_index(latency_ms: float) -> int:
+    return math.ceil(math.log(max(latency_ms, _MIN_MS)) / _LOG_GAMMA)
+
+
+def _bucket_value(index: int) -> float:
+    return 2.0 * _GAMMA**index / (_GAMMA + 1.0)
+
+
+@dataclass
+class LatencyHistogram:
+    """Latency distribution (ms) of one case or step.
+
+    Percentiles come from log-scale buckets and are accurate to 1%;
+    ``count``, ``errors``, the mean and ``max`` are exact.
+    """
+
+    buckets: Dict[int, int] = field(default_factory=dict)
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, latency_ms: float, *, failed: bool = False) -> None:
+        index = _bucket_index(latency_ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        if failed:
+            self.errors += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, hits in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + hits
+        self.count += other.count
+        self.errors += other.errors
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile, ``q`` in 0..100."""
+        if not self.count:
+            return 0.0
+        rank = min(max(1, math.ceil(q / 100.0 * self.count)), self.count)
+        if rank == self.count:
+            return self.max_ms
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(_bucket_value(index), self.max_ms)
+        return self.max_ms
+
+    def summary(self, elapsed_s: float) -> Dict[str, Any]:
+        count = self.count
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": (self.errors / count) if count else 0.0,
+            "throughput": (count / elapsed_s) if elapsed_s > 0 else 0.0,
+            "mean_ms": (self.total_ms / count) if count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+
+@dataclass
+class LoadStats:
+    cases: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    steps: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def elapsed_s(self) -> float:
+        return max(self.finished_at - self.started_at, 0.0)
+
+    def record(self, case_name: str, result: CaseInstanceResult | None, latency_ms: float) -> None:
+        failed = result is None or result.status == "failed"
+        self.cases.setdefault(case_name, LatencyHistogram()).add(latency_ms, failed=failed)
+        for step in result.steps if result is not None else []:
+            if step.status == "skipped":
+                continue
+            key = f"{case_name} › {step.origin_step_name or step.name}"
+            self.steps.setdefault(key, LatencyHistogram()).add(
+                step.duration_ms,
+                failed=step.status == "failed",
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = LatencyHistogram()
+        for histogram in self.cases.values():
+            total.merge(histogram)
+        requests = sum(histogram.count for histogram in self.steps.values())
+        elapsed = self.elapsed_s
+        return {
+            "elapsed_s": elapsed,
+            "iterations": total.summary(elapsed),
+            "requests_per_second": (requests / elapsed) if elapsed > 0 else 0.0,
+            "cases": {name: h.summary(elapsed) for name, h in self.cases.items()},
+            "steps": {name: h.summary(elapsed) for name, h in self.steps.items()},
+        }
+
+
+def arrival_offset(index: int, rps: float, ramp_up: float) -> float:
+    """Start time (seconds) of the ``index``-th open-loop arrival.
+
+    The rate grows linearly from 0 to ``rps`` over ``ramp_up`` seconds, so
+    ``rps * t**2 / (2 * ramp_up)`` arrivals are due by time ``t`` during the
+    ramp.  Computing each offset from the index keeps the schedule free of
+    accumulated drift.
+    """
+    if ramp_up <= 0:
+        return index / rps
+    ramp_arrivals = rps * ramp_up / 2.0
+    if index <= ramp_arrivals:
+        return math.sqrt(2.0 * index * ramp_up / rps)
+    return ramp_up + (index - ramp_arrivals) / rps
+
+
+IterationFn = Callable[[Any], Any]
+
+
+async def run_load(
+    jobs: Sequence[Any],
+    profile: LoadProfile,
+    iteration: IterationFn,
+    *,
+    case_name: Callable[[Any], str],
+    clock: Callable[[], float] = time.perf_counter,
+) -> LoadStats:
+    """Drive ``iteration(job)`` coroutines over ``jobs`` round-robin."""
+    stats = LoadStats()
+    next_job = itertools.cycle(jobs).__next__
+    start = clock()
+    deadline = start + profile.duration
+    stats.started_at = start
+
+    async def run_one(job: Any, scheduled: float) -> None:
+        result: CaseInstanceResult | None = None
+        try:
+            result = await iteration(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            result = None
+        stats.record(case_name(job), result, (clock() - scheduled) * 1000.0)
+
+    if profile.open_loop:
+        await _open_loop(profile, next_job, run_one, start, deadline, clock)
+    else:
+        await _closed_loop(profile, next_job, run_one, start, deadline, clock)
+
+    stats.finished_at = clock()
+    return stats
+
+
+async def _closed_loop(profile, next_job, run_one, start, deadline, clock) -> None:
+    users = max(profile.concurrency, 1)
+
+    async def virtual_user(slot: int) -> None:
+        await _sleep_until(start + profile.ramp_up * slot / users, clock)
+        while clock() < deadline:
+            await run_one(next_job(), clock())
+
+    await asyncio.gather(*(virtual_user(slot) for slot in range(users)))
+
+
+async def _open_loop(profile, next_job, run_one, start, deadline, clock) -> None:
+    in_flight = asyncio.Semaphore(max(profile.concurrency, 1))
+    tasks: Set[asyncio.Task] = set()
+
+    async def arrival(job: Any, scheduled: float) -> None:
+        async with in_flight:
+            await run_one(job, scheduled)
+
+    for index in itertools.count():
+        scheduled = start + arrival_offset(index, float(profile.rps), profile.ramp_up)
+        if scheduled >= deadline:
+            break
+        await _sleep_until(scheduled, clock)
+        task = asyncio.create_task(arrival(next_job(), scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+
+
+async def _sleep_until(when: float, clock: Callable[[], float]) -> None:
+    delay = when - clock()
+    if delay > 0:
+        await asyncio.sleep(delay)
@@ -16,7 +16,7 @@ Design note:
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, Iterable, List, Optional, Protocol
 
 from drun.models.step import Step
 
@@ -42,6 +42,17 @@ class TemplateEngineProtocol(Protocol):
         strict: bool = False,
     ) -> Any: ...
 
+    def _render_planned(
+        self,
+        data: Any,
+        plan: Any,
+        variables: Dict[str, Any],
+        functions: Optional[Dict[str, Any]] = None,
+        envmap: Optional[Dict[str, Any]] = None,
+        *,
+        strict: bool = False,
+    ) -> Any: ...
+
     def render_expression(
         self,
         expr: str,
@@ -64,8 +75,9 @@ class RunnerProtocol(Protocol):
     failfast: bool
     reveal: bool
     log_response_headers: bool
+    report_response_bodies: bool
     log_debug: bool
-    persist_env_file: str
+    persist_env_file: str | None
     templater: TemplateEngineProtocol
 
     # -- rendering ----------------------------------------------------------
@@ -142,6 +154,8 @@ class RunnerProtocol(Protocol):
 
     def _eval_extract(self, expr: Any, resp: Dict[str, Any]) -> Any: ...
 
+    def _resolve_paths(self, exprs: Iterable[Any], resp: Dict[str, Any]) -> Dict[str, Any]: ...
+
     # -- response body persistence -----------------------------------------
     def _save_response_body(
         self,
@@ -3,9 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict
 
+from drun.engine.upload import describe_upload_value
 from drun.models.report import to_report_safe
 from drun.models.step import Step
 from drun.runner.protocols import RunnerProtocol
+from drun.templating.plan import step_render_plan
 from drun.utils.curl import to_curl
 from drun.utils.mask import mask_body, mask_headers
 
@@ -25,8 +27,8 @@ def render_request_for_setup(
     funcs: Dict[str, Any] | None,
     envmap: Dict[str, Any] | None,
 ) -> Dict[str, Any]:
-    req_dict = runner._request_dict(step)
-    return runner._render(req_dict, variables, funcs, envmap, strict=True)
+    plan = step_render_plan(step)
+    return runner._render_planned(plan.request, plan.request_plan, variables, funcs, envmap, strict=True)
 
 
 def finalize_request_projection(
@@ -73,11 +75,14 @@ def _inject_token_header(request: Dict[str, Any], variables: Dict[str, Any]) ->
 
 
 def _build_report_request(request: Dict[str, Any]) -> Dict[str, Any]:
-    return {
+    report = {
         k: to_report_safe(v)
         for k, v in request.items()
         if k in ("method", "path", "url", "params", "headers", "body", "data", "files")
     }
+    if request.get("upload") is not None:
+        report["upload"] = describe_upload_value(request["upload"])
+    return report
 
 
 def _build_curl(
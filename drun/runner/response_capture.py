@@ -21,19 +21,19 @@ def capture_step_response(*, runner: RunnerProtocol, resp_obj: Dict[str, Any]) -
 
 
 def _build_report_response(*, runner: RunnerProtocol, resp_obj: Dict[str, Any]) -> Dict[str, Any]:
-    body_masked = resp_obj.get("body")
-    if not runner.reveal:
-        body_masked = mask_body(body_masked)
-
     response_dict: Dict[str, Any] = {
         "status_code": resp_obj.get("status_code"),
     }
+    if resp_obj.get("http_version"):
+        response_dict["http_version"] = resp_obj.get("http_version")
 
     if resp_obj.get("is_stream"):
         response_dict["is_stream"] = True
         response_dict["stream_events"] = resp_obj.get("stream_events", [])
         response_dict["stream_summary"] = resp_obj.get("stream_summary", {})
         response_dict["stream_raw_chunks"] = resp_obj.get("stream_raw_chunks", [])
+        if resp_obj.get("stream_content") is not None:
+            response_dict["stream_content"] = resp_obj.get("stream_content")
         if not runner.reveal:
             masked_events = []
             for event in response_dict["stream_events"]:
@@ -44,27 +44,18 @@ def _build_report_response(*, runner: RunnerProtocol, resp_obj: Dict[str, Any])
             response_dict["stream_events"] = masked_events
         return response_dict
 
-    if isinstance(body_masked, (dict, list)):
-        response_dict["body"] = body_masked
-    elif body_masked is None:
-        response_dict["body"] = None
-    elif isinstance(body_masked, (str, bytes)):
-        if isinstance(body_masked, bytes):
-            text = body_masked.decode("utf-8", errors="replace")
-        else:
-            text = body_masked
-        response_dict["body"] = text if len(text) <= 2048 else text[:2048] + "..."
-    elif isinstance(body_masked, (bool, int, float)):
-        response_dict["body"] = body_masked
-    else:
-        text = str(body_masked)
-        response_dict["body"] = text if len(text) <= 2048 else text[:2048] + "..."
+    # ``body`` / ``body_bytes_b64`` are decoded lazily; only read them when a
+    # report (JSON, HTML, Allure) will show them.
+    if runner.report_response_bodies:
+        response_dict["body"] = _report_body(runner, resp_obj.get("body"))
 
     if resp_obj.get("content_type") is not None:
         response_dict["content_type"] = resp_obj.get("content_type")
     if resp_obj.get("body_size") is not None:
         response_dict["body_size"] = resp_obj.get("body_size")
-    if resp_obj.get("body_bytes_b64") is not None:
+    if resp_obj.get("body_sha256") is not None:
+        response_dict["body_sha256"] = resp_obj.get("body_sha256")
+    if runner.report_response_bodies and resp_obj.get("body_bytes_b64") is not None:
         response_dict["body_bytes_b64"] = resp_obj.get("body_bytes_b64")
     if resp_obj.get("saved_body_to") is not None:
         response_dict["saved_body_to"] = resp_obj.get("saved_body_to")
@@ -72,3 +63,14 @@ def _build_report_response(*, runner: RunnerProtocol, resp_obj: Dict[str, Any])
         response_dict["save_error"] = resp_obj.get("save_error")
 
     return response_dict
+
+
+def _report_body(runner: RunnerProtocol, body: Any) -> Any:
+    body_masked = body if runner.reveal else mask_body(body)
+    if body_masked is None or isinstance(body_masked, (dict, list, bool, int, float)):
+        return body_masked
+    if isinstance(body_masked, bytes):
+        text = body_masked.decode("utf-8", errors="replace")
+    else:
+        text = body_masked if isinstance(body_masked, str) else str(body_masked)
+    return text if len(text) <= 2048 else text[:2048] + "..."
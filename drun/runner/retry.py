@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
 import re
-import time
+from typing import Any, Dict
+
+from drun.models.retry import RetryConfig
 
 
 def parse_duration(s: str) -> float:
@@ -30,8 +35,90 @@ def parse_duration(s: str) -> float:
     raise ValueError(f"Invalid duration: {s!r} (expected e.g. '2s' or '500ms')")
 
 
-def sleep_every(every: str, attempt: int) -> None:
-    """Sleep for the duration given by *every* (constant delay)."""
-    secs = parse_duration(every)
-    if secs > 0:
-        time.sleep(secs)
+def parse_retry_after(value: Any) -> float | None:
+    """Seconds to wait from a ``Retry-After`` value (delta seconds or HTTP date)."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return max(float(text), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+# Single-wait ceiling when ``max_delay`` is unset: growing backoffs and
+# ``Retry-After`` never ask ``time.sleep`` for more than this.
+DEFAULT_MAX_DELAY = 300.0
+# Keeps 2 ** retries finite on very long polls.
+_MAX_DOUBLINGS = 62
+
+
+class RetryBackoff:
+    """Wait times between the attempts of one step.
+
+    ``next_delay`` returns the pause before the next attempt, or ``None``
+    when the wait would exceed ``budget`` (the step stops retrying).  A
+    ``Retry-After`` header on a 429/503 response replaces the computed
+    delay when it is longer.  ``max_delay`` (``DEFAULT_MAX_DELAY`` when
+    unset) caps both the growing backoffs and ``Retry-After``; a
+    ``constant`` wait is used as written.  The waits themselves are yielded
+    as ``Pause`` effects by the caller and never block an event loop.
+    """
+
+    def __init__(self, config: RetryConfig, *, rng: random.Random | None = None) -> None:
+        self.config = config
+        self.base = parse_duration(config.every)
+        self.cap = parse_duration(config.max_delay) if config.max_delay else None
+        self.ceiling = self.cap if self.cap is not None else max(DEFAULT_MAX_DELAY, self.base)
+        self.budget = parse_duration(config.budget) if config.budget else None
+        self.rng = rng or random.Random()
+        self.waited = 0.0
+        self.retries = 0
+        self._previous = self.base
+
+    def next_delay(self, response: Dict[str, Any] | None = None) -> float | None:
+        delay = self._computed_delay()
+        if self.cap is not None:
+            delay = min(delay, self.cap)
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.ceiling))
+        if self.budget is not None and self.waited + delay > self.budget:
+            return None
+        self.retries += 1
+        self.waited += delay
+        return delay
+
+    def _computed_delay(self) -> float:
+        mode = self.config.backoff
+        if mode == "exponential":
+            if self.base <= 0:
+                return 0.0
+            return min(self.base * 2.0 ** min(self.retries, _MAX_DOUBLINGS), self.ceiling)
+        if mode == "decorrelated":
+            upper = max(min(self._previous * 3, self.ceiling), self.base)
+            delay = min(self.rng.uniform(self.base, upper), self.ceiling)
+            self._previous = delay
+            return delay
+        return self.base
+
+    def _retry_after(self, response: Dict[str, Any] | None) -> float | None:
+        if not self.config.retry_after or not response:
+            return None
+        if response.get("status_code") not in RETRY_AFTER_STATUSES:
+            return None
+        headers = response.get("headers") or {}
+        for name, value in headers.items():
+            if str(name).lower() == "retry-after":
+                return parse_retry_after(value)
+        return None
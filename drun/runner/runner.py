@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import copy
 import json
 import math
-import re
+import os
+import shutil
 import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Tuple
 
 from drun.engine.http import HTTPClient
+from drun.engine.pool import ClientPool
+from drun.engine.throttle import HostThrottle
 from drun.models.case import Case
 from drun.models.report import CaseInstanceResult, RunReport, StepResult
 from drun.models.retry import get_retry_max, get_retry_every
@@ -16,10 +20,30 @@ from drun.runner.retry import parse_duration
 from drun.templating.compat import clean_escaped_template_string
 from drun.templating.context import VarContext
 from drun.templating.engine import TemplateEngine
-from drun.runner.extractors import extract_from_body
+from drun.templating.plan import step_render_plan
+from drun.runner.effects import Concurrently, Flow, drive
+from drun.runner.extractors import (
+    compile_simple_path,
+    convert_jmespath_path,
+    extract_from_body,
+    resolve_simple_paths,
+)
 from drun.runner.hooks import run_setup_hooks, run_teardown_hooks
 from drun.runner.invoke import execute_invoke_step
-from drun.runner.step_lifecycle import StepLifecycle, StepLifecycleContext
+from drun.runner.step_graph import plan_step_waves
+from drun.runner.step_lifecycle import StepLifecycle, StepLifecycleContext, StepLifecycleResult
+from drun.utils.logging import BufferedLogger
+
+
+def _simple_body_path(e: str) -> Tuple[Any, ...] | None:
+    """Accessors for ``$.a.b`` / ``$[0].c`` when ``_eval_extract`` would search the body."""
+    if e.endswith(".length"):
+        return None
+    if e.startswith("$."):
+        return compile_simple_path(convert_jmespath_path(e[2:]))
+    if e.startswith("$["):
+        return compile_simple_path(e[1:])
+    return None
 
 
 class Runner:
@@ -31,14 +55,19 @@ class Runner:
         log_debug: bool = False,
         reveal_secrets: bool = True,
         log_response_headers: bool = True,
-        persist_env_file: str = ".env",
+        persist_env_file: str | None = ".env",
+        client_pool: ClientPool | None = None,
+        report_response_bodies: bool = True,
     ) -> None:
         self.log = log
         self.failfast = failfast
         self.log_debug = log_debug
         self.reveal = reveal_secrets
         self.log_response_headers = log_response_headers
+        # Step results carry the decoded body only when a report will show it.
+        self.report_response_bodies = report_response_bodies
         self.persist_env_file = persist_env_file
+        self.client_pool = client_pool
         self.templater = TemplateEngine()
 
     def _render(
@@ -51,6 +80,17 @@ class Runner:
     ) -> Any:
         return self.templater.render_value(data, variables, functions, envmap, strict=strict)
 
+    def _render_planned(
+        self,
+        data: Any,
+        plan: Any,
+        variables: Dict[str, Any],
+        functions: Dict[str, Any] | None = None,
+        envmap: Dict[str, Any] | None = None,
+        strict: bool = False,
+    ) -> Any:
+        return self.templater.render_planned(data, plan, variables, functions, envmap, strict=strict)
+
     def _collect_render_diffs(self, original: Any, rendered: Any, path: str = "") -> List[tuple]:
         """Collect before/after differences for variable substitution."""
         diffs = []
@@ -92,18 +132,41 @@ class Runner:
         # For caseflow (invoke-only cases), base_url may be None
         # Use a placeholder URL since the client won't be used for invoke steps
         base_url = cfg.base_url or "http://placeholder.local"
+        options = self._connection_options(case)
+        pool = self.client_pool or ClientPool()
+        http2, limits = pool.resolve(**options)
         return HTTPClient(
             base_url=base_url,
             timeout=cfg.timeout,
             verify=cfg.verify,
             headers=cfg.headers,
+            transport=self.client_pool.transport(verify=cfg.verify, **options) if self.client_pool else None,
+            http2=http2,
+            limits=limits,
+            throttle=self._case_throttle(case, pool),
         )
 
+    def _case_throttle(self, case: Case, pool: ClientPool) -> HostThrottle:
+        """Register the case's host limits on the run-wide throttle and return it."""
+        cfg = case.config
+        if cfg.base_url and (cfg.rate_limit or cfg.host_concurrency):
+            pool.throttle.configure(cfg.base_url, rate_limit=cfg.rate_limit, concurrency=cfg.host_concurrency)
+        return pool.throttle
+
+    def _connection_options(self, case: Case) -> Dict[str, Any]:
+        cfg = case.config
+        return {
+            "http2": cfg.http2,
+            "max_connections": cfg.max_connections,
+            "max_keepalive_connections": cfg.max_keepalive_connections,
+            "keepalive_expiry": cfg.keepalive_expiry,
+        }
+
     def _request_dict(self, step: Step) -> Dict[str, Any]:
         # Use field names (not aliases) so "body" stays as expected downstream.
         # Otherwise the StepRequest alias "json" leaks into runtime and the
         # payload is dropped, triggering 422 responses on JSON APIs.
-        return step.request.model_dump(exclude_none=True)
+        return step_render_plan(step).request
 
     def _fmt_json(self, obj: Any) -> str:
         try:
@@ -191,18 +254,24 @@ class Runner:
         raw_bytes = resp.get("raw_bytes")
         if raw_bytes is None:
             raise ValueError("response.save_body_to requires a response body")
-        if isinstance(raw_bytes, memoryview):
-            raw_bytes = raw_bytes.tobytes()
-        elif isinstance(raw_bytes, bytearray):
-            raw_bytes = bytes(raw_bytes)
-        if not isinstance(raw_bytes, bytes):
+        if not isinstance(raw_bytes, (bytes, bytearray, memoryview)):
             raise ValueError("response.save_body_to requires raw response bytes")
 
         out_path = Path(rendered_target).expanduser()
         if not out_path.is_absolute():
             out_path = Path.cwd() / out_path
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_bytes(raw_bytes)
+        spooled = resp.get("body_path")
+        if spooled and os.path.exists(spooled):
+            # Body was streamed to a temp file (response.max_memory_bytes).  It
+            # is still mapped as raw_bytes, so copy it rather than moving it
+            # (Windows cannot rename a mapped file); the response's finalizer
+            # closes the mapping and removes the spool.
+            shutil.copyfile(spooled, out_path)
+            resp["body_path"] = str(out_path.resolve())
+        else:
+            with out_path.open("wb") as fh:
+                fh.write(raw_bytes)
         return str(out_path.resolve())
 
     def _resolve_check(self, check: str, resp: Dict[str, Any]) -> Any:
@@ -237,67 +306,43 @@ class Runner:
             "json.user-name" -> "json.\"user-name\""
             "data.normal_field" -> "data.normal_field"
         """
-        # Split expression by dots, but preserve array access like [0]
-        parts = []
-        i = 0
-        n = len(expr)
-
-        while i < n:
-            if i + 1 < n and expr[i] == '[':
-                # Found array access, find the closing bracket
-                j = expr.find(']', i)
-                if j == -1:
-                    # No closing bracket, treat as regular character
-                    if i == 0:
-                        parts.append(expr[i:])
-                        break
-                    else:
-                        parts.append(expr[i])
-                        i += 1
-                        continue
-
-                # Extract array access part
-                array_part = expr[i:j+1]
-                parts.append(array_part)
-                i = j + 1
+        return convert_jmespath_path(expr)
 
-                # Skip dot after array access if present
-                if i < n and expr[i] == '.':
-                    i += 1
-            else:
-                # Regular field access, find next dot or array access
-                j = i
-                while j < n and expr[j] != '.' and expr[j] != '[':
-                    j += 1
-
-                field_name = expr[i:j]
-                # Check if field name needs quoting (contains special chars)
-                if re.search(r'[^a-zA-Z0-9_]', field_name):
-                    field_name = f'"{field_name}"'
-                parts.append(field_name)
-
-                if j < n and expr[j] == '.':
-                    i = j + 1
-                else:
-                    i = j
-
-        # Join parts with dots for field access (array parts already include brackets)
-        result = []
-        for i, part in enumerate(parts):
-            if '[' in part and ']' in part:
-                # Array access, don't add dot before it
-                if i > 0:
-                    result[-1] = result[-1] + part
-                else:
-                    result.append(part)
-            else:
-                # Regular field access
-                if i == 0:
-                    result.append(part)
-                else:
-                    result.append('.' + part)
+    def _resolve_paths(self, exprs: Iterable[Any], resp: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate the plain ``$.`` / ``$[`` body paths among *exprs* in one pass.
 
-        return ''.join(result)
+        Returns ``{expr: value}`` with the same values ``_eval_extract`` gives;
+        expressions it cannot batch are left out for the caller to evaluate.
+        """
+        if resp.get("is_stream"):
+            return {}
+        exprs = list(exprs)
+        paths: Dict[str, Any] = {}
+        lengths: Dict[str, str] = {}
+        for expr in exprs:
+            if not isinstance(expr, str) or expr in paths or expr in lengths:
+                continue
+            e = expr.strip()
+            if e.endswith(".length") and len(e) > len("$.length"):
+                base = e[:-len(".length")]
+                accessors = _simple_body_path(base)
+                if accessors is not None:
+                    lengths[expr] = base
+                    paths.setdefault(base, accessors)
+                continue
+            accessors = _simple_body_path(e)
+            if accessors is not None:
+                paths[expr] = accessors
+        if not paths:
+            # Do not decode a lazy body when the step reads no body path.
+            return {}
+        resolved = resolve_simple_paths(paths, resp.get("body"))
+        for expr, base in lengths.items():
+            try:
+                resolved[expr] = len(resolved[base])  # type: ignore[arg-type]
+            except Exception:
+                resolved[expr] = None
+        return {expr: resolved[expr] for expr in exprs if isinstance(expr, str) and expr in resolved}
 
     def _eval_extract(self, expr: Any, resp: Dict[str, Any]) -> Any:
         # Only support string expressions starting with $
@@ -315,15 +360,6 @@ class Runner:
                 return len(base_val)  # type: ignore[arg-type]
             except Exception:
                 return None
-        # Disallow order-agnostic JMESPath functions (sort/sort_by)
-        body_expr = e[1:].strip()
-        try:
-            import re as _re
-            if _re.search(r"\bsort_by\s*\(|\bsort\s*\(", body_expr):
-                raise ValueError("JMESPath 'sort'/'sort_by' functions are disabled. Use explicit alignment.")
-        except Exception:
-            # best-effort; fall through
-            pass
         if e in ("$", "$body"):
             return resp.get("body")
         if e == "$headers":
@@ -336,6 +372,8 @@ class Runner:
             return resp.get("url")
         if e == "$method":
             return resp.get("method")
+        if e == "$http_version":
+            return resp.get("http_version")
         if e == "$content_type":
             return resp.get("content_type")
         if e == "$body_size":
@@ -344,6 +382,8 @@ class Runner:
             return resp.get("raw_bytes")
         if e == "$body_bytes_b64":
             return resp.get("body_bytes_b64")
+        if e == "$body_sha256":
+            return resp.get("body_sha256")
         if e.startswith("$headers."):
             key = e.split(".", 1)[1]
             headers = resp.get("headers") or {}
@@ -353,6 +393,12 @@ class Runner:
                     return h_val
             return None
         
+        if e == "$timing" or e.startswith("$timing."):
+            # $timing.connect_ms, $timing.ttfb_ms, ...
+            if e == "$timing":
+                return resp.get("timing")
+            return extract_from_body(resp.get("timing"), e[len("$timing."):])
+
         # Streaming-specific fields
         if e.startswith("$stream_events"):
             # Support $.stream_events[0].data or $stream_events[0].data
@@ -369,6 +415,8 @@ class Runner:
             return extract_from_body(resp, jexpr)
         if e == "$stream_raw_chunks":
             return resp.get("stream_raw_chunks")
+        if e == "$stream_content":
+            return resp.get("stream_content")
         
         # JSON body via JSONPath-like: $.a.b or $[0].id -> jmespath a.b / [0].id
         body = resp.get("body")
@@ -572,14 +620,24 @@ class Runner:
         envmap: Dict[str, Any] | None,
     ) -> tuple[VarContext, HTTPClient]:
         """Build merged variable context and HTTP client for a case run."""
+        ctx = self._prepare_variables(case, global_vars, params, funcs, envmap)
+        client = self._build_client(case)
+        return ctx, client
+
+    def _prepare_variables(
+        self,
+        case: Case,
+        global_vars: Dict[str, Any],
+        params: Dict[str, Any],
+        funcs: Dict[str, Any] | None,
+        envmap: Dict[str, Any] | None,
+    ) -> VarContext:
         base_vars_raw: Dict[str, Any] = {**(case.config.variables or {}), **(params or {})}
         rendered_base = {**global_vars}
         for key, value in base_vars_raw.items():
             if key not in global_vars:
                 rendered_base[key] = self._render(value, rendered_base, funcs, envmap)
-        ctx = VarContext(rendered_base)
-        client = self._build_client(case)
-        return ctx, client
+        return VarContext(rendered_base)
 
     def _execute_setup_hooks(
         self,
@@ -688,59 +746,71 @@ class Runner:
         return results
 
     def run_case(self, case: Case, global_vars: Dict[str, Any], params: Dict[str, Any], *, funcs: Dict[str, Any] | None = None, envmap: Dict[str, Any] | None = None, source: str | None = None) -> CaseInstanceResult:
-        name = case.config.name or "Unnamed Case"
         t0 = time.perf_counter()
+        ctx, client = self._prepare_context(case, global_vars, params, funcs, envmap)
+        try:
+            return drive(
+                self._case_flow(case, global_vars, params, funcs, envmap, source, ctx, client, t0)
+            )
+        finally:
+            client.close()
+
+    def _case_flow(
+        self,
+        case: Case,
+        global_vars: Dict[str, Any],
+        params: Dict[str, Any],
+        funcs: Dict[str, Any] | None,
+        envmap: Dict[str, Any] | None,
+        source: str | None,
+        ctx: VarContext,
+        client: Any,
+        t0: float,
+    ) -> Flow:
+        name = case.config.name or "Unnamed Case"
         steps_results: List[StepResult] = []
         status = "passed"
         last_resp_obj: Dict[str, Any] | None = None
-
-        ctx, client = self._prepare_context(case, global_vars, params, funcs, envmap)
         step_lifecycle = StepLifecycle(self)
 
         try:
             steps_results.extend(self._execute_setup_hooks(case, ctx, global_vars, funcs, envmap, name))
 
-            for step_idx, step in enumerate(case.steps, 1):
-                base_variables = ctx.get_merged(global_vars)
-                rendered_locals = self._render(step.variables, base_variables, funcs, envmap)
-                ctx.push(rendered_locals if isinstance(rendered_locals, dict) else (step.variables or {}))
-                variables = ctx.get_merged(global_vars)
-
-                if step.sleep is not None or step.request is not None or step.invoke is not None:
-                    lifecycle_result = step_lifecycle.execute(
-                        StepLifecycleContext(
-                            step=step,
-                            step_idx=step_idx,
-                            case_name=case.config.name or name,
-                            ctx=ctx,
-                            global_vars=global_vars,
-                            rendered_locals=rendered_locals if isinstance(rendered_locals, dict) else (step.variables or {}),
-                            funcs=funcs,
-                            envmap=envmap,
-                            client=client,
-                            params=params,
-                            source=source,
-                        )
-                    )
-                    lifecycle_results = lifecycle_result.results
-                    steps_results.extend(lifecycle_results)
-                    if lifecycle_result.last_response is not None:
+            step_args = (case, name, ctx, global_vars, funcs, envmap, client, params, source)
+            if case.config.parallel_steps:
+                waves = plan_step_waves(case.steps)
+            else:
+                waves = [[idx] for idx in range(len(case.steps))]
+
+            # Waves may finish steps out of order; report them in step order.
+            outcomes: Dict[int, StepLifecycleResult] = {}
+            for wave in waves:
+                if len(wave) == 1:
+                    wave_results = [(yield from self._step_flow(step_lifecycle, wave[0], *step_args))]
+                else:
+                    wave_results = yield from self._parallel_wave_flow(wave, *step_args)
+
+                stop = False
+                for idx, lifecycle_result in zip(wave, wave_results):
+                    if lifecycle_result is None:
+                        continue
+                    outcomes[idx] = lifecycle_result
+                    if lifecycle_result.last_response is not None and idx == max(outcomes):
                         last_resp_obj = lifecycle_result.last_response
-                    if any(result.status == "failed" for result in lifecycle_results):
+                    if any(result.status == "failed" for result in lifecycle_result.results):
                         status = "failed"
                         if self.failfast:
-                            ctx.pop()
-                            break
-                    ctx.pop()
-                    continue
+                            stop = True
+                if stop:
+                    break
 
-                ctx.pop()
+            for idx in sorted(outcomes):
+                steps_results.extend(outcomes[idx].results)
 
         finally:
             steps_results.extend(
                 self._execute_teardown_hooks(case, ctx, global_vars, funcs, envmap, last_resp_obj, name)
             )
-            client.close()
 
         total_ms = (time.perf_counter() - t0) * 1000.0
 
@@ -749,6 +819,100 @@ class Runner:
 
         return CaseInstanceResult(name=name, parameters=params or {}, steps=steps_results, status=status, duration_ms=total_ms, source=source)
 
+    def _step_flow(
+        self,
+        step_lifecycle: StepLifecycle,
+        idx: int,
+        case: Case,
+        name: str,
+        ctx: VarContext,
+        global_vars: Dict[str, Any],
+        funcs: Dict[str, Any] | None,
+        envmap: Dict[str, Any] | None,
+        client: Any,
+        params: Dict[str, Any],
+        source: str | None,
+    ) -> Flow:
+        step = case.steps[idx]
+        base_variables = ctx.get_merged(global_vars)
+        rendered_locals = self._render_planned(
+            step.variables, step_render_plan(step).variables_plan, base_variables, funcs, envmap
+        )
+        step_locals = rendered_locals if isinstance(rendered_locals, dict) else (step.variables or {})
+        ctx.push(step_locals)
+        try:
+            if step.sleep is None and step.request is None and step.invoke is None:
+                return None
+            return (
+                yield from step_lifecycle.flow(
+                    StepLifecycleContext(
+                        step=step,
+                        step_idx=idx + 1,
+                        case_name=case.config.name or name,
+                        ctx=ctx,
+                        global_vars=global_vars,
+                        rendered_locals=step_locals,
+                        funcs=funcs,
+                        envmap=envmap,
+                        client=client,
+                        params=params,
+                        source=source,
+                    )
+                )
+            )
+        finally:
+            ctx.pop()
+
+    def _parallel_wave_flow(
+        self,
+        wave: List[int],
+        case: Case,
+        name: str,
+        ctx: VarContext,
+        *step_args: Any,
+    ) -> Flow:
+        """Run independent steps together (``config.parallel_steps``).
+
+        Each step gets a forked context and its own buffered log.  Once the
+        wave is done, extracted variables are applied and log blocks emitted
+        in step order, so the outcome matches a sequential run.  With
+        ``failfast`` everything after the first failed step is discarded
+        (results, logs and extracts), as if it had never started.
+        """
+        forks: List[VarContext] = []
+        buffers: List[BufferedLogger | None] = []
+        flows: List[Flow] = []
+        for idx in wave:
+            step_runner = copy.copy(self)
+            step_runner.log = BufferedLogger(self.log) if self.log else None
+            fork = ctx.fork()
+            forks.append(fork)
+            buffers.append(step_runner.log)
+            flows.append(
+                step_runner._step_flow(StepLifecycle(step_runner), idx, case, name, fork, *step_args)
+            )
+        kept = len(wave)
+        try:
+            wave_results = yield Concurrently(flows)
+            if self.failfast:
+                kept = next(
+                    (
+                        pos + 1
+                        for pos, lifecycle_result in enumerate(wave_results)
+                        if lifecycle_result is not None
+                        and any(result.status == "failed" for result in lifecycle_result.results)
+                    ),
+                    kept,
+                )
+        finally:
+            for buffered in buffers[:kept]:
+                if buffered is not None:
+                    buffered.flush()
+        for fork in forks[:kept]:
+            for key, value in fork.base_writes or []:
+                ctx.set_base(key, value)
+        return wave_results[:kept]
+
     def build_report(self, results: List[CaseInstanceResult]) -> RunReport:
         total = len(results)
         failed = sum(1 for r in results if r.status == "failed")
@@ -0,0 +1,116 @@
+"""Static step dependencies for ``config.parallel_steps``.
+
+A step *reads* every name referenced from its templates (``${expr}``,
+``{{ expr }}`` and ``$name``) and *writes* its ``extract`` keys.  Steps are
+placed in waves so that
+
+* a step runs after every earlier step whose extracts it reads,
+* two steps writing the same name keep their order,
+* a step never runs before an earlier step that still reads a name it
+  overwrites (same wave is fine: each step sees a snapshot taken when the
+  wave starts).
+
+Steps of a case share one client and cookie jar, so session state set by a
+response (a login cookie) is invisible to this analysis.  Only request steps
+marked ``parallel: true`` may share a wave; every other step, and any step
+with hooks or ``export`` (which can touch anything), is a barrier that runs
+alone after everything before it.  The analysis
+over-approximates reads (function names, literals), which only costs
+parallelism, never correctness.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterator, List, Sequence, Set
+
+from drun.models.step import Step
+from drun.utils.env_writer import to_env_var_name
+
+
+_TEMPLATE_BODY = re.compile(r"\$\{(.*?)\}|\{\{(.*?)\}\}", re.S)
+_DOLLAR_NAME = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def plan_step_waves(steps: Sequence[Step]) -> List[List[int]]:
+    """Group step indexes (0-based) into waves that may run concurrently."""
+    levels: List[int] = []
+    writer_level: Dict[str, int] = {}
+    reader_level: Dict[str, int] = {}
+    barrier_level = -1
+    top_level = -1
+
+    for step in steps:
+        reads = step_reads(step)
+        writes = step_writes(step)
+        if is_barrier_step(step):
+            level = top_level + 1
+            barrier_level = level
+        else:
+            level = barrier_level + 1
+            for name in reads:
+                if name in writer_level:
+                    level = max(level, writer_level[name] + 1)
+            for name in writes:
+                if name in writer_level:
+                    level = max(level, writer_level[name] + 1)
+                if name in reader_level:
+                    level = max(level, reader_level[name])
+        for name in reads:
+            reader_level[name] = max(reader_level.get(name, -1), level)
+        for name in writes:
+            writer_level[name] = level
+        levels.append(level)
+        top_level = max(top_level, level)
+
+    waves: List[List[int]] = [[] for _ in range(top_level + 1)]
+    for idx, level in enumerate(levels):
+        waves[level].append(idx)
+    return [wave for wave in waves if wave]
+
+
+def is_barrier_step(step: Step) -> bool:
+    return (
+        not step.parallel
+        or step.request is None
+        or bool(step.setup_hooks)
+        or bool(step.teardown_hooks)
+        or step.export is not None
+    )
+
+
+def step_writes(step: Step) -> Set[str]:
+    names: Set[str] = set()
+    for key in (step.extract or {}):
+        names.add(key)
+        # Extracts are mirrored into envmap under their ENV-style name.
+        names.add(to_env_var_name(key))
+    return names
+
+
+def step_reads(step: Step) -> Set[str]:
+    names: Set[str] = set()
+    for text in _iter_strings(step.model_dump(exclude={"extract"}, exclude_none=True)):
+        for match in _TEMPLATE_BODY.finditer(text):
+            body = match.group(1) if match.group(1) is not None else match.group(2)
+            names.update(_IDENTIFIER.findall(body))
+        names.update(_DOLLAR_NAME.findall(text))
+    for expr in (step.extract or {}).values():
+        for match in _TEMPLATE_BODY.finditer(str(expr)):
+            body = match.group(1) if match.group(1) is not None else match.group(2)
+            names.update(_IDENTIFIER.findall(body))
+    return names
+
+
+def _iter_strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(key, str):
+                yield key
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_strings(item)
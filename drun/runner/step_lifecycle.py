@@ -2,25 +2,33 @@
 
 Each step runs through: skip → setup hooks → retry loop → teardown hooks.
 The retry loop covers both HTTP exceptions and check failures.
+
+Steps are written as effect flows (see ``drun.runner.effects``): HTTP calls,
+sleeps and retry waits are yielded, so the same lifecycle runs blocking under
+``execute`` and on an event loop under ``AsyncRunner``.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
+import logging
 import time
 from typing import Any, Dict, List, Optional
 
+from drun.engine.http import stream_event_text
 from drun.loader.yaml_loader import format_variables_multiline
 from drun.models.report import StepResult
-from drun.models.retry import get_retry_max, get_retry_every
+from drun.models.retry import get_retry_config
 from drun.models.step import Step
+from drun.runner.effects import Blocking, Flow, Pause, SendRequest, drive
 from drun.runner.execution_context import ExecutionContext
 from drun.runner.protocols import RunnerProtocol
 from drun.runner.request_projection import (
     finalize_request_projection,
     render_request_for_setup,
 )
-from drun.runner.retry import parse_duration, sleep_every
+from drun.runner.retry import RetryBackoff
 from drun.runner.step_outcome import StepOutcomeContext, process_step_outcome
 from drun.utils.mask import mask_body, mask_headers
 
@@ -46,19 +54,22 @@ class StepLifecycle:
         self.runner = runner
 
     def execute(self, context: StepLifecycleContext) -> StepLifecycleResult:
+        return drive(self.flow(context))
+
+    def flow(self, context: StepLifecycleContext) -> Flow:
         if context.step.sleep is not None:
-            return self._execute_sleep_step(context)
+            return (yield from self._sleep_step_flow(context))
         if context.step.request is not None:
-            return self._execute_request_step(context)
+            return (yield from self._request_step_flow(context))
         if context.step.invoke is not None:
-            return self._execute_invoke_step(context)
+            return (yield from self._invoke_step_flow(context))
         raise NotImplementedError(
             "StepLifecycle currently supports sleep, request, and invoke steps only."
         )
 
     # ── Sleep step (no retry) ─────────────────────────────────────
 
-    def _execute_sleep_step(self, context: StepLifecycleContext) -> StepLifecycleResult:
+    def _sleep_step_flow(self, context: StepLifecycleContext) -> Flow:
         step = context.step
         runner = self.runner
         last_response: Dict[str, Any] | None = None
@@ -185,7 +196,7 @@ class StepLifecycle:
 
         sleep_started = time.perf_counter()
         try:
-            time.sleep(sleep_ms / 1000.0)
+            yield Pause(sleep_ms / 1000.0)
             elapsed_ms = (time.perf_counter() - sleep_started) * 1000.0
         except Exception as e:
             if runner.log:
@@ -262,7 +273,7 @@ class StepLifecycle:
 
     # ── Request step (with retry) ──────────────────────────────────
 
-    def _execute_request_step(self, context: StepLifecycleContext) -> StepLifecycleResult:
+    def _request_step_flow(self, context: StepLifecycleContext) -> Flow:
         step = context.step
         runner = self.runner
         client = context.client
@@ -275,8 +286,9 @@ class StepLifecycle:
             step, context.ctx.get_merged(context.global_vars), context
         )
 
-        retry_max = get_retry_max(step.retry)
-        retry_every = get_retry_every(step.retry)
+        retry_config = get_retry_config(step.retry)
+        retry_max = retry_config.max
+        backoff = RetryBackoff(retry_config)
 
         # --- skip decision (once) ---
         try:
@@ -411,14 +423,18 @@ class StepLifecycle:
             )
 
             # --- HTTP request ---
+            send_request = req_rendered_attempt
+            if step.response and step.response.max_memory_bytes is not None:
+                send_request = {**req_rendered_attempt, "max_memory_bytes": step.response.max_memory_bytes}
             try:
-                resp_obj = client.request(req_rendered_attempt)
+                resp_obj = yield SendRequest(client, send_request)
             except Exception as e:
                 if runner.log:
                     runner.log.warning(
                         f"[RETRY] Request error attempt {attempt}/{retry_max}: {e}"
                     )
-                if attempt >= retry_max:
+                delay = self._next_retry_delay(backoff, attempt, retry_max)
+                if delay is None:
                     # last attempt exhausted
                     sr = self._build_request_error_result(
                         request_projection=request_projection,
@@ -430,7 +446,7 @@ class StepLifecycle:
                     )
                     final_sr = sr
                     break
-                sleep_every(retry_every, attempt)
+                yield Pause(delay)
                 continue
 
             last_response = resp_obj
@@ -473,6 +489,7 @@ class StepLifecycle:
                     checks=outcome.checks,
                     extracts=outcome.extracts,
                     duration_ms=resp_obj.get("elapsed_ms") or 0.0,
+                    timing=resp_obj.get("timing"),
                     error=outcome.error,
                 )
                 final_sr = sr
@@ -488,7 +505,8 @@ class StepLifecycle:
                 runner.log.warning(
                     f"[RETRY] Check failed attempt {attempt}/{retry_max}"
                 )
-            if attempt >= retry_max:
+            delay = self._next_retry_delay(backoff, attempt, retry_max, resp_obj)
+            if delay is None:
                 sr = StepResult(
                     name=rendered_step_name,
                     origin_step_name=iteration_step_name,
@@ -501,6 +519,7 @@ class StepLifecycle:
                     checks=outcome.checks,
                     extracts=outcome.extracts,
                     duration_ms=resp_obj.get("elapsed_ms") or 0.0,
+                    timing=resp_obj.get("timing"),
                     error=outcome.error,
                 )
                 final_sr = sr
@@ -509,7 +528,7 @@ class StepLifecycle:
                         f"[STEP] Step {context.step_idx} Completed: {rendered_step_name} | FAILED"
                     )
                 break
-            sleep_every(retry_every, attempt)
+            yield Pause(delay)
 
         # --- teardown hooks (once) ---
         if final_sr is None:
@@ -522,6 +541,8 @@ class StepLifecycle:
                 status="failed",
                 error="step did not produce a result",
             )
+        if backoff.retries:
+            final_sr.retry_wait_ms = round(backoff.waited * 1000.0, 3)
 
         td_vars = teardown_variables_final or context.ctx.get_merged(context.global_vars)
         teardown_meta: Dict[str, Any] = {
@@ -556,7 +577,7 @@ class StepLifecycle:
 
     # ── Invoke step (with retry) ───────────────────────────────────
 
-    def _execute_invoke_step(self, context: StepLifecycleContext) -> StepLifecycleResult:
+    def _invoke_step_flow(self, context: StepLifecycleContext) -> Flow:
         step = context.step
         runner = self.runner
 
@@ -564,8 +585,9 @@ class StepLifecycle:
             step, context.ctx.get_merged(context.global_vars), context
         )
 
-        retry_max = get_retry_max(step.retry)
-        retry_every = get_retry_every(step.retry)
+        retry_config = get_retry_config(step.retry)
+        retry_max = retry_config.max
+        backoff = RetryBackoff(retry_config)
 
         # --- skip decision (once) ---
         try:
@@ -621,17 +643,20 @@ class StepLifecycle:
             if runner.log:
                 runner.log.info(f"[STEP] Step {context.step_idx} Start: {rendered_step_name}")
 
-            invoke_results = runner._run_invoke_step(
-                step=step,
-                step_idx=context.step_idx,
-                rendered_step_name=rendered_step_name,
-                variables=attempt_vars,
-                global_vars=context.global_vars,
-                funcs=context.funcs,
-                envmap=context.envmap,
-                ctx=context.ctx,
-                params=context.params,
-                source=context.source,
+            invoke_results = yield Blocking(
+                partial(
+                    runner._run_invoke_step,
+                    step=step,
+                    step_idx=context.step_idx,
+                    rendered_step_name=rendered_step_name,
+                    variables=attempt_vars,
+                    global_vars=context.global_vars,
+                    funcs=context.funcs,
+                    envmap=context.envmap,
+                    ctx=context.ctx,
+                    params=context.params,
+                    source=context.source,
+                )
             )
 
             any_failed = any(r.status == "failed" for r in invoke_results)
@@ -643,7 +668,8 @@ class StepLifecycle:
                         f"[STEP] Step {context.step_idx} Completed: {rendered_step_name} | PASSED"
                     )
                 break
-            if attempt >= retry_max:
+            delay = self._next_retry_delay(backoff, attempt, retry_max)
+            if delay is None:
                 all_invoke_results = invoke_results
                 if runner.log:
                     runner.log.error(
@@ -654,12 +680,32 @@ class StepLifecycle:
                 runner.log.warning(
                     f"[RETRY] Invoke failed attempt {attempt}/{retry_max}"
                 )
-            sleep_every(retry_every, attempt)
+            yield Pause(delay)
 
         return StepLifecycleResult(results=all_invoke_results)
 
     # ── Helpers ────────────────────────────────────────────────────
 
+    def _next_retry_delay(
+        self,
+        backoff: RetryBackoff,
+        attempt: int,
+        retry_max: int,
+        response: Dict[str, Any] | None = None,
+    ) -> float | None:
+        """Pause before the next attempt, or ``None`` when this attempt is the last."""
+        if attempt >= retry_max:
+            return None
+        delay = backoff.next_delay(response)
+        if self.runner.log:
+            if delay is None:
+                self.runner.log.warning(
+                    f"[RETRY] Wait budget {backoff.config.budget} exhausted after {backoff.waited:.3f}s"
+                )
+            elif delay > 0:
+                self.runner.log.info(f"[RETRY] Waiting {delay:.3f}s before attempt {attempt + 1}/{retry_max}")
+        return delay
+
     def _log_request_start(
         self,
         *,
@@ -711,6 +757,10 @@ class StepLifecycle:
         runner = self.runner
         if not runner.log:
             return
+        is_enabled = getattr(runner.log, "isEnabledFor", None)
+        if is_enabled is not None and not is_enabled(logging.INFO):
+            # Do not decode a lazy body just to drop the preview.
+            return
         hdrs = resp_obj.get("headers") or {}
         if not runner.reveal:
             hdrs = mask_headers(hdrs)
@@ -734,39 +784,34 @@ class StepLifecycle:
 
         if is_stream:
             stream_events = resp_obj.get("stream_events", [])
-            progressive_content = resp_obj.get("progressive_content", [])
+            stream_content = resp_obj.get("stream_content")
+            event_count = (resp_obj.get("stream_summary") or {}).get("event_count", len(stream_events))
 
-            if stream_events:
-                runner.log.info(f"[STREAM] {len(stream_events)} events received")
+            if event_count:
+                runner.log.info(f"[STREAM] {event_count} events received")
+                if len(stream_events) < event_count:
+                    runner.log.info(f"[STREAM] {len(stream_events)} events retained (request.stream_keep)")
 
-                if progressive_content:
+                if stream_content:
                     chunk_num = 0
                     for event in stream_events:
-                        event_data = event.get("data")
-                        if event_data and isinstance(event_data, dict):
-                            choices = event_data.get("choices", [])
-                            if choices and len(choices) > 0:
-                                delta = choices[0].get("delta", {})
-                                if delta.get("content"):
-                                    chunk_num += 1
-                                    runner.log.info(
-                                        runner._fmt_aligned(
-                                            "STREAM", f"Chunk {chunk_num}", runner._fmt_json(event)
-                                        )
-                                    )
-
-                    if progressive_content:
-                        final_chunk = progressive_content[-1]
-                        final_content = final_chunk.get("content", "")
-                        final_time = final_chunk.get("timestamp_ms", 0)
-                        runner.log.info(f"[STREAM] 完成 ({final_time:.0f}ms)，最终内容：")
-                        runner.log.info(final_content)
+                        if stream_event_text(event.get("data")):
+                            chunk_num += 1
+                            runner.log.info(
+                                runner._fmt_aligned(
+                                    "STREAM", f"Chunk {chunk_num}", runner._fmt_json(event)
+                                )
+                            )
+
+                    final_time = (resp_obj.get("stream_summary") or {}).get("last_chunk_ms", 0)
+                    runner.log.info(f"[STREAM] 完成 ({final_time:.0f}ms)，最终内容：")
+                    runner.log.info(stream_content)
                 else:
                     if len(stream_events) > 0:
                         first_event = stream_events[0]
                         runner.log.info(
                             runner._fmt_aligned(
-                                "STREAM", "event[0]", runner._fmt_json(first_event)
+                                "STREAM", f"event[{first_event.get('index', 0)}]", runner._fmt_json(first_event)
                             )
                         )
                     if len(stream_events) > 1:
@@ -774,7 +819,7 @@ class StepLifecycle:
                         runner.log.info(
                             runner._fmt_aligned(
                                 "STREAM",
-                                f"event[{len(stream_events)-1}]",
+                                f"event[{last_event.get('index', len(stream_events) - 1)}]",
                                 runner._fmt_json(last_event),
                             )
                         )
@@ -34,6 +34,8 @@ class StepOutcome:
 def process_step_outcome(*, runner: RunnerProtocol, context: StepOutcomeContext) -> StepOutcome:
     step = context.step
     resp_obj = context.resp_obj
+    # One walk over the body for every plain path the step reads.
+    resolved = runner._resolve_paths(_step_paths(step), resp_obj)
 
     extracts = _extract_response_values(
         runner=runner,
@@ -41,6 +43,7 @@ def process_step_outcome(*, runner: RunnerProtocol, context: StepOutcomeContext)
         resp_obj=resp_obj,
         variables=context.variables,
         context=context,
+        resolved=resolved,
     )
     _persist_extracts(runner=runner, extracts=extracts, context=context)
 
@@ -74,6 +77,7 @@ def process_step_outcome(*, runner: RunnerProtocol, context: StepOutcomeContext)
         funcs=context.funcs,
         envmap=context.envmap,
         resp_obj=resp_obj,
+        resolved=resolved,
     )
     if save_error:
         step_failed = True
@@ -89,6 +93,20 @@ def process_step_outcome(*, runner: RunnerProtocol, context: StepOutcomeContext)
     )
 
 
+_JPATH_PATTERN = re.compile(r'\$\.[\w\[\]\.]+(?:\[\d+\])*(?:\.[\w\[\]]+)*')
+
+
+def _step_paths(step: Step) -> List[str]:
+    paths: List[str] = []
+    for expr in (step.extract or {}).values():
+        if isinstance(expr, str):
+            paths.extend(_JPATH_PATTERN.findall(expr) if "${" in expr else [expr])
+    for check in step.checks:
+        if isinstance(check.check, str):
+            paths.append(check.check)
+    return paths
+
+
 def _extract_response_values(
     *,
     runner: RunnerProtocol,
@@ -96,22 +114,25 @@ def _extract_response_values(
     resp_obj: Dict[str, Any],
     variables: Dict[str, Any],
     context: StepOutcomeContext,
+    resolved: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
+    resolved = resolved or {}
     extracts: Dict[str, Any] = {}
     for var, expr in (step.extract or {}).items():
         if isinstance(expr, str) and "${" in expr:
-            jpath_pattern = r'\$\.[\w\[\]\.]+(?:\[\d+\])*(?:\.[\w\[\]]+)*'
-            jpaths = re.findall(jpath_pattern, expr)
+            jpaths = _JPATH_PATTERN.findall(expr)
             temp_vars = dict(variables)
             temp_expr = expr
             for idx, jp in enumerate(jpaths):
-                extracted = runner._eval_extract(jp, resp_obj)
+                extracted = resolved[jp] if jp in resolved else runner._eval_extract(jp, resp_obj)
                 temp_var_name = f"_jpath_{idx}"
                 temp_vars[temp_var_name] = extracted
                 temp_expr = temp_expr.replace(jp, temp_var_name)
             val = runner.templater.render_expression(
                 temp_expr, temp_vars, context.funcs, context.envmap
             )
+        elif isinstance(expr, str) and expr in resolved:
+            val = resolved[expr]
         else:
             val = runner._eval_extract(expr, resp_obj)
         extracts[var] = val
@@ -138,6 +159,9 @@ def _persist_extracts(
             context.envmap[env_key] = value
             context.envmap[var_name] = value
 
+    if not runner.persist_env_file:
+        return
+
     from drun.utils.env_writer import write_env_variable, write_yaml_variable
 
     env_path = Path(runner.persist_env_file)
@@ -0,0 +1,213 @@
+"""Work queue and HTTP API for distributed runs (``drun r -distribute``).
+
+The coordinator owns the list of case instances; ``drun d`` workers pull
+batches from it, so faster nodes simply come back for more.  Every batch is
+a lease: a worker heartbeats while it runs the batch and posts the results
+when done.  A lease that is not renewed within ``lease_timeout`` seconds is
+considered lost and its unfinished instances go back to the front of the
+queue for the next worker.  Results are keyed by job index and the first one
+wins, so a slow worker whose lease already expired cannot double-count; only
+the instances of a lease the coordinator issued are accepted.
+
+Set ``DRUN_DIST_TOKEN`` on the coordinator and every worker to require a
+shared token (``X-Drun-Token`` header).  The session carries the run's
+variables and environment, so ``drun r -distribute`` refuses to listen on a
+non-loopback address without one.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import hmac
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from fastapi import FastAPI, Header, HTTPException
+from pydantic import BaseModel, Field
+
+
+TOKEN_ENV = "DRUN_DIST_TOKEN"
+TOKEN_HEADER = "X-Drun-Token"
+
+
+@dataclass
+class Lease:
+    worker: str
+    indexes: List[int]
+    expires_at: float
+
+
+class UnknownLeaseError(LookupError):
+    """Raised when results are posted for a lease that was never issued."""
+
+
+class WorkQueue:
+    def __init__(
+        self,
+        jobs: List[Dict[str, Any]],
+        *,
+        lease_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        on_result: Callable[[int, Dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.jobs = {job["index"]: job for job in jobs}
+        self.lease_timeout = lease_timeout
+        self.clock = clock
+        self.on_result = on_result
+        self.pending: Deque[int] = deque(job["index"] for job in jobs)
+        self.leases: Dict[str, Lease] = {}
+        # Every lease ever issued (job indexes), so late results still count.
+        self.issued: Dict[str, frozenset[int]] = {}
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.stopped = False
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        with self._cond:
+            return self._done_locked()
+
+    def _done_locked(self) -> bool:
+        if len(self.results) >= len(self.jobs):
+            return True
+        return self.stopped and not self.leases
+
+    def lease(self, worker: str, max_items: int) -> tuple[Optional[str], List[Dict[str, Any]]]:
+        with self._cond:
+            self._reclaim_expired_locked()
+            if self.stopped:
+                return None, []
+            indexes: List[int] = []
+            while self.pending and len(indexes) < max(max_items, 1):
+                index = self.pending.popleft()
+                if index not in self.results:
+                    indexes.append(index)
+            if not indexes:
+                return None, []
+            lease_id = uuid.uuid4().hex
+            self.leases[lease_id] = Lease(worker, indexes, self.clock() + self.lease_timeout)
+            self.issued[lease_id] = frozenset(indexes)
+            return lease_id, [self.jobs[index] for index in indexes]
+
+    def heartbeat(self, lease_id: str) -> bool:
+        with self._cond:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return False
+            lease.expires_at = self.clock() + self.lease_timeout
+            return True
+
+    def complete(self, lease_id: str, results: Dict[int, Dict[str, Any]]) -> int:
+        """Record results; returns how many were new.
+
+        Raises :class:`UnknownLeaseError` for a lease id this queue never
+        issued; results for instances outside the lease are ignored.
+        """
+        accepted: List[int] = []
+        with self._cond:
+            allowed = self.issued.get(lease_id)
+            if allowed is None:
+                raise UnknownLeaseError(lease_id)
+            lease = self.leases.pop(lease_id, None)
+            for index, result in results.items():
+                if index in allowed and index not in self.results:
+                    self.results[index] = result
+                    accepted.append(index)
+            if lease is not None:
+                # Anything the worker did not report goes back to the queue.
+                missing = [i for i in lease.indexes if i not in self.results]
+                self.pending.extendleft(reversed(missing))
+            self._cond.notify_all()
+        for index in accepted:
+            if self.on_result is not None:
+                self.on_result(index, self.results[index])
+        return len(accepted)
+
+    def stop(self) -> None:
+        """Stop handing out work (``-failfast``); leased batches may still report."""
+        with self._cond:
+            self.stopped = True
+            self.pending.clear()
+            self._cond.notify_all()
+
+    def wait(self, poll: float = 1.0) -> None:
+        with self._cond:
+            while not self._done_locked():
+                self._reclaim_expired_locked()
+                self._cond.wait(timeout=poll)
+
+    def _reclaim_expired_locked(self) -> None:
+        now = self.clock()
+        expired = [lease_id for lease_id, lease in self.leases.items() if lease.expires_at <= now]
+        for lease_id in expired:
+            lease = self.leases.pop(lease_id)
+            if not self.stopped:
+                missing = [i for i in lease.indexes if i not in self.results]
+                self.pending.extendleft(reversed(missing))
+        if expired:
+            self._cond.notify_all()
+
+
+class LeaseRequest(BaseModel):
+    worker: str
+    max: int = Field(1, ge=1)
+
+
+class HeartbeatRequest(BaseModel):
+    lease_id: str
+
+
+class CompleteRequest(BaseModel):
+    lease_id: str
+    results: Dict[int, Dict[str, Any]] = Field(default_factory=dict)
+
+
+def create_coordinator_app(
+    queue: WorkQueue,
+    session: Dict[str, Any],
+    *,
+    token: str | None = None,
+    retry_after: float = 0.5,
+) -> FastAPI:
+    token = token if token is not None else os.environ.get(TOKEN_ENV) or None
+    app = FastAPI(title="Drun Coordinator")
+
+    def _authorize(value: str | None) -> None:
+        if token and not hmac.compare_digest(value or "", token):
+            raise HTTPException(status_code=401, detail="Invalid or missing coordinator token")
+
+    @app.get("/dist/session")
+    def get_session(x_drun_token: Optional[str] = Header(None)):
+        _authorize(x_drun_token)
+        return session
+
+    @app.post("/dist/lease")
+    def lease(body: LeaseRequest, x_drun_token: Optional[str] = Header(None)):
+        _authorize(x_drun_token)
+        lease_id, jobs = queue.lease(body.worker, body.max)
+        return {
+            "lease_id": lease_id,
+            "jobs": jobs,
+            "done": lease_id is None and queue.done,
+            "retry_after": retry_after,
+        }
+
+    @app.post("/dist/heartbeat")
+    def heartbeat(body: HeartbeatRequest, x_drun_token: Optional[str] = Header(None)):
+        _authorize(x_drun_token)
+        return {"active": queue.heartbeat(body.lease_id)}
+
+    @app.post("/dist/complete")
+    def complete(body: CompleteRequest, x_drun_token: Optional[str] = Header(None)):
+        _authorize(x_drun_token)
+        try:
+            accepted = queue.complete(body.lease_id, body.results)
+        except UnknownLeaseError:
+            raise HTTPException(status_code=409, detail="Unknown lease id")
+        return {"accepted": accepted}
+
+    return app
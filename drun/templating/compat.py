@@ -19,11 +19,14 @@ _RESERVED_SYSTEM_VARS = {
     "stream_events",
     "stream_summary",
     "stream_raw_chunks",
+    "stream_content",
     # Response variables used in checks
     "content_type",
     "body_size",
     "raw_bytes",
     "body_bytes_b64",
+    "body_sha256",
+    "timing",
 }
 
 
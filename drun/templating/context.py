@@ -1,40 +1,85 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 
 class VarContext:
     """Layered variables with simple precedence.
 
     Precedence (low -> high when merging): env_file < case.config.variables < case.config.parameters < step.variables < CLI overrides
+
+    ``get_merged`` is cached per ``version``; every write through this class
+    bumps it.  The returned dict is shared between calls, so treat it as
+    read-only and copy it before handing it to code that may modify it.
     """
 
     def __init__(self, base: Dict[str, Any] | None = None) -> None:
         self.stack: List[Dict[str, Any]] = [base or {}]
+        self.base_writes: List[Tuple[str, Any]] | None = None
+        self.version = 0
+        self._merged: Dict[str, Any] | None = None
+        self._merged_version = -1
+        # (version, overrides) the cached view was built from; overrides are
+        # the run's CLI variables and are matched by identity.
+        self._view: Dict[str, Any] | None = None
+        self._view_key: Tuple[int, Any] | None = None
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def fork(self) -> "VarContext":
+        """Copy the layers for a step that runs alongside others.
+
+        Base-layer writes on the fork are recorded in ``base_writes`` so the
+        caller can replay them onto this context in step order.
+        """
+        child = VarContext(dict(self.stack[0]))
+        child.stack.extend(dict(layer) for layer in self.stack[1:])
+        child.base_writes = []
+        return child
 
     def push(self, layer: Dict[str, Any] | None) -> None:
         self.stack.append(layer or {})
+        if layer:
+            self._changed()
 
     def pop(self) -> None:
         if len(self.stack) > 1:
-            self.stack.pop()
+            if self.stack.pop():
+                self._changed()
 
     def set(self, key: str, value: Any) -> None:
         self.stack[-1][key] = value
+        self._changed()
 
     def set_base(self, key: str, value: Any) -> None:
         """Set a variable in the base layer (stack[0]) so it persists across steps.
         Used for extracted variables that should be available to all subsequent steps."""
         self.stack[0][key] = value
+        self._changed()
+        if self.base_writes is not None:
+            self.base_writes.append((key, value))
 
     def set_many(self, data: Dict[str, Any]) -> None:
         for k, v in (data or {}).items():
             self.set(k, v)
 
     def get_merged(self, overrides: Dict[str, Any] | None = None) -> Dict[str, Any]:
-        merged: Dict[str, Any] = {}
-        for layer in self.stack:
-            merged.update(layer)
-        if overrides:
-            merged.update(overrides)
-        return merged
+        if self._view is not None and self._view_key is not None:
+            version, cached_overrides = self._view_key
+            if version == self.version and cached_overrides is overrides:
+                return self._view
+        merged = self._merged_layers()
+        view = {**merged, **overrides} if overrides else merged
+        self._view = view
+        self._view_key = (self.version, overrides)
+        return view
+
+    def _merged_layers(self) -> Dict[str, Any]:
+        if self._merged is None or self._merged_version != self.version:
+            merged: Dict[str, Any] = {}
+            for layer in self.stack:
+                merged.update(layer)
+            self._merged = merged
+            self._merged_version = self.version
+        return self._merged
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Callable, Iterable, List, Optional, Set
+from collections import ChainMap
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Callable, List, Mapping, Optional, Set, Tuple
 import re
 import ast
 import operator as op
 import os
 import json
+import logging
 
 from .builtins import BUILTINS
 from .compat import normalize_simple_tokens, strip_escaped_template_quotes
 
 
+logger = logging.getLogger(__name__)
+
+
 class UnresolvedVarError(Exception):
     """Raised when template variables cannot be resolved."""
 
@@ -88,6 +95,11 @@ def _try_parse_json(value: Any) -> Any:
 
 
 _EXPRESSION_VAR_PATTERN = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+_TEMPLATE_TOKEN_PATTERN = re.compile(r"\$\{([^{}]+)\}")
+
+# Parsed expressions and tokenized templates are pure functions of their
+# text, so they are cached per process and shared by every case instance.
+_TEMPLATE_CACHE_SIZE = 4096
 
 
 _ALLOWED_BINOPS = {
@@ -110,7 +122,7 @@ _ALLOWED_CMPOPS = {
 }
 
 
-def _safe_eval(node: ast.AST, ctx: Dict[str, Any]) -> Any:
+def _safe_eval(node: ast.AST, ctx: Mapping[str, Any]) -> Any:
     # Security design note:
     # The template engine evaluates expressions written by the YAML author
     # (not untrusted end-user input).  The `ctx` dict contains only safe
@@ -200,47 +212,88 @@ def _prepare_expression(text: str) -> str:
     return _EXPRESSION_VAR_PATTERN.sub(r"\1", expr)
 
 
-def _evaluate_expression(text: str, ctx: Dict[str, Any]) -> Any:
-    node = ast.parse(_prepare_expression(text), mode="eval")
-    return _safe_eval(node, ctx)
+@dataclass(frozen=True)
+class _CompiledExpression:
+    node: ast.Expression | None
+    # Free variable names in first-seen order, without ENV(NAME) literals.
+    names: Tuple[str, ...] = ()
+    syntax_error: Tuple[Any, ...] | None = None
 
+    def tree(self) -> ast.Expression:
+        if self.node is None:
+            # A fresh exception each time so cached state never grows a traceback.
+            raise SyntaxError(*(self.syntax_error or ("invalid syntax",)))
+        return self.node
 
-def _iter_missing_names(node: ast.AST, ctx: Dict[str, Any]) -> Iterable[str]:
-    seen: Set[str] = set()
+
+@lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _compile_expression(text: str) -> _CompiledExpression:
+    try:
+        node = ast.parse(_prepare_expression(text), mode="eval")
+    except SyntaxError as exc:
+        return _CompiledExpression(node=None, syntax_error=exc.args)
+    return _CompiledExpression(node=node, names=_free_names(node))
+
+
+def _free_names(node: ast.AST) -> Tuple[str, ...]:
+    env_literals: Set[int] = set()
+    for parent in ast.walk(node):
+        if (
+            isinstance(parent, ast.Call)
+            and isinstance(parent.func, ast.Name)
+            and parent.func.id == "ENV"
+            and parent.args
+            and isinstance(parent.args[0], ast.Name)
+        ):
+            env_literals.add(id(parent.args[0]))
+    names: List[str] = []
     for child in ast.walk(node):
-        if not isinstance(child, ast.Name):
-            continue
-        if isinstance(child.ctx, ast.Store):
-            continue
-        if child.id in ctx:
+        if not isinstance(child, ast.Name) or isinstance(child.ctx, ast.Store):
             continue
-        parent_env_arg = False
-        for parent in ast.walk(node):
-            if not isinstance(parent, ast.Call):
-                continue
-            if not (isinstance(parent.func, ast.Name) and parent.func.id == "ENV"):
-                continue
-            for idx, arg in enumerate(parent.args):
-                if idx == 0 and arg is child:
-                    parent_env_arg = True
-                    break
-            if parent_env_arg:
-                break
-        if parent_env_arg:
+        if id(child) in env_literals or child.id in names:
             continue
-        if child.id not in seen:
-            seen.add(child.id)
-            yield child.id
+        names.append(child.id)
+    return tuple(names)
 
 
-def _analyze_expression(text: str, ctx: Dict[str, Any]) -> tuple[list[str], Exception | None]:
+@lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _tokenize_template(text: str) -> Tuple[Tuple[bool, str], ...]:
+    """Split *text* into ``(is_expression, text)`` segments around ``${...}``."""
+    segments: List[Tuple[bool, str]] = []
+    last = 0
+    for m in _TEMPLATE_TOKEN_PATTERN.finditer(text):
+        if m.start() > last:
+            segments.append((False, text[last:m.start()]))
+        segments.append((True, m.group(1).strip()))
+        last = m.end()
+    if last < len(text):
+        segments.append((False, text[last:]))
+    return tuple(segments)
+
+
+_strip_template_quotes = lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)(strip_escaped_template_quotes)
+_normalize_tokens = lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)(normalize_simple_tokens)
+
+
+@lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def is_template_text(text: str) -> bool:
+    """Whether rendering *text* can yield anything other than *text* itself."""
+    return "${" in _normalize_tokens(_strip_template_quotes(text))
+
+
+def _evaluate_expression(text: str, ctx: Mapping[str, Any]) -> Any:
+    return _safe_eval(_compile_expression(text).tree(), ctx)
+
+
+def _analyze_expression(text: str, ctx: Mapping[str, Any]) -> tuple[list[str], Exception | None]:
     expr_text = text if text.startswith("${") else f"${{{text}}}"
+    compiled = _compile_expression(expr_text)
     try:
-        node = ast.parse(_prepare_expression(expr_text), mode="eval")
+        node = compiled.tree()
     except SyntaxError as exc:
         return [], exc
 
-    missing = list(_iter_missing_names(node, ctx))
+    missing = [name for name in compiled.names if name not in ctx]
     if missing:
         return missing, None
 
@@ -251,23 +304,20 @@ def _analyze_expression(text: str, ctx: Dict[str, Any]) -> tuple[list[str], Exce
     return [], None
 
 
-def _render_text_without_jinja(text: str, ctx: Dict[str, Any]) -> str:
+def _render_text_without_jinja(text: str, ctx: Mapping[str, Any]) -> str:
     # Only process ${...} tokens; leave any other braces untouched
     out: list[str] = []
-    last = 0
-    for m in re.finditer(r"\$\{([^{}]+)\}", text):
-        out.append(text[last:m.start()])
-        expr = m.group(1).strip()
+    for is_expr, segment in _tokenize_template(text):
+        if not is_expr:
+            out.append(segment)
+            continue
         try:
-            val = _evaluate_expression(expr, ctx)
+            val = _evaluate_expression(segment, ctx)
         except Exception:
             # Preserve unresolved variables instead of replacing with empty string
-            out.append(f"${{{expr}}}")
-            last = m.end()
+            out.append(f"${{{segment}}}")
             continue
         out.append("" if val is None else str(val))
-        last = m.end()
-    out.append(text[last:])
     return "".join(out)
 
 
@@ -282,7 +332,11 @@ class TemplateEngine:
         functions: Dict[str, Any] | None = None,
         envmap: Dict[str, Any] | None = None,
         extra_ctx: Dict[str, Any] | None = None,
-    ) -> Dict[str, Any]:
+    ) -> ChainMap:
+        """Layered view over the inputs; nothing is copied.
+
+        Lookup order: extra_ctx, variables, functions, ENV, builtins.
+        """
         def ENV(name: str, default: Any = None) -> Any:  # noqa: N802 - uppercase by design
             if envmap is not None and name in envmap:
                 value = envmap.get(name)
@@ -291,17 +345,17 @@ class TemplateEngine:
             return _try_parse_json(value)
 
         dyn_funcs: Dict[str, Callable[..., Any]] = {"ENV": ENV}
-        return {
-            **BUILTINS,
-            **dyn_funcs,
-            **(functions or {}),
-            **(variables or {}),
-            **(extra_ctx or {}),
-        }
+        return ChainMap(
+            extra_ctx or {},
+            variables if variables is not None else {},
+            functions or {},
+            dyn_funcs,
+            BUILTINS,
+        )
 
     def _extract_template_tokens(self, text: str) -> List[str]:
         """Extract all ${...} template expressions from text."""
-        return [m.group(1).strip() for m in re.finditer(r"\$\{([^{}]+)\}", text)]
+        return [segment for is_expr, segment in _tokenize_template(text) if is_expr]
 
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """Calculate edit distance between two strings."""
@@ -320,7 +374,7 @@ class TemplateEngine:
             previous_row = current_row
         return previous_row[-1]
 
-    def _find_similar_vars(self, unknown: str, context: Dict[str, Any], max_distance: int = 2) -> List[str]:
+    def _find_similar_vars(self, unknown: str, context: Mapping[str, Any], max_distance: int = 2) -> List[str]:
         """Find variable names similar to unknown using edit distance."""
         available = list(context.keys())
         similar = []
@@ -337,14 +391,20 @@ class TemplateEngine:
         envmap: Dict[str, Any] | None = None,
         strict: bool = False,
     ) -> Any:
-        import logging
-
-        logger = logging.getLogger(__name__)
+        if isinstance(value, str) and ("$" not in value or not is_template_text(value)):
+            return value
+        if not isinstance(value, (str, dict, list)):
+            return value
+        # One context per call; the recursion below shares it.
+        ctx = self._build_context(variables, functions, envmap)
+        return self._render_in_context(value, ctx, strict)
 
+    def _render_in_context(self, value: Any, ctx: ChainMap, strict: bool) -> Any:
         if isinstance(value, str):
+            if "$" not in value or not is_template_text(value):
+                return value
             try:
-                text = strip_escaped_template_quotes(value)
-                ctx = self._build_context(variables, functions, envmap)
+                text = _strip_template_quotes(value)
 
                 # Optimization: Try to evaluate as a single expression directly first
                 # This handles ${func($var)} correctly by avoiding string interpolation
@@ -367,11 +427,11 @@ class TemplateEngine:
                         # Fall through to standard string interpolation if direct eval fails
                         pass
 
-                text = normalize_simple_tokens(text)
+                text = _normalize_tokens(text)
 
                 cur = text
                 for _ in range(5):
-                    single_token_match = re.fullmatch(r"\$\{([^{}]+)\}", cur)
+                    single_token_match = _TEMPLATE_TOKEN_PATTERN.fullmatch(cur)
                     if single_token_match:
                         try:
                             return _evaluate_expression(cur, ctx)
@@ -421,12 +481,47 @@ class TemplateEngine:
                     raise
                 return value
         elif isinstance(value, dict):
-            return {k: self.render_value(v, variables, functions, envmap, strict=strict) for k, v in value.items()}
+            return {k: self._render_in_context(v, ctx, strict) for k, v in value.items()}
         elif isinstance(value, list):
-            return [self.render_value(v, variables, functions, envmap, strict=strict) for v in value]
+            return [self._render_in_context(v, ctx, strict) for v in value]
         else:
             return value
 
+    def render_planned(
+        self,
+        value: Any,
+        plan: Any,
+        variables: Dict[str, Any],
+        functions: Dict[str, Any] | None = None,
+        envmap: Dict[str, Any] | None = None,
+        strict: bool = False,
+    ) -> Any:
+        """Render *value* following a plan from ``drun.templating.plan.compile_plan``.
+
+        Only the dynamic paths are rendered; containers along them are
+        shallow-copied and static subtrees are shared with *value*.  The
+        top-level container is always a fresh copy, so callers may add or
+        replace its keys without touching the template.
+        """
+        if plan is None:
+            if isinstance(value, dict):
+                return dict(value)
+            if isinstance(value, list):
+                return list(value)
+            return value
+        ctx = self._build_context(variables, functions, envmap)
+        return self._render_plan_node(value, plan, ctx, strict)
+
+    def _render_plan_node(self, value: Any, plan: Any, ctx: ChainMap, strict: bool) -> Any:
+        if plan is None:
+            return value
+        if plan is True:
+            return self._render_in_context(value, ctx, strict)
+        out = dict(value) if isinstance(value, dict) else list(value)
+        for key, child in plan.items():
+            out[key] = self._render_plan_node(value[key], child, ctx, strict)
+        return out
+
     def render_expression(self, expr: str, variables: Dict[str, Any], functions: Dict[str, Any] | None = None, envmap: Dict[str, Any] | None = None, extra_ctx: Dict[str, Any] | None = None) -> Any:
         value = self.eval_expr(expr, variables, functions, envmap, extra_ctx=extra_ctx)
         if value is not None:
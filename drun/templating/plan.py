@@ -0,0 +1,95 @@
+"""Precompiled render plans for case templates.
+
+Most of a step never changes between renders: the method, fixed headers,
+literal request bodies, the ``expect`` side of checks.  ``compile_plan``
+walks a value once and records only the paths that hold templates, so
+``TemplateEngine.render_planned`` renders those paths and reuses every
+constant subtree as-is instead of rebuilding the whole tree per request.
+
+A plan node is ``None`` (static), ``True`` (render this value) or a dict
+mapping keys / list indexes to child nodes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Union
+
+from .engine import is_template_text
+
+if TYPE_CHECKING:
+    from drun.models.case import Case
+    from drun.models.checks import Check
+    from drun.models.step import Step
+
+
+PlanNode = Union[None, bool, Dict[Any, Any]]
+
+
+def compile_plan(value: Any) -> PlanNode:
+    if isinstance(value, str):
+        return True if "$" in value and is_template_text(value) else None
+    if isinstance(value, dict):
+        items: Iterable[Any] = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return None
+    children: Dict[Any, Any] = {}
+    for key, item in items:
+        child = compile_plan(item)
+        if child is not None:
+            children[key] = child
+    return children or None
+
+
+@dataclass(frozen=True)
+class StepRenderPlan:
+    # ``step.request.model_dump(exclude_none=True)``; treat as read-only.
+    request: Dict[str, Any] | None
+    request_plan: PlanNode
+    variables_plan: PlanNode
+
+
+@dataclass(frozen=True)
+class CheckRenderPlan:
+    expect_plan: PlanNode
+
+
+def _compile_step(step: "Step") -> StepRenderPlan:
+    request = step.request.model_dump(exclude_none=True) if step.request is not None else None
+    if step.setup_hooks or step.teardown_hooks:
+        # Hooks receive the rendered request and variables and may mutate
+        # nested values in place; render the full tree so nothing is shared.
+        return StepRenderPlan(request=request, request_plan=True, variables_plan=True)
+    return StepRenderPlan(
+        request=request,
+        request_plan=compile_plan(request),
+        variables_plan=compile_plan(step.variables),
+    )
+
+
+def step_render_plan(step: "Step") -> StepRenderPlan:
+    """Plan for *step*, compiled on first use when the loader did not."""
+    plan = step._render_plan
+    if plan is None:
+        plan = _compile_step(step)
+        step._render_plan = plan
+    return plan
+
+
+def check_render_plan(check: "Check") -> CheckRenderPlan:
+    plan = check._render_plan
+    if plan is None:
+        plan = CheckRenderPlan(expect_plan=compile_plan(check.expect))
+        check._render_plan = plan
+    return plan
+
+
+def compile_case_plans(cases: Iterable["Case"]) -> None:
+    """Compile render plans for every step and check of *cases* up front."""
+    for case in cases:
+        for step in case.steps:
+            step_render_plan(step)
+            for check in step.checks:
+                check_render_plan(check)
@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import functools
 import re
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import yaml
 
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# 并行运行时多个用例实例可能同时持久化变量，读-改-写必须串行
+_WRITE_LOCK = threading.Lock()
+
+
+def _serialized(func: _F) -> _F:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _WRITE_LOCK:
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
 def to_env_var_name(name: str) -> str:
     """将变量名转为环境变量格式（大写+下划线）
     
@@ -22,6 +39,7 @@ def to_env_var_name(name: str) -> str:
     return s.upper()
 
 
+@_serialized
 def write_env_variable(file_path: str, key: str, value: Any) -> None:
     """更新或追加 .env 文件中的变量
     
@@ -69,6 +87,7 @@ def write_env_variable(file_path: str, key: str, value: Any) -> None:
     temp_path.replace(path)
 
 
+@_serialized
 def write_yaml_variable(file_path: str, key: str, value: Any) -> None:
     """更新 YAML 环境文件的 variables 部分
     
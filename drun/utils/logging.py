@@ -149,3 +149,52 @@ def setup_logging(level: str = "INFO", *, log_file: Optional[str] = None) -> Non
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     return logging.getLogger(name or "drun")
+
+
+class BufferedLogger:
+    """Collect log records for one unit of work and emit them as one block.
+
+    Parallel runs give every case instance its own buffer so the lines of
+    concurrent instances never interleave in the console or log file.
+    """
+
+    def __init__(self, target: logging.Logger) -> None:
+        self.target = target
+        self.records: list[tuple[int, str]] = []
+
+    def isEnabledFor(self, level: int) -> bool:  # noqa: N802 - mirrors logging.Logger
+        is_enabled = getattr(self.target, "isEnabledFor", None)
+        return is_enabled(level) if is_enabled is not None else True
+
+    def log(self, level: int, msg: object, *args: object) -> None:
+        if not self.isEnabledFor(level):
+            return
+        text = str(msg)
+        if args:
+            try:
+                text = text % args
+            except (TypeError, ValueError):
+                text = " ".join([text, *(str(a) for a in args)])
+        self.records.append((level, text))
+
+    def debug(self, msg: object, *args: object, **_kwargs: object) -> None:
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: object, *args: object, **_kwargs: object) -> None:
+        self.log(logging.INFO, msg, *args)
+
+    def warning(self, msg: object, *args: object, **_kwargs: object) -> None:
+        self.log(logging.WARNING, msg, *args)
+
+    def error(self, msg: object, *args: object, **_kwargs: object) -> None:
+        self.log(logging.ERROR, msg, *args)
+
+    def flush(self) -> None:
+        records, self.records = self.records, []
+        emit = getattr(self.target, "log", None)
+        for level, text in records:
+            if emit is not None:
+                emit(level, "%s", text)
+            else:
+                # Minimal loggers (info/warning/error/debug only).
+                getattr(self.target, logging.getLevelName(level).lower(), self.target.info)(text)
@@ -0,0 +1,198 @@
+"""Check the native path evaluator against JMESPath and time both.
+
+Collects every ``$.`` / ``$[`` expression from the repo's tests, docs and
+examples, converts it the way ``Runner._eval_extract`` does and evaluates it
+on a set of generated bodies (matching, missing keys, wrong types, short
+lists) with both ``search_simple_path`` and ``jmespath``.  Exits non-zero on
+the first mismatch.
+
+    python scripts/bench_extract_paths.py [--rounds 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Iterable, List, Tuple
+
+import jmespath
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from drun.runner.extractors import (  # noqa: E402
+    Accessor,
+    compile_jmespath,
+    compile_simple_path,
+    convert_jmespath_path,
+    search_simple_path,
+)
+
+
+_EXPRESSION_PATTERN = re.compile(r"\$(?:\.[A-Za-z0-9_.\[\]-]+|\[[A-Za-z0-9_.\[\]-]+)")
+_SOURCE_DIRS = ("tests", "drun", "drun-usage")
+_SOURCE_SUFFIXES = {".py", ".md", ".yaml", ".yml"}
+_EXTRA_EXPRESSIONS = (
+    "$.data.items[-1].id",
+    "$.data.items[5].id",
+    "$.data.user-name",
+    "$.headers.X-Request-Id",
+    "$[0][1]",
+    "$.matrix[1][0]",
+    "$.data.items[*].id",
+    "$.data.items[?id > `1`]",
+    "$.data.items[0:2]",
+    "$.data.items | length(@)",
+    "$.a..b",
+    "$.0abc",
+)
+
+
+def collect_expressions(root: Path) -> List[str]:
+    found = set(_EXTRA_EXPRESSIONS)
+    for dirname in _SOURCE_DIRS:
+        for path in (root / dirname).rglob("*"):
+            if path.suffix not in _SOURCE_SUFFIXES or not path.is_file():
+                continue
+            text = path.read_text(encoding="utf-8", errors="ignore")
+            for match in _EXPRESSION_PATTERN.finditer(text):
+                if text.startswith("{", match.end()):
+                    # f-string template such as f"$.items[{i}].id", not an expression
+                    continue
+                expr = match.group(0).rstrip(".")
+                if expr.endswith(".length"):
+                    expr = expr[: -len(".length")]
+                # Skip fragments cut off by the scan and regex literals like "$[A-Za-z_]"
+                if len(expr) > 2 and _balanced(expr) and compile_jmespath(to_jmespath(expr)) is not None:
+                    found.add(expr)
+    return sorted(found)
+
+
+def _balanced(expr: str) -> bool:
+    depth = 0
+    for ch in expr:
+        if ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+def to_jmespath(expr: str) -> str:
+    if expr.startswith("$."):
+        return convert_jmespath_path(expr[2:])
+    return expr[1:]
+
+
+def _build(accessors: Tuple[Accessor, ...], leaf: Any) -> Any:
+    value = leaf
+    for accessor in reversed(accessors):
+        if isinstance(accessor, int):
+            size = accessor + 1 if accessor >= 0 else -accessor
+            items: List[Any] = [{"pad": i} for i in range(size)]
+            items[accessor] = value
+            value = items
+        else:
+            value = {accessor: value, "other": 1}
+    return value
+
+
+def bodies_for(accessors: Tuple[Accessor, ...] | None) -> Iterable[Any]:
+    yield {"data": {"id": 1, "items": [{"id": 1}, {"id": 2}], "user-name": "ada"}, "matrix": [[1, 2], [3]]}
+    yield [[1, 2], [3, 4]]
+    yield {}
+    yield []
+    yield "text"
+    yield 0
+    if not accessors:
+        return
+    yield _build(accessors, {"leaf": True})
+    yield _build(accessors, None)
+    yield _build(accessors, 0)
+    yield _build(accessors[:-1], "scalar")
+    yield _build(accessors[:-1], [])
+    yield _build(accessors[:-1], {})
+    yield _build(accessors, [1, 2, 3])
+
+
+def _jmespath_search(expr: str, body: Any) -> Any:
+    try:
+        return jmespath.search(expr, body)
+    except Exception:
+        return None
+
+
+def check_parity(expressions: List[str]) -> Tuple[int, int]:
+    native = 0
+    compared = 0
+    for expr in expressions:
+        jexpr = to_jmespath(expr)
+        accessors = compile_simple_path(jexpr)
+        if accessors is None:
+            continue
+        native += 1
+        for body in bodies_for(accessors):
+            expected = _jmespath_search(jexpr, body)
+            actual = search_simple_path(accessors, body)
+            compared += 1
+            if actual != expected or type(actual) is not type(expected):
+                raise SystemExit(
+                    f"MISMATCH {expr} ({jexpr}) on {body!r}: native={actual!r} jmespath={expected!r}"
+                )
+    return native, compared
+
+
+def bench(expressions: List[str], rounds: int) -> None:
+    cases = []
+    for expr in expressions:
+        jexpr = to_jmespath(expr)
+        accessors = compile_simple_path(jexpr)
+        if accessors:
+            cases.append((jexpr, accessors, _build(accessors, 1)))
+    compiled = [(jmespath.compile(jexpr), accessors, body) for jexpr, accessors, body in cases]
+
+    def run_native() -> None:
+        for _expr, accessors, body in cases:
+            search_simple_path(accessors, body)
+
+    def run_compiled() -> None:
+        for parsed, _accessors, body in compiled:
+            parsed.search(body)
+
+    def run_search() -> None:
+        for jexpr, _accessors, body in cases:
+            jmespath.search(jexpr, body)
+
+    print(f"{'evaluator':<22} {'total s':>9} {'us/path':>9}")
+    for label, fn in (
+        ("native", run_native),
+        ("jmespath compiled", run_compiled),
+        ("jmespath.search", run_search),
+    ):
+        seconds = timeit.timeit(fn, number=rounds)
+        per_path = seconds / (rounds * max(len(cases), 1)) * 1e6
+        print(f"{label:<22} {seconds:>9.3f} {per_path:>9.3f}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    expressions = collect_expressions(PROJECT_ROOT)
+    native, compared = check_parity(expressions)
+    print(
+        f"{len(expressions)} expressions | {native} take the native path | "
+        f"{compared} body evaluations identical to JMESPath"
+    )
+    bench(expressions, args.rounds)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
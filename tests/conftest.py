@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Keep the suite off the per-user YAML load cache; tests that exercise it
+# point DRUN_CACHE_DIR at their own temporary directory.
+os.environ["DRUN_NO_CACHE"] = "1"
+os.environ["DRUN_CACHE_DIR"] = tempfile.mkdtemp(prefix="drun-test-cache-")
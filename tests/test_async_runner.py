@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from drun.engine.http import AsyncHTTPClient
+from drun.models.case import Case
+from drun.models.checks import Check
+from drun.models.config import Config
+from drun.models.request import StepRequest
+from drun.models.retry import RetryConfig
+from drun.models.step import Step
+from drun.runner.async_runner import AsyncRunner
+from drun.runner.effects import Effect
+
+
+class _FakeLogger:
+    def info(self, *_args, **_kwargs) -> None:
+        return None
+
+    def warning(self, *_args, **_kwargs) -> None:
+        return None
+
+    def error(self, *_args, **_kwargs) -> None:
+        return None
+
+    def debug(self, *_args, **_kwargs) -> None:
+        return None
+
+
+def _mock_async_client(handler) -> AsyncHTTPClient:
+    client = AsyncHTTPClient(base_url="https://example.test")
+    client.client = httpx.AsyncClient(
+        base_url="https://example.test",
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+class AsyncHTTPClientTests(unittest.TestCase):
+    def test_request_returns_sync_client_contract(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"id": 7}, request=request)
+
+        async def main() -> dict:
+            client = _mock_async_client(handler)
+            try:
+                return await client.request({"method": "GET", "path": "/users/7"})
+            finally:
+                await client.aclose()
+
+        result = asyncio.run(main())
+
+        self.assertEqual(result["status_code"], 200)
+        self.assertEqual(result["body"], {"id": 7})
+        self.assertEqual(result["raw_bytes"], b'{"id":7}')
+        self.assertEqual(result["url"], "https://example.test/users/7")
+        self.assertIn("elapsed_ms", result)
+
+    def test_stream_request_parses_sse_events(self) -> None:
+        payload = (
+            'data: {"choices":[{"delta":{"content":"Hel"}}]}\n\n'
+            'data: {"choices":[{"delta":{"content":"lo"}}]}\n\n'
+            "data: [DONE]\n\n"
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                content=payload.encode("utf-8"),
+                headers={"content-type": "text/event-stream"},
+                request=request,
+            )
+
+        async def main() -> dict:
+            client = _mock_async_client(handler)
+            try:
+                return await client.request({"method": "POST", "path": "/chat", "stream": True})
+            finally:
+                await client.aclose()
+
+        result = asyncio.run(main())
+
+        self.assertTrue(result["is_stream"])
+        self.assertEqual(result["stream_summary"]["event_count"], 3)
+        self.assertEqual(result["stream_content"], "Hello")
+        self.assertEqual(result["progressive_content"][-1]["delta"], "lo")
+        self.assertEqual(result["progressive_content"][-1]["offset"], 3)
+
+
+class AsyncRunnerTests(unittest.TestCase):
+    def test_request_step_checks_and_extracts(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"token": "abc"}, request=request)
+
+        runner = AsyncRunner(log=_FakeLogger(), persist_env_file=None)
+        runner._build_async_client = lambda _case: _mock_async_client(handler)  # type: ignore[method-assign]
+        case = Case(
+            config=Config(name="Login", base_url="https://example.test"),
+            steps=[
+                Step(
+                    name="login",
+                    request=StepRequest(method="POST", path="/login"),
+                    extract={"token": "$.token"},
+                    checks=[Check(check="status_code", comparator="eq", expect=200)],
+                )
+            ],
+        )
+
+        result = asyncio.run(runner.run_case_async(case, global_vars={}, params={}))
+
+        self.assertEqual(result.status, "passed")
+        self.assertEqual(result.steps[0].extracts, {"token": "abc"})
+
+    def test_retry_wait_uses_asyncio_sleep(self) -> None:
+        calls = {"count": 0}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls["count"] += 1
+            status = 200 if calls["count"] >= 2 else 503
+            return httpx.Response(status, json={}, request=request)
+
+        runner = AsyncRunner(log=_FakeLogger(), persist_env_file=None)
+        runner._build_async_client = lambda _case: _mock_async_client(handler)  # type: ignore[method-assign]
+        case = Case(
+            config=Config(name="Flaky", base_url="https://example.test"),
+            steps=[
+                Step(
+                    name="ping",
+                    request=StepRequest(method="GET", path="/ping"),
+                    retry=RetryConfig(max=2, every="10ms"),
+                    checks=[Check(check="status_code", comparator="eq", expect=200)],
+                )
+            ],
+        )
+
+        original_sleep = time.sleep
+        time.sleep = lambda _secs: self.fail("retry wait blocked the event loop")  # type: ignore[assignment]
+        try:
+            result = asyncio.run(runner.run_case_async(case, global_vars={}, params={}))
+        finally:
+            time.sleep = original_sleep  # type: ignore[assignment]
+
+        self.assertEqual(result.status, "passed")
+        self.assertEqual(calls["count"], 2)
+
+    def test_sleep_steps_of_many_instances_overlap_on_one_loop(self) -> None:
+        runner = AsyncRunner(log=_FakeLogger(), persist_env_file=None)
+        case = Case(config=Config(name="Pause"), steps=[Step(name="wait", sleep=200)])
+
+        async def main() -> list:
+            return await asyncio.gather(
+                *(runner.run_case_async(case, global_vars={}, params={"i": i}) for i in range(20))
+            )
+
+        started = time.perf_counter()
+        results = asyncio.run(main())
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(r.status == "passed" for r in results))
+        self.assertLess(elapsed, 2.0)
+
+
+class EffectTests(unittest.TestCase):
+    def test_effect_without_both_runners_cannot_be_instantiated(self) -> None:
+        class SyncOnly(Effect):
+            def run(self) -> None:
+                return None
+
+        with self.assertRaises(TypeError):
+            Effect()
+        with self.assertRaises(TypeError):
+            SyncOnly()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import gc
+import hashlib
 import logging
 import os
 from pathlib import Path
@@ -9,7 +12,7 @@ import unittest
 
 import httpx
 
-from drun.engine.http import HTTPClient
+from drun.engine.http import AsyncHTTPClient, HTTPClient
 from drun.loader.yaml_loader import load_yaml_file
 from drun.reporter.json_reporter import write_json
 from drun.runner.runner import Runner
@@ -42,6 +45,154 @@ class BinaryResponseTests(unittest.TestCase):
         self.assertEqual(result["body_bytes_b64"], base64.b64encode(payload).decode("ascii"))
         client.close()
 
+    def test_http_client_decodes_body_only_when_read(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"id": 7}, request=request)
+
+        client = HTTPClient(base_url="https://example.test")
+        client.client = httpx.Client(
+            base_url="https://example.test",
+            transport=httpx.MockTransport(handler),
+        )
+
+        result = client.request({"method": "GET", "path": "/item"})
+
+        self.assertNotIn("body", dict.keys(result))
+        self.assertIn("body", result)
+        self.assertEqual(result.get("body"), {"id": 7})
+        self.assertIs(result["body"], result["body"])
+        self.assertIsNone(result["body_bytes_b64"])
+        self.assertEqual(dict(result)["body"], {"id": 7})
+        client.close()
+
+    def test_http_client_spools_bodies_over_the_memory_limit(self) -> None:
+        payload = bytes(range(256)) * 64
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            chunks = [payload[i:i + 1000] for i in range(0, len(payload), 1000)]
+            return httpx.Response(200, content=iter(chunks), headers={"content-type": "application/zip"})
+
+        client = HTTPClient(base_url="https://example.test")
+        client.client = httpx.Client(
+            base_url="https://example.test",
+            transport=httpx.MockTransport(handler),
+        )
+
+        result = client.request({"method": "GET", "path": "/archive", "max_memory_bytes": 4096})
+
+        spool_path = Path(result["body_path"])
+        self.assertTrue(spool_path.exists())
+        self.assertIsInstance(result["raw_bytes"], memoryview)
+        self.assertEqual(result["raw_bytes"], payload)
+        self.assertEqual(result["body_size"], len(payload))
+        self.assertEqual(result["body_sha256"], hashlib.sha256(payload).hexdigest())
+        self.assertIsNone(result["body"])
+        self.assertIsNone(result["body_bytes_b64"])
+
+        with TemporaryDirectory() as tmp:
+            runner = Runner(log=None)
+            saved = runner._save_response_body(
+                target=str(Path(tmp) / "out" / "archive.zip"),
+                resp=result,
+                variables={},
+                funcs=None,
+                envmap=None,
+            )
+            self.assertEqual(Path(saved).read_bytes(), payload)
+            self.assertEqual(result["body_path"], saved)
+            # The mapping still backs raw_bytes; the spool goes with the response.
+            self.assertEqual(result["raw_bytes"], payload)
+            mapped = result["raw_bytes"].obj
+            del result
+            gc.collect()
+            self.assertTrue(mapped.closed)
+            self.assertFalse(spool_path.exists())
+            self.assertTrue(Path(saved).exists())
+        client.close()
+
+    def test_spooled_temp_file_is_removed_with_the_response(self) -> None:
+        payload = b"x" * 10_000
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=payload, headers={"content-type": "application/octet-stream"})
+
+        async def fetch():
+            client = AsyncHTTPClient(base_url="https://example.test")
+            client.client = httpx.AsyncClient(
+                base_url="https://example.test",
+                transport=httpx.MockTransport(handler),
+            )
+            try:
+                return await client.request({"method": "GET", "path": "/blob", "max_memory_bytes": 100})
+            finally:
+                await client.aclose()
+
+        result = asyncio.run(fetch())
+        spool_path = Path(result["body_path"])
+        mapped = result["raw_bytes"].obj
+        self.assertEqual(result["raw_bytes"], payload)
+        self.assertTrue(spool_path.exists())
+
+        del result
+        gc.collect()
+        self.assertFalse(spool_path.exists())
+        self.assertTrue(mapped.closed)
+
+    def test_small_bodies_stay_in_memory_in_download_mode(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"id": 7})
+
+        client = HTTPClient(base_url="https://example.test")
+        client.client = httpx.Client(
+            base_url="https://example.test",
+            transport=httpx.MockTransport(handler),
+        )
+
+        result = client.request({"method": "GET", "path": "/item", "max_memory_bytes": 1024})
+
+        self.assertNotIn("body_path", result)
+        self.assertEqual(result["body"], {"id": 7})
+        self.assertEqual(result["raw_bytes"], b'{"id":7}')
+        self.assertEqual(result["body_sha256"], hashlib.sha256(b'{"id":7}').hexdigest())
+        client.close()
+
+    def test_plain_run_does_not_decode_body(self) -> None:
+        from unittest.mock import patch
+
+        from drun.engine import http as http_module
+        from drun.engine.pool import ClientPool
+        from drun.models.case import Case
+        from drun.models.checks import normalize_checks
+        from drun.models.config import Config
+        from drun.models.request import StepRequest
+        from drun.models.step import Step
+
+        case = Case(
+            config=Config(name="Plain", base_url="https://example.test"),
+            steps=[
+                Step(
+                    name="Ping",
+                    request=StepRequest(method="GET", path="/ping"),
+                    checks=normalize_checks([{"eq": ["status_code", 200]}]),
+                )
+            ],
+        )
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"id": 7}, request=request))
+
+        for with_report in (False, True):
+            pool = ClientPool()
+            runner = Runner(log=None, client_pool=pool, persist_env_file=None, report_response_bodies=with_report)
+            with patch.object(pool, "transport", return_value=transport), patch.object(
+                http_module._BodyDecoder, "decode", autospec=True, side_effect=http_module._BodyDecoder.decode
+            ) as decode:
+                result = runner.run_case(case, global_vars={}, params={})
+            pool.close()
+
+            with self.subTest(with_report=with_report):
+                self.assertEqual(result.status, "passed")
+                self.assertEqual(decode.called, with_report)
+                self.assertEqual("body" in result.steps[0].response, with_report)
+
     def test_runner_save_body_to_writes_binary_response_and_supports_hooks(self) -> None:
         with TemporaryDirectory() as tmp:
             tmpdir = Path(tmp)
@@ -58,6 +209,7 @@ steps:
       path: /tts
     response:
       save_body_to: artifacts/tts_out.mp3
+      max_memory_bytes: 1048576
     teardown_hooks:
       - "${remember_raw_bytes(response)}"
     check:
@@ -73,6 +225,8 @@ steps:
 
             class FakeHTTPClient:
                 def request(self, req):
+                    if req.get("max_memory_bytes") != 1048576:
+                        raise AssertionError("response.max_memory_bytes not passed to the client")
                     return {
                         "status_code": 200,
                         "headers": {"content-type": "audio/mpeg"},
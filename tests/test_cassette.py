@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+from drun.engine.cassette import (
+    AsyncCassetteTransport,
+    CassetteError,
+    CassetteMiss,
+    CassetteStore,
+    CassetteTransport,
+    MatchRules,
+)
+from drun.engine.http import HTTPClient
+from drun.engine.pool import ClientPool
+
+
+class _Upstream:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(200, json={"n": self.calls, "path": request.url.path})
+
+
+class CassetteTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "api.db")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _client(self, store: CassetteStore, upstream: _Upstream | None = None) -> httpx.Client:
+        inner = httpx.MockTransport(upstream) if upstream is not None else None
+        return httpx.Client(transport=CassetteTransport(store, inner), base_url="http://api.test")
+
+    def test_replay_serves_recorded_responses_in_order_without_network(self) -> None:
+        upstream = _Upstream()
+        store = CassetteStore(self.path, mode="record")
+        with self._client(store, upstream) as client:
+            recorded = [client.get("/poll").json()["n"] for _ in range(2)]
+        store.close()
+
+        replay = CassetteStore(self.path, mode="replay")
+        with self._client(replay) as client:
+            replayed = [client.get("/poll").json()["n"] for _ in range(3)]
+            with self.assertRaises(CassetteMiss):
+                client.get("/other")
+        summary = replay.summary()
+        replay.close()
+
+        self.assertEqual(recorded, [1, 2])
+        self.assertEqual(replayed, [1, 2, 2])
+        self.assertEqual(upstream.calls, 2)
+        self.assertEqual(summary["misses"], [{"method": "GET", "url": "http://api.test/other"}])
+
+    def test_match_rules_normalize_query_json_and_headers(self) -> None:
+        rules = MatchRules.parse("method,url,body,header:X-Tenant,ignore-query:ts")
+        upstream = _Upstream()
+        store = CassetteStore(self.path, mode="auto", rules=rules)
+        with self._client(store, upstream) as client:
+            client.post("/q?b=2&a=1&ts=1", json={"x": 1, "y": 2}, headers={"X-Tenant": "t1"})
+            same = client.post(
+                "/q?a=1&b=2&ts=99",
+                content=b'{"y": 2, "x": 1}',
+                headers={"X-Tenant": "t1", "Content-Type": "application/json"},
+            )
+            other_tenant = client.post("/q?a=1&b=2", json={"x": 1, "y": 2}, headers={"X-Tenant": "t2"})
+        store.close()
+
+        self.assertEqual(same.json()["n"], 1)
+        self.assertEqual(other_tenant.json()["n"], 2)
+        self.assertEqual(upstream.calls, 2)
+        self.assertEqual(rules.spec(), "method,url,body,header:x-tenant,ignore-query:ts")
+        with self.assertRaises(CassetteError):
+            MatchRules.parse("method,cookies")
+
+    def test_encoded_bodies_replay_and_stale_entries_are_reported(self) -> None:
+        payload = gzip.compress(b'{"zipped": true}')
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"Content-Encoding": "gzip"}, content=payload)
+
+        store = CassetteStore(self.path, mode="record")
+        with httpx.Client(transport=CassetteTransport(store, httpx.MockTransport(handler))) as client:
+            self.assertEqual(client.get("http://api.test/a").json(), {"zipped": True})
+            client.get("http://api.test/b")
+        store.close()
+
+        replay = CassetteStore(self.path, mode="replay")
+        with httpx.Client(transport=CassetteTransport(replay, None)) as client:
+            self.assertEqual(client.get("http://api.test/a").json(), {"zipped": True})
+        summary = replay.summary()
+        replay.close()
+
+        self.assertEqual((summary["entries"], summary["used"]), (2, 1))
+        self.assertEqual([entry["url"] for entry in summary["stale"]], ["http://api.test/b"])
+
+    def test_async_transport_records_and_replays(self) -> None:
+        upstream = _Upstream()
+
+        async def fetch(store: CassetteStore, inner: httpx.AsyncBaseTransport | None) -> int:
+            transport = AsyncCassetteTransport(store, inner)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return (await client.post("http://api.test/items", content=b"abc")).json()["n"]
+
+        store = CassetteStore(self.path, mode="record")
+        self.assertEqual(asyncio.run(fetch(store, httpx.MockTransport(upstream))), 1)
+        store.close()
+        replay = CassetteStore(self.path, mode="replay")
+        self.assertEqual(asyncio.run(fetch(replay, None)), 1)
+        replay.close()
+
+    def test_pool_wraps_transports_and_survives_pickling(self) -> None:
+        CassetteStore(self.path, mode="record").close()
+        pool = ClientPool(cassette=CassetteStore(self.path, mode="replay"))
+        worker_pool = pickle.loads(pickle.dumps(pool))
+        client = HTTPClient(base_url="http://api.test", transport=worker_pool.transport())
+        try:
+            with self.assertRaises(httpx.TransportError):
+                client.request({"method": "GET", "path": "/offline"})
+        finally:
+            client.close()
+            worker_pool.close()
+            pool.close()
+
+        self.assertEqual(worker_pool.cassette.run_id, pool.cassette.run_id)
+        self.assertEqual(len(pool.cassette.summary()["misses"]), 1)
+        with self.assertRaises(CassetteError):
+            CassetteStore(str(Path(self.tmp.name) / "missing.db"), mode="replay")
+
+
+if __name__ == "__main__":
+    unittest.main()
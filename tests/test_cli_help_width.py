@@ -168,6 +168,16 @@ class CliHelpWidthTests(unittest.TestCase):
         run_cases.assert_called_once()
         self.assertEqual(run_cases.call_args.kwargs["env"], "dev")
 
+    def test_run_rejects_cassette_with_process_workers(self) -> None:
+        runner = CliRunner()
+        with patch.object(cli, "run_cases", return_value=None) as run_cases:
+            result = runner.invoke(
+                cli.app, ["r", "demo", "-cassette", "api.db", "-parallel", "process", "-workers", "4"]
+            )
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("-cassette cannot be combined with -parallel process", result.output)
+        run_cases.assert_not_called()
+
     def test_run_rejects_double_dash_env_option(self) -> None:
         runner = CliRunner()
         with patch.object(cli, "run_cases", return_value=None) as run_cases:
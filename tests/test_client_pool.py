@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pickle
+import threading
+import unittest
+
+from drun.engine.http import HTTPClient
+from drun.engine.pool import ClientPool
+from drun.models.case import Case
+from drun.models.config import Config
+from drun.models.request import StepRequest
+from drun.models.step import Step
+from drun.runner.runner import Runner
+
+
+class _FakeLogger:
+    def info(self, *_args, **_kwargs) -> None:
+        return None
+
+    def warning(self, *_args, **_kwargs) -> None:
+        return None
+
+    def error(self, *_args, **_kwargs) -> None:
+        return None
+
+    def debug(self, *_args, **_kwargs) -> None:
+        return None
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    seen: list[tuple[int, str | None]] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        type(self).seen.append((self.client_address[1], self.headers.get("Cookie")))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        return None
+
+
+class ClientPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _KeepAliveHandler.seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _case(self) -> Case:
+        return Case(
+            config=Config(name="Ping", base_url=self.base_url),
+            steps=[Step(name="ping", request=StepRequest(method="GET", path="/ping"))],
+        )
+
+    def test_case_instances_reuse_connections_but_not_cookies(self) -> None:
+        pool = ClientPool()
+        runner = Runner(log=_FakeLogger(), client_pool=pool)
+        try:
+            for row in range(3):
+                result = runner.run_case(self._case(), global_vars={}, params={"row": row})
+                self.assertEqual(result.status, "passed")
+        finally:
+            pool.close()
+
+        ports = {port for port, _cookie in _KeepAliveHandler.seen}
+        cookies = [cookie for _port, cookie in _KeepAliveHandler.seen]
+        self.assertEqual(len(_KeepAliveHandler.seen), 3)
+        self.assertEqual(len(ports), 1)
+        self.assertEqual(cookies, [None, None, None])
+
+    def test_step_report_records_http_version(self) -> None:
+        runner = Runner(log=_FakeLogger())
+
+        result = runner.run_case(self._case(), global_vars={}, params={})
+
+        self.assertEqual(result.steps[0].response["http_version"], "HTTP/1.1")
+
+    def test_closing_case_client_keeps_shared_transport_open(self) -> None:
+        pool = ClientPool()
+        try:
+            first = HTTPClient(base_url=self.base_url, transport=pool.transport())
+            first.request({"method": "GET", "path": "/a"})
+            first.close()
+
+            second = HTTPClient(base_url=self.base_url, transport=pool.transport())
+            result = second.request({"method": "GET", "path": "/b"})
+            second.close()
+        finally:
+            pool.close()
+
+        self.assertEqual(result["status_code"], 200)
+
+    def test_case_config_overrides_get_their_own_transport(self) -> None:
+        pool = ClientPool(max_connections=10)
+        try:
+            default = pool.transport()
+            same = pool.transport(max_connections=None)
+            tuned = pool.transport(max_connections=2, keepalive_expiry=30.0)
+        finally:
+            pool.close()
+
+        self.assertIs(default, same)
+        self.assertIsNot(default, tuned)
+        self.assertEqual(pool.resolve(http2=True)[0], True)
+        self.assertEqual(pool.resolve()[1].max_connections, 10)
+
+    def test_pool_pickles_as_empty_pool_with_same_limits(self) -> None:
+        pool = ClientPool(max_connections=7, max_keepalive_connections=3)
+        pool.transport()
+
+        clone = pickle.loads(pickle.dumps(pool))
+
+        self.assertEqual(clone.max_connections, 7)
+        self.assertEqual(clone.max_keepalive_connections, 3)
+        self.assertEqual(clone._transports, {})
+        pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
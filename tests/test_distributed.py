@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import os
+from pathlib import Path
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from drun.commands.run_distributed import check_bind_token, job_payload, parse_bind, run_worker
+from drun.commands.run_workers import CaseInstanceJob
+from drun.engine.pool import ClientPool
+from drun.models.case import Case
+from drun.models.checks import Check
+from drun.models.config import Config
+from drun.models.report import CaseInstanceResult
+from drun.models.request import StepRequest
+from drun.models.step import Step
+from drun.server.coordinator import TOKEN_ENV, UnknownLeaseError, WorkQueue, create_coordinator_app
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        return None
+
+
+def _jobs(count: int) -> list[dict]:
+    return [{"index": i} for i in range(count)]
+
+
+class WorkQueueTests(unittest.TestCase):
+    def test_workers_pull_batches_until_done(self) -> None:
+        queue = WorkQueue(_jobs(5))
+
+        first_id, first = queue.lease("fast", 3)
+        second_id, second = queue.lease("slow", 3)
+        queue.complete(first_id, {job["index"]: {"ok": True} for job in first})
+        queue.complete(second_id, {job["index"]: {"ok": True} for job in second})
+
+        self.assertEqual([job["index"] for job in first], [0, 1, 2])
+        self.assertEqual([job["index"] for job in second], [3, 4])
+        self.assertEqual(queue.lease("fast", 3), (None, []))
+        self.assertTrue(queue.done)
+
+    def test_expired_lease_is_requeued_and_late_results_do_not_double_count(self) -> None:
+        clock = _Clock()
+        queue = WorkQueue(_jobs(2), lease_timeout=10, clock=clock)
+        dead_id, _ = queue.lease("dead", 2)
+
+        clock.now = 5
+        self.assertTrue(queue.heartbeat(dead_id))
+        clock.now = 16
+        retry_id, retried = queue.lease("alive", 2)
+
+        self.assertEqual([job["index"] for job in retried], [0, 1])
+        self.assertFalse(queue.heartbeat(dead_id))
+        self.assertEqual(queue.complete(retry_id, {0: {"by": "alive"}, 1: {"by": "alive"}}), 2)
+        self.assertEqual(queue.complete(dead_id, {0: {"by": "dead"}}), 0)
+        self.assertEqual(queue.results[0], {"by": "alive"})
+        self.assertTrue(queue.done)
+
+    def test_partial_completion_requeues_missing_jobs(self) -> None:
+        queue = WorkQueue(_jobs(3))
+        lease_id, _ = queue.lease("w", 3)
+
+        queue.complete(lease_id, {0: {}})
+        _, again = queue.lease("w", 3)
+
+        self.assertEqual([job["index"] for job in again], [1, 2])
+
+    def test_complete_rejects_unknown_leases_and_foreign_jobs(self) -> None:
+        queue = WorkQueue(_jobs(3))
+        lease_id, _ = queue.lease("w", 1)
+
+        with self.assertRaises(UnknownLeaseError):
+            queue.complete("forged", {1: {"status": "passed"}})
+        self.assertEqual(queue.complete(lease_id, {0: {}, 1: {}, 2: {}}), 1)
+        self.assertEqual(list(queue.results), [0])
+
+    def test_stop_drains_outstanding_leases(self) -> None:
+        queue = WorkQueue(_jobs(4))
+        lease_id, _ = queue.lease("w", 1)
+
+        queue.stop()
+
+        self.assertEqual(queue.lease("w", 1), (None, []))
+        self.assertFalse(queue.done)
+        queue.complete(lease_id, {0: {}})
+        self.assertTrue(queue.done)
+
+
+class DistributedRunTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _case_jobs(self) -> list[CaseInstanceJob]:
+        case = Case(
+            config=Config(name="Ping", base_url=self.base_url),
+            steps=[
+                Step(
+                    name="ping ${n}",
+                    request=StepRequest(method="GET", path="/ping/${n}"),
+                    checks=[Check(check="status_code", comparator="eq", expect=200)],
+                )
+            ],
+        )
+        anchor = Path.cwd() / "tc_ping.yaml"
+        return [
+            CaseInstanceJob(index=i, case=case, params={"n": i}, source=str(anchor), hooks_anchor=anchor)
+            for i in range(3)
+        ]
+
+    def test_worker_runs_leased_jobs_and_posts_results(self) -> None:
+        jobs = self._case_jobs()
+        queue = WorkQueue([job_payload(job, Path.cwd()) for job in jobs])
+        app = create_coordinator_app(queue, {"global_vars": {}, "envmap": {}, "runner": {}}, token="")
+
+        with TestClient(app) as client:
+            ran = run_worker("http://coordinator", batch=2, log=logging.getLogger("test.worker"), client=client)
+
+        results = [CaseInstanceResult.model_validate(queue.results[i]) for i in range(3)]
+        self.assertEqual(ran, 3)
+        self.assertEqual([res.status for res in results], ["passed"] * 3)
+        self.assertEqual([res.parameters for res in results], [{"n": 0}, {"n": 1}, {"n": 2}])
+        self.assertEqual(results[0].source, "tc_ping.yaml")
+
+    def test_worker_uses_the_coordinator_pool_settings(self) -> None:
+        pool = {
+            "max_connections": 7,
+            "max_keepalive_connections": 3,
+            "keepalive_expiry": 30.0,
+            "http2": False,
+            "dns_ttl": 10.0,
+        }
+        app = create_coordinator_app(WorkQueue([]), {"pool": pool}, token="")
+
+        with patch("drun.commands.run_distributed.ClientPool", wraps=ClientPool) as make_pool:
+            with TestClient(app) as client:
+                run_worker("http://coordinator", log=logging.getLogger("test.worker"), client=client)
+
+        make_pool.assert_called_once_with(**pool)
+
+    def test_coordinator_rejects_workers_without_token(self) -> None:
+        queue = WorkQueue(_jobs(1))
+        app = create_coordinator_app(queue, {}, token="s3cret")
+
+        with TestClient(app) as client:
+            denied = client.get("/dist/session")
+            allowed = client.get("/dist/session", headers={"X-Drun-Token": "s3cret"})
+
+        self.assertEqual(denied.status_code, 401)
+        self.assertEqual(allowed.status_code, 200)
+
+    def test_complete_endpoint_rejects_unknown_lease(self) -> None:
+        queue = WorkQueue(_jobs(1))
+        app = create_coordinator_app(queue, {}, token="")
+
+        with TestClient(app) as client:
+            reply = client.post("/dist/complete", json={"lease_id": "forged", "results": {"0": {}}})
+
+        self.assertEqual(reply.status_code, 409)
+        self.assertEqual(queue.results, {})
+
+    def test_public_bind_requires_token(self) -> None:
+        for host in ("127.0.0.1", "localhost", "::1"):
+            check_bind_token(host, None)
+        check_bind_token("0.0.0.0", "s3cret")
+        for host in ("0.0.0.0", "10.0.0.5", "coordinator.internal"):
+            with self.subTest(host=host), self.assertRaises(ValueError):
+                check_bind_token(host, None)
+
+    def test_worker_sends_token_from_environment(self) -> None:
+        queue = WorkQueue([])
+        app = create_coordinator_app(queue, {}, token="s3cret")
+
+        with patch.dict(os.environ, {TOKEN_ENV: "s3cret"}):
+            with TestClient(app) as client:
+                ran = run_worker("http://coordinator", log=logging.getLogger("test.worker"), client=client)
+
+        self.assertEqual(ran, 0)
+
+    def test_parse_bind_requires_port(self) -> None:
+        self.assertEqual(parse_bind("0.0.0.0:8765"), ("0.0.0.0", 8765))
+        self.assertEqual(parse_bind(":9000"), ("0.0.0.0", 9000))
+        with self.assertRaises(ValueError):
+            parse_bind("localhost")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import socket
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from drun.engine.dns import DnsCache, install_dns_cache
+from drun.engine.http import HTTPClient
+from drun.engine.pool import ClientPool
+from drun.engine.warmup import WarmupTarget, warm_up
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    methods: list[str] = []
+
+    def _reply(self, body: bytes) -> None:
+        type(self).methods.append(self.command)
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._reply(b'{"ok": true}')
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self._reply(b"")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class DnsWarmupTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://localhost:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        _Handler.methods = []
+
+    def _counting_getaddrinfo(self):
+        real = socket.getaddrinfo
+        calls = []
+
+        def fake(host, port, *args, **kwargs):
+            calls.append(host)
+            return [info for info in real(host, port, *args, **kwargs) if info[0] == socket.AF_INET]
+
+        return fake, calls
+
+    def test_cache_resolves_each_host_once_within_ttl(self) -> None:
+        fake, calls = self._counting_getaddrinfo()
+        cache = DnsCache(ttl=60)
+        uncached = DnsCache(ttl=0)
+        with patch("drun.engine.dns.socket.getaddrinfo", side_effect=fake):
+            first = cache.resolve("localhost", 80)
+            self.assertEqual(cache.resolve("localhost", 80), first)
+            uncached.resolve("localhost", 80)
+            uncached.resolve("localhost", 80)
+
+        self.assertEqual(calls, ["localhost"] * 3)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIn("127.0.0.1", first)
+
+    def test_new_connections_reuse_cached_addresses(self) -> None:
+        fake, calls = self._counting_getaddrinfo()
+        transport = httpx.HTTPTransport(limits=httpx.Limits(max_keepalive_connections=0))
+        install_dns_cache(transport, DnsCache(ttl=60))
+        with self.assertRaises(TypeError):
+            install_dns_cache(httpx.MockTransport(lambda r: httpx.Response(200)), DnsCache())
+
+        with patch("drun.engine.dns.socket.getaddrinfo", side_effect=fake):
+            with httpx.Client(transport=transport) as client:
+                for _ in range(3):
+                    self.assertEqual(client.get(self.base_url).status_code, 200)
+
+        # create_connection still "resolves" the IP literal; only the name lookup is cached
+        self.assertEqual([host for host in calls if host == "localhost"], ["localhost"])
+
+    def test_missing_backend_hook_fails_loudly(self) -> None:
+        transport = httpx.HTTPTransport()
+        try:
+            with patch.object(transport._pool, "_network_backend", None):
+                with self.assertRaises(RuntimeError):
+                    install_dns_cache(transport, DnsCache())
+        finally:
+            transport.close()
+
+    def test_each_pool_has_its_own_cache(self) -> None:
+        short, long = ClientPool(dns_ttl=1), ClientPool(dns_ttl=60)
+
+        self.assertIsNot(short.dns_cache, long.dns_cache)
+        self.assertEqual((short.dns_cache.ttl, long.dns_cache.ttl), (1, 60))
+        self.assertIsNone(ClientPool().dns_cache)
+
+    def test_async_transport_uses_cache(self) -> None:
+        cache = DnsCache(ttl=60)
+
+        async def main() -> None:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_keepalive_connections=0))
+            install_dns_cache(transport, cache)
+            async with httpx.AsyncClient(transport=transport) as client:
+                for _ in range(3):
+                    self.assertEqual((await client.get(self.base_url)).status_code, 200)
+
+        asyncio.run(main())
+
+        self.assertEqual((cache.misses, cache.hits), (1, 2))
+
+    def test_warm_up_opens_pooled_connections_before_first_step(self) -> None:
+        pool = ClientPool(dns_ttl=60)
+        try:
+            summary = warm_up(
+                [WarmupTarget(self.base_url), WarmupTarget(self.base_url)],
+                pool,
+                connections=2,
+            )
+            client = HTTPClient(base_url=self.base_url, transport=pool.transport())
+            try:
+                timing = client.request({"method": "GET", "path": "/"})["timing"]
+            finally:
+                client.close()
+        finally:
+            pool.close()
+
+        self.assertEqual(len(summary["targets"]), 1)
+        entry = summary["targets"][0]
+        self.assertEqual(entry["connections"], 2)
+        self.assertIsNone(entry["error"])
+        self.assertGreaterEqual(entry["dns_ms"], 0.0)
+        self.assertGreaterEqual(summary["total_ms"], entry["connect_ms"])
+        self.assertEqual(_Handler.methods, ["HEAD", "HEAD", "GET"])
+        self.assertTrue(timing["connection_reused"])
+
+    def test_warm_up_reports_unresolvable_hosts(self) -> None:
+        summary = warm_up([WarmupTarget("http://no-such-host.invalid")], ClientPool(), open_connections=False)
+
+        self.assertTrue(summary["targets"][0]["error"].startswith("dns:"))
+        self.assertEqual(summary["targets"][0]["connections"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
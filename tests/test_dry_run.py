@@ -169,6 +169,41 @@ class BuildDryRunPlanTests(unittest.TestCase):
 
         self.assertIn("invoke   tc_status", text)
 
+    def test_request_step_with_retry_backoff(self) -> None:
+        from drun.models.retry import RetryConfig
+        case = Case(
+            config=Config(name="Poll", base_url="https://api.example.com"),
+            steps=[
+                Step(
+                    name="Poll",
+                    request=StepRequest(method="GET", path="/status"),
+                    retry=RetryConfig(max=5, every="1s", backoff="exponential", max_delay="10s", budget="30s"),
+                )
+            ],
+        )
+        items = self._build_items(case)
+
+        text = build_dry_run_plan_text(
+            target="test.yaml",
+            env_label="none",
+            env_file_label="(none)",
+            base_url="https://api.example.com",
+            files_count=1,
+            items=[(case, {"file": "test.yaml"})],
+            parameterized_items=items,
+            tag_filter=None,
+            case_selector=None,
+            global_vars={},
+            env_store={},
+            dry_run_limit=20,
+            reveal_secrets=True,
+        )
+
+        self.assertIn(
+            "request  GET /status (retry=5 every=1s backoff=exponential max_delay=10s budget=30s)",
+            text,
+        )
+
     def test_invoke_step_with_case_name_selector(self) -> None:
         case = Case(
             config=Config(name="Flow"),
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+import jmespath
+
+from drun.runner.extractors import (
+    compile_jmespath,
+    compile_simple_path,
+    convert_jmespath_path,
+    extract_from_body,
+    resolve_simple_paths,
+    search_simple_path,
+)
+from drun.runner.runner import Runner
+
+
+class ExpressionCacheTests(unittest.TestCase):
+    def test_expression_is_compiled_once_across_searches(self) -> None:
+        compile_jmespath.cache_clear()
+
+        for value in range(3):
+            self.assertEqual(extract_from_body({"a": [{"b": value}]}, "a[*].b"), [value])
+
+        self.assertEqual(compile_jmespath.cache_info().misses, 1)
+
+    def test_invalid_expression_is_cached_as_none(self) -> None:
+        compile_jmespath.cache_clear()
+
+        self.assertIsNone(extract_from_body({"a": 1}, "a.["))
+        self.assertIsNone(extract_from_body({"a": 1}, "a.["))
+        self.assertEqual(compile_jmespath.cache_info().misses, 1)
+
+    def test_unclosed_bracket_does_not_hang(self) -> None:
+        results: list = []
+        worker = threading.Thread(
+            target=lambda: results.extend(convert_jmespath_path(e) for e in ("data.items[", "[", "a[0")),
+            daemon=True,
+        )
+        worker.start()
+        worker.join(timeout=2.0)
+
+        self.assertFalse(worker.is_alive(), "convert_jmespath_path hung on an unclosed bracket")
+        self.assertEqual(results, ["data.items.[", "[", "a.[0"])
+        self.assertIsNone(Runner(log=None)._eval_extract("$.data.items[", {"body": {"data": {"items": []}}}))
+
+    def test_eval_extract_reuses_converted_paths(self) -> None:
+        runner = Runner(log=None)
+        resp = {"body": {"data": {"user-name": "ada", "items": [{"id": 1}, {"id": 2}]}}}
+        convert_jmespath_path.cache_clear()
+
+        for _ in range(3):
+            self.assertEqual(runner._eval_extract("$.data.user-name", resp), "ada")
+            self.assertEqual(runner._eval_extract("$.data.items[1].id", resp), 2)
+
+        self.assertEqual(convert_jmespath_path("data.user-name"), 'data."user-name"')
+        self.assertEqual(convert_jmespath_path.cache_info().misses, 2)
+
+
+class SimplePathTests(unittest.TestCase):
+    BODIES = (
+        {"data": {"items": [{"id": 1}, {"id": 2, "user-name": "ada"}], "n": 0}, "list": [[1, 2], [3]]},
+        {"data": {"items": {"0": "not a list"}}},
+        {"data": None},
+        [[1, 2], {"id": 3}],
+        {},
+        [],
+        "text",
+    )
+
+    def test_simple_paths_compile_to_accessors(self) -> None:
+        self.assertEqual(compile_simple_path('data.items[1]."user-name"'), ("data", "items", 1, "user-name"))
+        self.assertEqual(compile_simple_path("[0][-1]"), (0, -1))
+        for expr in ("data.items[*].id", "items[0:2]", "a..b", "a.[0]", "0abc", 'a."b\\"c"', "a.", ""):
+            self.assertIsNone(compile_simple_path(expr), expr)
+
+    def test_native_results_match_jmespath(self) -> None:
+        paths = (
+            "data.items[1].id",
+            'data.items[1]."user-name"',
+            "data.items[-1].id",
+            "data.items[5].id",
+            "data.n",
+            "data.n.x",
+            "data.items[0].id.x",
+            "list[0][1]",
+            "[1].id",
+            "[0][0]",
+            "missing",
+        )
+        for path in paths:
+            accessors = compile_simple_path(path)
+            self.assertIsNotNone(accessors, path)
+            for body in self.BODIES:
+                with self.subTest(path=path, body=body):
+                    self.assertEqual(search_simple_path(accessors, body), jmespath.search(path, body))
+
+    def test_complex_expressions_fall_back_to_jmespath(self) -> None:
+        body = {"items": [{"id": 1}, {"id": 2}]}
+
+        self.assertEqual(extract_from_body(body, "items[*].id"), [1, 2])
+        self.assertEqual(extract_from_body(body, "length(items)"), 2)
+
+
+class _CountingDict(dict):
+    lookups = 0
+
+    def get(self, key, default=None):
+        type(self).lookups += 1
+        return super().get(key, default)
+
+
+class BatchedPathTests(unittest.TestCase):
+    def test_shared_prefixes_are_walked_once(self) -> None:
+        _CountingDict.lookups = 0
+        body = _CountingDict(data=_CountingDict(items=[{"id": i} for i in range(50)]))
+        paths = {f"$.data.items[{i}].id": ("data", "items", i, "id") for i in range(50)}
+
+        resolved = resolve_simple_paths(paths, body)
+
+        self.assertEqual(resolved, {f"$.data.items[{i}].id": i for i in range(50)})
+        self.assertEqual(_CountingDict.lookups, 2)
+
+    def test_runner_batch_matches_eval_extract(self) -> None:
+        runner = Runner(log=None)
+        resp = {
+            "status_code": 200,
+            "headers": {"X-Id": "h"},
+            "body": {"data": {"items": [{"id": 1}, {"id": 2}], "user-name": "ada"}},
+        }
+        exprs = [
+            "$.data.items[0].id",
+            " $.data.items[1].id",
+            "$.data.user-name",
+            "$.data.items.length",
+            "$.data.missing.length",
+            "$[0]",
+            "$.data.items[*].id",
+            "$headers.X-Id",
+            "$status_code",
+            "status_code",
+        ]
+
+        resolved = runner._resolve_paths(exprs, resp)
+
+        self.assertEqual(
+            set(resolved),
+            {"$.data.items[0].id", " $.data.items[1].id", "$.data.user-name", "$.data.items.length",
+             "$.data.missing.length", "$[0]"},
+        )
+        for expr, value in resolved.items():
+            self.assertEqual(value, runner._eval_extract(expr, resp), expr)
+        self.assertEqual(runner._resolve_paths(exprs, {**resp, "is_stream": True}), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,6 +53,17 @@ class HtmlReporterLayoutTests(unittest.TestCase):
         self.assertIn("class='st-head-duration muted'>150.9 ms</span>", html)
         self.assertIn("class='st-head-checks muted'>检查: 3 ✓ / 0 ✗</span>", html)
 
+    def test_build_step_shows_timing_breakdown(self) -> None:
+        step = self._build_step_result()
+        step.timing = {"connect_ms": 12.5, "tls_ms": None, "ttfb_ms": 80.0, "total_ms": 95.25}
+
+        html = _build_step(step, step_idx=1)
+
+        self.assertIn("data-section='timing'", html)
+        self.assertIn("<code>connect_ms</code></td><td>12.5 ms</td>", html)
+        self.assertIn("<code>tls_ms</code></td><td>-</td>", html)
+        self.assertNotIn("data-section='timing'", _build_step(self._build_step_result(), step_idx=1))
+
     def test_build_step_uses_icon_only_copy_button(self) -> None:
         html = _build_step(self._build_step_result(), step_idx=2)
 
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import unittest
+
+from drun.engine.http import AsyncHTTPClient, HTTPClient
+from drun.runner.runner import Runner
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class HttpTimingTests(unittest.TestCase):
+    PHASES = ("connect_ms", "send_ms", "wait_ms", "ttfb_ms", "receive_ms", "total_ms")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_sync_client_records_phases_and_connection_reuse(self) -> None:
+        client = HTTPClient(base_url=self.base_url)
+        try:
+            first = client.request({"method": "GET", "path": "/"})["timing"]
+            second = client.request({"method": "GET", "path": "/"})["timing"]
+        finally:
+            client.close()
+
+        for phase in self.PHASES:
+            self.assertGreaterEqual(first[phase], 0.0, phase)
+        self.assertIsNone(first["tls_ms"])
+        self.assertFalse(first["connection_reused"])
+        self.assertLessEqual(first["ttfb_ms"], first["total_ms"])
+        self.assertTrue(second["connection_reused"])
+        self.assertIsNone(second["connect_ms"])
+
+    def test_async_client_records_phases(self) -> None:
+        async def main() -> dict:
+            client = AsyncHTTPClient(base_url=self.base_url)
+            try:
+                return await client.request({"method": "GET", "path": "/"})
+            finally:
+                await client.aclose()
+
+        timing = asyncio.run(main())["timing"]
+
+        for phase in self.PHASES:
+            self.assertGreaterEqual(timing[phase], 0.0, phase)
+
+    def test_timing_is_an_extract_source(self) -> None:
+        runner = Runner(log=None)
+        resp = {"timing": {"connect_ms": 3.5, "ttfb_ms": 20.0}}
+
+        self.assertEqual(runner._eval_extract("$timing.ttfb_ms", resp), 20.0)
+        self.assertEqual(runner._resolve_check("$timing.connect_ms", resp), 3.5)
+        self.assertIsNone(runner._eval_extract("$timing.tls_ms", resp))
+        self.assertEqual(runner._eval_extract("$timing", resp), resp["timing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import threading
+import unittest
+
+from drun.commands.load import run_load_test
+from drun.models.report import CaseInstanceResult, StepResult
+from drun.runner.load import LatencyHistogram, LoadProfile, arrival_offset, run_load
+
+
+class _PingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        type(self).hits += 1
+        status = 500 if self.path.startswith("/broken") else 200
+        body = json.dumps({"token": "t-1"}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        return None
+
+
+def _result(status: str = "passed") -> CaseInstanceResult:
+    return CaseInstanceResult(
+        name="Ping",
+        status=status,
+        steps=[StepResult(name="ping", status=status, duration_ms=5.0)],
+    )
+
+
+class LoadScheduleTests(unittest.TestCase):
+    def test_histogram_percentiles_use_nearest_rank(self) -> None:
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.add(float(value), failed=value > 95)
+
+        summary = histogram.summary(elapsed_s=10.0)
+
+        self.assertAlmostEqual(summary["p50_ms"], 50.0, delta=0.5)
+        self.assertAlmostEqual(summary["p90_ms"], 90.0, delta=0.9)
+        self.assertAlmostEqual(summary["p99_ms"], 99.0, delta=0.99)
+        self.assertEqual(summary["max_ms"], 100.0)
+        self.assertAlmostEqual(summary["mean_ms"], 50.5)
+        self.assertAlmostEqual(summary["error_rate"], 0.05)
+        self.assertAlmostEqual(summary["throughput"], 10.0)
+
+    def test_histogram_memory_is_bounded_by_range_not_samples(self) -> None:
+        histogram = LatencyHistogram()
+        other = LatencyHistogram()
+        for value in range(200_000):
+            histogram.add(1.0 + value % 1000)
+        other.add(5000.0, failed=True)
+
+        histogram.merge(other)
+
+        self.assertLess(len(histogram.buckets), 400)
+        self.assertEqual(histogram.count, 200_001)
+        self.assertEqual(histogram.errors, 1)
+        self.assertEqual(histogram.percentile(100), 5000.0)
+        self.assertAlmostEqual(histogram.percentile(50), 500.0, delta=5.0)
+
+    def test_open_loop_arrivals_ramp_to_target_rate(self) -> None:
+        self.assertEqual(arrival_offset(0, rps=10, ramp_up=0), 0.0)
+        self.assertAlmostEqual(arrival_offset(5, rps=10, ramp_up=0), 0.5)
+        # 10 rps over a 2s ramp: 10 arrivals are due by t=2s, then one every 0.1s.
+        self.assertAlmostEqual(arrival_offset(10, rps=10, ramp_up=2), 2.0)
+        self.assertAlmostEqual(arrival_offset(15, rps=10, ramp_up=2), 2.5)
+        self.assertLess(arrival_offset(5, rps=10, ramp_up=2), 2.0)
+
+    def test_closed_loop_keeps_virtual_users_busy_until_deadline(self) -> None:
+        active = {"now": 0, "peak": 0}
+
+        async def iteration(_job):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return _result()
+
+        stats = asyncio.run(
+            run_load(["a", "b"], LoadProfile(duration=0.2, concurrency=3), iteration, case_name=str.upper)
+        )
+
+        self.assertEqual(active["peak"], 3)
+        self.assertEqual(set(stats.cases), {"A", "B"})
+        self.assertGreater(stats.cases["A"].count, 3)
+        self.assertIn("A › ping", stats.steps)
+
+    def test_open_loop_counts_exceptions_and_failed_cases_as_errors(self) -> None:
+        calls = {"count": 0}
+
+        async def iteration(_job):
+            calls["count"] += 1
+            if calls["count"] % 2:
+                raise RuntimeError("boom")
+            return _result("failed")
+
+        stats = asyncio.run(
+            run_load(["job"], LoadProfile(duration=0.2, concurrency=5, rps=50), iteration, case_name=lambda _j: "Ping")
+        )
+
+        summary = stats.to_dict()["iterations"]
+        self.assertEqual(summary["count"], 10)
+        self.assertEqual(summary["errors"], 10)
+
+
+class LoadCommandTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _PingHandler.hits = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _PingHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_load_runs_yaml_case_checks_and_writes_report(self) -> None:
+        with TemporaryDirectory() as tmp:
+            tmpdir = Path(tmp)
+            (tmpdir / ".env").write_text(f"BASE_URL={self.base_url}\n", encoding="utf-8")
+            (tmpdir / "tc_ping.yaml").write_text(
+                """
+config:
+  name: Ping
+steps:
+  - name: login
+    request:
+      method: GET
+      path: /login
+    extract:
+      token: $.token
+    check:
+      - eq: [status_code, 200]
+  - name: broken
+    request:
+      method: GET
+      path: /broken/${token}
+    check:
+      - eq: [status_code, 200]
+""".strip(),
+                encoding="utf-8",
+            )
+
+            old_cwd = os.getcwd()
+            os.chdir(tmpdir)
+            try:
+                stats = run_load_test(
+                    "tc_ping.yaml",
+                    k=None,
+                    vars=[],
+                    env=None,
+                    env_file=None,
+                    concurrency=2,
+                    rps=None,
+                    duration=0.3,
+                    ramp_up=0.0,
+                    report="load.json",
+                    log_level="INFO",
+                )
+            finally:
+                os.chdir(old_cwd)
+
+            data = json.loads((tmpdir / "load.json").read_text(encoding="utf-8"))
+            env_text = (tmpdir / ".env").read_text(encoding="utf-8")
+
+        self.assertGreater(_PingHandler.hits, 2)
+        self.assertEqual(data["iterations"]["error_rate"], 1.0)
+        self.assertEqual(data["steps"]["Ping › login"]["errors"], 0)
+        self.assertEqual(data["steps"]["Ping › broken"]["error_rate"], 1.0)
+        self.assertEqual(stats.cases["Ping"].count, data["iterations"]["count"])
+        # Extracts feed later steps but are not persisted to the env file under load.
+        self.assertNotIn("TOKEN", env_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
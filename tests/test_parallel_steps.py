@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from drun.models.case import Case
+from drun.models.checks import Check
+from drun.models.config import Config
+from drun.models.request import StepRequest
+from drun.models.step import Step
+from drun.runner.runner import Runner
+from drun.runner.step_graph import plan_step_waves
+
+
+class _FakeLogger:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def info(self, msg, *args, **_kwargs) -> None:
+        self.lines.append(str(msg) % args if args else str(msg))
+
+    def warning(self, *_args, **_kwargs) -> None:
+        return None
+
+    def error(self, *_args, **_kwargs) -> None:
+        return None
+
+    def debug(self, *_args, **_kwargs) -> None:
+        return None
+
+
+class _SlowClient:
+    """Answers after a short delay and tracks how many requests overlap."""
+
+    def __init__(self, delay: float = 0.2) -> None:
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.paths: list[str] = []
+
+    def request(self, req):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.paths.append(req["path"])
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self.lock:
+                self.active -= 1
+        return {
+            "status_code": 200,
+            "headers": {"content-type": "application/json"},
+            "body": {"id": req["path"].rsplit("/", 1)[-1]},
+            "elapsed_ms": self.delay * 1000,
+            "url": f"https://example.test{req['path']}",
+            "method": req.get("method", "GET"),
+        }
+
+    def close(self) -> None:
+        return None
+
+
+def _get(name: str, path: str, **kwargs) -> Step:
+    kwargs.setdefault("parallel", True)
+    return Step(name=name, request=StepRequest(method="GET", path=path), **kwargs)
+
+
+class PlanStepWavesTests(unittest.TestCase):
+    def test_independent_steps_share_a_wave(self) -> None:
+        steps = [_get("a", "/a"), _get("b", "/b"), _get("c", "/c")]
+
+        self.assertEqual(plan_step_waves(steps), [[0, 1, 2]])
+
+    def test_step_waits_for_the_extract_it_reads(self) -> None:
+        steps = [
+            _get("login", "/login", extract={"token": "$.token"}),
+            _get("profile", "/me", variables={"auth": "Bearer ${token}"}),
+            _get("other", "/other"),
+        ]
+
+        self.assertEqual(plan_step_waves(steps), [[0, 2], [1]])
+
+    def test_barrier_steps_run_alone(self) -> None:
+        steps = [
+            _get("a", "/a"),
+            Step(name="pause", sleep=10),
+            _get("b", "/b"),
+            _get("c", "/c"),
+        ]
+
+        self.assertEqual(plan_step_waves(steps), [[0], [1], [2, 3]])
+
+    def test_unmarked_steps_keep_their_order(self) -> None:
+        steps = [
+            _get("login", "/login", parallel=False),
+            _get("a", "/a"),
+            _get("b", "/b"),
+            _get("logout", "/logout", parallel=False),
+        ]
+
+        # The login cookie lands in the shared jar before a and b start.
+        self.assertEqual(plan_step_waves(steps), [[0], [1, 2], [3]])
+
+    def test_overwriting_a_name_keeps_order_with_readers_and_writers(self) -> None:
+        steps = [
+            _get("first", "/first", extract={"id": "$.id"}),
+            _get("reader", "/items/$id"),
+            _get("second", "/second", extract={"id": "$.id"}),
+        ]
+
+        # "second" may share the reader's wave (snapshot) but not the first writer's.
+        self.assertEqual(plan_step_waves(steps), [[0], [1, 2]])
+
+
+class ParallelStepsRunnerTests(unittest.TestCase):
+    def _run(self, case: Case, client: _SlowClient, log: _FakeLogger | None = None):
+        runner = Runner(log=log or _FakeLogger(), persist_env_file=None)
+        runner._build_client = lambda _case: client  # type: ignore[method-assign]
+        return runner.run_case(case, global_vars={}, params={})
+
+    def test_independent_steps_overlap_and_report_in_order(self) -> None:
+        client = _SlowClient()
+        log = _FakeLogger()
+        case = Case(
+            config=Config(name="Fan-out", base_url="https://example.test", parallel_steps=True),
+            steps=[
+                _get("a", "/items/a"),
+                _get("b", "/items/b"),
+                _get("c", "/items/c"),
+            ],
+        )
+
+        started = time.perf_counter()
+        result = self._run(case, client, log)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(result.status, "passed")
+        self.assertEqual(client.peak, 3)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual([step.name for step in result.steps], ["a", "b", "c"])
+        starts = [line for line in log.lines if line.startswith("[STEP]") and " Start: " in line]
+        self.assertEqual(starts, ["[STEP] Step 1 Start: a", "[STEP] Step 2 Start: b", "[STEP] Step 3 Start: c"])
+
+    def test_extracts_from_a_wave_feed_the_next_one(self) -> None:
+        client = _SlowClient(delay=0.01)
+        case = Case(
+            config=Config(name="Chain", base_url="https://example.test", parallel_steps=True),
+            steps=[
+                _get("first", "/items/1", extract={"first_id": "$.id"}),
+                _get("second", "/items/2", extract={"second_id": "$.id"}),
+                _get(
+                    "both",
+                    "/pairs/${first_id}-${second_id}",
+                    checks=[Check(check="status_code", comparator="eq", expect=200)],
+                ),
+            ],
+        )
+
+        result = self._run(case, client)
+
+        self.assertEqual(result.status, "passed")
+        self.assertEqual(client.paths[-1], "/pairs/1-2")
+        self.assertEqual(client.peak, 2)
+        self.assertEqual([step.name for step in result.steps], ["first", "second", "both"])
+
+    def test_failfast_discards_steps_after_the_first_failure_in_a_wave(self) -> None:
+        client = _SlowClient(delay=0.01)
+        log = _FakeLogger()
+        case = Case(
+            config=Config(name="Failfast", base_url="https://example.test", parallel_steps=True),
+            steps=[
+                _get("a", "/items/a", extract={"a_id": "$.id"}),
+                _get("b", "/items/b", checks=[Check(check="status_code", comparator="eq", expect=201)]),
+                _get("c", "/items/c", extract={"c_id": "$.id"}),
+                _get("after", "/items/${a_id}"),
+            ],
+        )
+        runner = Runner(log=log, failfast=True, persist_env_file=None)
+        runner._build_client = lambda _case: client  # type: ignore[method-assign]
+
+        result = runner.run_case(case, global_vars={}, params={})
+
+        self.assertEqual(result.status, "failed")
+        self.assertEqual([step.name for step in result.steps], ["a", "b"])
+        self.assertEqual(len(client.paths), 3)
+        self.assertFalse(any("Step 3" in line for line in log.lines))
+
+    def test_steps_stay_sequential_without_the_flag(self) -> None:
+        client = _SlowClient(delay=0.01)
+        case = Case(
+            config=Config(name="Serial", base_url="https://example.test"),
+            steps=[_get("a", "/items/a"), _get("b", "/items/b")],
+        )
+
+        result = self._run(case, client)
+
+        self.assertEqual(result.status, "passed")
+        self.assertEqual(client.peak, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from drun.loader.yaml_loader import load_yaml_file
+from drun.models.request import StepRequest
+from drun.models.step import Step
+from drun.templating.engine import TemplateEngine
+from drun.templating.plan import compile_plan, step_render_plan
+
+
+class RenderPlanTests(unittest.TestCase):
+    def test_plan_marks_only_template_paths(self) -> None:
+        value = {
+            "method": "POST",
+            "path": "/users/${user_id}",
+            "headers": {"Accept": "application/json", "X-Trace": "$trace"},
+            "body": {"items": [{"sku": "A"}, {"sku": "$sku"}], "meta": {"kind": "fixed"}},
+            "check": "$.data.id",
+            "status": "$status_code",
+        }
+
+        self.assertEqual(
+            compile_plan(value),
+            {
+                "path": True,
+                "headers": {"X-Trace": True},
+                "body": {"items": {1: {"sku": True}}},
+            },
+        )
+        self.assertIsNone(compile_plan({"a": [1, "x", {"b": None}]}))
+
+    def test_render_planned_matches_full_render_and_shares_static_subtrees(self) -> None:
+        engine = TemplateEngine()
+        template = {
+            "path": "/users/${user_id}",
+            "headers": {"Accept": "application/json", "X-Trace": "$trace"},
+            "body": {"items": [{"sku": "A"}, {"sku": "$sku"}], "meta": {"kind": "fixed"}},
+        }
+        variables = {"user_id": 7, "trace": "t-1", "sku": "B"}
+
+        rendered = engine.render_planned(template, compile_plan(template), variables)
+
+        self.assertEqual(rendered, engine.render_value(template, variables))
+        self.assertIs(rendered["body"]["meta"], template["body"]["meta"])
+        self.assertIs(rendered["body"]["items"][0], template["body"]["items"][0])
+        self.assertEqual(template["headers"]["X-Trace"], "$trace")
+        static = {"a": {"b": 1}}
+        copied = engine.render_planned(static, compile_plan(static), {})
+        self.assertIsNot(copied, static)
+        self.assertIs(copied["a"], static["a"])
+
+    def test_steps_with_hooks_render_without_sharing(self) -> None:
+        step = Step(
+            name="signed",
+            request=StepRequest(method="POST", path="/sign", json={"payload": {"a": 1}}),
+            setup_hooks=["${sign($request)}"],
+        )
+        plan = step_render_plan(step)
+
+        rendered = TemplateEngine().render_planned(plan.request, plan.request_plan, {})
+
+        self.assertEqual(rendered["body"], {"payload": {"a": 1}})
+        self.assertIsNot(rendered["body"]["payload"], plan.request["body"]["payload"])
+
+    def test_loader_compiles_plans_for_steps_and_checks(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tc_plan.yaml"
+            path.write_text(
+                """
+config:
+  name: Plan
+steps:
+  - name: create
+    variables:
+      sku: A
+    request:
+      method: POST
+      path: /items
+      body:
+        sku: $sku
+        tags: [x, y]
+    check:
+      - eq: [$.tags, [x, y]]
+      - eq: [$.sku, $sku]
+""".strip(),
+                encoding="utf-8",
+            )
+            cases, _meta = load_yaml_file(path)
+
+        step = cases[0].steps[0]
+        plan = step._render_plan
+        self.assertIsNotNone(plan)
+        self.assertEqual(plan.request_plan, {"body": {"sku": True}})
+        self.assertIsNone(plan.variables_plan)
+        self.assertEqual([c._render_plan.expect_plan for c in step.checks], [None, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -186,7 +186,7 @@ class RetryRunnerTests(unittest.TestCase):
 
         import time as _time
 
-        with unittest.mock.patch("drun.runner.retry.time.sleep") as mock_sleep:
+        with unittest.mock.patch("drun.runner.effects.time.sleep") as mock_sleep:
             result = runner.run_case(
                 case,
                 global_vars={},
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+import httpx
+
+from drun.engine.http import AsyncHTTPClient, HTTPClient
+from drun.engine.upload import RequestUploadError, UploadSource, build_upload_source
+from drun.models.case import Case
+from drun.models.config import Config
+from drun.models.step import Step
+from drun.runner.runner import Runner
+
+
+def _chunks(count: int, size: int = 1000):
+    for i in range(count):
+        yield bytes([i % 256]) * size
+
+
+def _echo_client(received: list) -> HTTPClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = request.read()
+        received.append((dict(request.headers), payload))
+        status = 500 if len(received) == 1 and request.url.path == "/flaky" else 200
+        return httpx.Response(status, json={"size": len(payload), "sha256": hashlib.sha256(payload).hexdigest()})
+
+    client = HTTPClient(base_url="https://example.test")
+    client.client = httpx.Client(base_url="https://example.test", transport=httpx.MockTransport(handler))
+    return client
+
+
+class UploadSourceTests(unittest.TestCase):
+    def test_generator_is_replayed_after_a_partial_read(self) -> None:
+        source, content_type = build_upload_source(_chunks(5))
+        expected = b"".join(_chunks(5))
+
+        partial = iter(source)
+        next(partial)
+        next(partial)
+        partial.close()
+
+        self.assertIsNone(content_type)
+        self.assertIsNone(source.content_length)
+        self.assertEqual(b"".join(source), expected)
+        self.assertEqual(b"".join(source), expected)
+        self.assertEqual(source.content_length, len(expected))
+
+    def test_same_generator_maps_to_the_same_source(self) -> None:
+        chunks = _chunks(3)
+
+        first, _ = build_upload_source(chunks)
+        b"".join(first)
+        second, _ = build_upload_source(chunks)
+
+        self.assertIs(first, second)
+        self.assertEqual(b"".join(second), b"".join(_chunks(3)))
+
+    def test_file_callable_and_invalid_values(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "video.mp4"
+            path.write_bytes(b"m" * 200_000)
+
+            source, content_type = build_upload_source("video.mp4", cwd=Path(tmp))
+            self.assertEqual(source.content_length, 200_000)
+            self.assertEqual(content_type, "video/mp4")
+            self.assertEqual([len(c) for c in source], [65536, 65536, 65536, 3392])
+
+            _, explicit = build_upload_source([str(path), "application/x-raw"])
+            self.assertEqual(explicit, "application/x-raw")
+
+        factory = UploadSource(factory=lambda: ["a", b"b"])
+        self.assertEqual(b"".join(factory), b"ab")
+        with self.assertRaises(RequestUploadError):
+            build_upload_source("missing.bin", cwd=Path("/nonexistent"))
+        with self.assertRaises(RequestUploadError):
+            build_upload_source({"a": 1})
+
+
+class UploadClientTests(unittest.TestCase):
+    def test_file_upload_sends_content_length_and_type(self) -> None:
+        received: list = []
+        client = _echo_client(received)
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "data.bin"
+            path.write_bytes(b"\x01" * 150_000)
+
+            result = client.request({"method": "PUT", "path": "/blob", "upload": str(path)})
+
+        headers, payload = received[0]
+        self.assertEqual(result["body"]["size"], 150_000)
+        self.assertEqual(headers["content-length"], "150000")
+        self.assertEqual(headers["content-type"], "application/octet-stream")
+        self.assertNotIn("transfer-encoding", headers)
+        client.close()
+
+    def test_upload_cannot_be_combined_with_body(self) -> None:
+        client = _echo_client([])
+        with self.assertRaises(RequestUploadError):
+            client.request({"method": "POST", "path": "/x", "upload": b"a", "body": {"a": 1}})
+        client.close()
+
+    def test_async_client_streams_generator_chunked(self) -> None:
+        received: list = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            payload = await request.aread()
+            received.append((dict(request.headers), payload))
+            return httpx.Response(200, json={"size": len(payload)})
+
+        async def main() -> dict:
+            client = AsyncHTTPClient(base_url="https://example.test")
+            client.client = httpx.AsyncClient(base_url="https://example.test", transport=httpx.MockTransport(handler))
+            try:
+                return await client.request({"method": "POST", "path": "/ingest", "upload": _chunks(4)})
+            finally:
+                await client.aclose()
+
+        result = asyncio.run(main())
+
+        self.assertEqual(result["body"]["size"], 4000)
+        self.assertEqual(received[0][0].get("transfer-encoding"), "chunked")
+
+    def test_retried_step_resends_the_whole_generator(self) -> None:
+        received: list = []
+        client = _echo_client(received)
+        step = Step.model_validate_obj({
+            "name": "Upload",
+            "retry": 1,
+            "variables": {"chunks": "${make_chunks()}"},
+            "request": {"method": "POST", "path": "/flaky", "upload": "$chunks"},
+            "check": [{"eq": ["status_code", 200]}],
+        })
+        case = Case(config=Config(name="Upload", base_url="https://example.test"), steps=[step])
+        runner = Runner(log=None)
+        runner._build_client = lambda _case: client  # type: ignore[method-assign]
+
+        result = runner.run_case(case, global_vars={}, params={}, funcs={"make_chunks": lambda: _chunks(3)})
+
+        self.assertEqual(result.status, "passed")
+        self.assertEqual([len(payload) for _headers, payload in received], [3000, 3000])
+        self.assertEqual(result.steps[0].request["upload"], {"type": "stream", "source": "generator"})
+
+
+if __name__ == "__main__":
+    unittest.main()
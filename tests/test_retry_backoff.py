@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import random
+import unittest
+from unittest.mock import patch
+
+from pydantic import ValidationError
+
+from drun.models.checks import normalize_checks
+from drun.models.request import StepRequest
+from drun.models.retry import RetryConfig, get_retry_config
+from drun.models.step import Step
+from drun.runner.retry import DEFAULT_MAX_DELAY, RetryBackoff, parse_retry_after
+from drun.runner.runner import Runner
+from drun.runner.step_lifecycle import StepLifecycle, StepLifecycleContext
+from drun.templating.context import VarContext
+
+
+class _FakeLogger:
+    def info(self, *_args, **_kwargs) -> None:
+        return None
+
+    def warning(self, *_args, **_kwargs) -> None:
+        return None
+
+    def error(self, *_args, **_kwargs) -> None:
+        return None
+
+    def debug(self, *_args, **_kwargs) -> None:
+        return None
+
+
+class RetryBackoffTests(unittest.TestCase):
+    def test_exponential_backoff_is_capped(self) -> None:
+        backoff = RetryBackoff(RetryConfig(max=6, every="100ms", backoff="exponential", max_delay="500ms"))
+
+        delays = [backoff.next_delay() for _ in range(5)]
+
+        self.assertEqual(delays, [0.1, 0.2, 0.4, 0.5, 0.5])
+        self.assertAlmostEqual(backoff.waited, 1.7)
+
+    def test_long_polls_do_not_overflow(self) -> None:
+        capped = RetryBackoff(RetryConfig(max=2000, every="100ms", backoff="exponential", max_delay="5s"))
+        uncapped = RetryBackoff(RetryConfig(max=2000, every="100ms", backoff="exponential"))
+        jitter = RetryBackoff(RetryConfig(max=2000, every="100ms", backoff="decorrelated"), rng=random.Random(1))
+
+        for _ in range(1999):
+            capped_delay = capped.next_delay()
+            uncapped_delay = uncapped.next_delay()
+            jitter_delay = jitter.next_delay()
+
+        self.assertEqual(capped_delay, 5.0)
+        self.assertEqual(uncapped_delay, DEFAULT_MAX_DELAY)
+        self.assertLessEqual(jitter_delay, DEFAULT_MAX_DELAY)
+        slow = RetryBackoff(RetryConfig(max=40, every="1s", backoff="exponential"))
+        self.assertEqual(max(slow.next_delay() for _ in range(39)), DEFAULT_MAX_DELAY)
+
+    def test_decorrelated_jitter_stays_within_bounds(self) -> None:
+        backoff = RetryBackoff(
+            RetryConfig(max=20, every="100ms", backoff="decorrelated", max_delay="2s"),
+            rng=random.Random(7),
+        )
+
+        previous = 0.1
+        for _ in range(15):
+            delay = backoff.next_delay()
+            self.assertGreaterEqual(delay, 0.1)
+            self.assertLessEqual(delay, min(previous * 3, 2.0))
+            previous = delay
+
+    def test_budget_stops_retrying(self) -> None:
+        backoff = RetryBackoff(RetryConfig(max=10, every="1s", budget="2.5s"))
+
+        self.assertEqual([backoff.next_delay() for _ in range(3)], [1.0, 1.0, None])
+        self.assertEqual(backoff.retries, 2)
+
+    def test_retry_after_on_429_and_503(self) -> None:
+        backoff = RetryBackoff(RetryConfig(max=5, every="100ms", max_delay="10s"))
+        later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+
+        self.assertEqual(backoff.next_delay({"status_code": 429, "headers": {"Retry-After": "3"}}), 3.0)
+        self.assertEqual(backoff.next_delay({"status_code": 500, "headers": {"Retry-After": "3"}}), 0.1)
+        self.assertEqual(backoff.next_delay({"status_code": 503, "headers": {"retry-after": later}}), 10.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        ignored = RetryBackoff(RetryConfig(max=2, every="100ms", retry_after=False))
+        self.assertEqual(ignored.next_delay({"status_code": 429, "headers": {"Retry-After": "3"}}), 0.1)
+
+    def test_retry_after_is_capped_and_off_for_shorthand(self) -> None:
+        huge = {"status_code": 429, "headers": {"Retry-After": "99999999999"}}
+
+        self.assertEqual(RetryBackoff(RetryConfig(max=3)).next_delay(huge), DEFAULT_MAX_DELAY)
+        self.assertEqual(RetryBackoff(get_retry_config(3)).next_delay(huge), 0.0)
+
+    def test_invalid_durations_are_rejected(self) -> None:
+        with self.assertRaises(ValidationError):
+            RetryConfig(max=3, budget="soon")
+
+
+class _ThrottledClient:
+    def __init__(self, throttled: int) -> None:
+        self.throttled = throttled
+        self.calls = 0
+
+    def request(self, req):
+        self.calls += 1
+        if self.calls <= self.throttled:
+            return {"status_code": 429, "headers": {"Retry-After": "2"}, "body": None, "elapsed_ms": 1.0}
+        return {"status_code": 200, "headers": {}, "body": {"ok": True}, "elapsed_ms": 1.0}
+
+
+class RetryLifecycleTests(unittest.TestCase):
+    def _run(self, client: _ThrottledClient, retry: RetryConfig):
+        runner = Runner(log=_FakeLogger(), failfast=False)
+        context = StepLifecycleContext(
+            step=Step(
+                name="Poll job",
+                request=StepRequest(method="GET", path="/jobs/1"),
+                checks=normalize_checks([{"eq": ["status_code", 200]}]),
+                retry=retry,
+            ),
+            step_idx=1,
+            case_name="Jobs",
+            ctx=VarContext({}),
+            global_vars={},
+            rendered_locals={},
+            funcs={},
+            envmap={},
+            client=client,
+        )
+        with patch("drun.runner.effects.time.sleep") as sleep:
+            result = StepLifecycle(runner).execute(context).results[0]
+        return result, [c.args[0] for c in sleep.call_args_list]
+
+    def test_step_honours_retry_after_and_reports_wait(self) -> None:
+        result, sleeps = self._run(_ThrottledClient(2), RetryConfig(max=5, every="100ms"))
+
+        self.assertEqual(result.status, "passed")
+        self.assertEqual(result.attempt, 3)
+        self.assertEqual(sleeps, [2.0, 2.0])
+        self.assertEqual(result.retry_wait_ms, 4000.0)
+        self.assertLess(result.duration_ms, 1000.0)
+
+    def test_budget_ends_step_before_max_attempts(self) -> None:
+        client = _ThrottledClient(10)
+        result, sleeps = self._run(client, RetryConfig(max=10, every="1s", budget="3s"))
+
+        self.assertEqual(result.status, "failed")
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(sleeps, [2.0])
+        self.assertEqual(result.retry_wait_ms, 2000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
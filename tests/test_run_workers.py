@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+import threading
+import time
+from types import SimpleNamespace
+import unittest
+
+from drun.commands.run_workers import CaseInstanceJob, ShardStop, run_case_instances, run_job_shard, split_jobs
+from drun.models.case import Case
+from drun.models.config import Config
+from drun.models.report import CaseInstanceResult, StepResult
+from drun.models.step import Step
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+class _SleepyRunner:
+    """Finishes later jobs first so completion order differs from job order."""
+
+    def __init__(self, log) -> None:
+        self.log = log
+        self.threads: set[str] = set()
+
+    def run_case(self, case, *, global_vars, params, funcs, envmap, source):
+        delay = params["delay"]
+        self.log.info("[STEP] begin %s", params["row"])
+        time.sleep(delay)
+        self.log.info("[STEP] end %s", params["row"])
+        envmap["TOUCHED"] = params["row"]
+        status = "failed" if params.get("fail") else "passed"
+        return CaseInstanceResult(
+            name=f"{case.config.name}#{params['row']}",
+            parameters=params,
+            steps=[StepResult(name="s", status=status)],
+            status=status,
+            duration_ms=delay * 1000.0,
+        )
+
+
+def _jobs(rows: list[dict]) -> list[CaseInstanceJob]:
+    case = Case(config=Config(name="Demo"), steps=[Step(name="Pause", sleep=0)])
+    return [
+        CaseInstanceJob(
+            index=idx,
+            case=case,
+            params=row,
+            source=None,
+            hooks_anchor=Path("."),
+        )
+        for idx, row in enumerate(rows)
+    ]
+
+
+class RunCaseInstancesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.log = logging.getLogger("drun.tests.run_workers")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        self.handler = _ListHandler()
+        self.log.addHandler(self.handler)
+
+    def tearDown(self) -> None:
+        self.log.removeHandler(self.handler)
+
+    def _run(self, rows, *, workers: int, failfast: bool = False, envmap=None):
+        return run_case_instances(
+            _jobs(rows),
+            runner=_SleepyRunner(self.log),
+            make_runner=_SleepyRunner,
+            global_vars={},
+            envmap=envmap if envmap is not None else {},
+            reveal_secrets=True,
+            failfast=failfast,
+            workers=workers,
+            log=self.log,
+        )
+
+    def test_parallel_results_keep_serial_order(self) -> None:
+        rows = [{"row": i, "delay": 0.05 - i * 0.01} for i in range(5)]
+
+        serial = self._run(rows, workers=1)
+        parallel = self._run(rows, workers=5)
+
+        self.assertEqual([r.name for r in parallel], [r.name for r in serial])
+
+    def test_parallel_log_lines_are_grouped_per_instance(self) -> None:
+        rows = [{"row": i, "delay": 0.03 - i * 0.01} for i in range(3)]
+
+        self._run(rows, workers=3)
+
+        steps = [m for m in self.handler.messages if m.startswith("[STEP]")]
+        for idx in range(0, len(steps), 2):
+            begin_row = steps[idx].rsplit(" ", 1)[1]
+            self.assertEqual(steps[idx + 1], f"[STEP] end {begin_row}")
+
+    def test_parallel_failfast_truncates_at_first_failure_in_job_order(self) -> None:
+        rows = [
+            {"row": 0, "delay": 0.04},
+            {"row": 1, "delay": 0.02, "fail": True},
+            {"row": 2, "delay": 0.0, "fail": True},
+            {"row": 3, "delay": 0.0},
+        ]
+
+        results = self._run(rows, workers=4, failfast=True)
+
+        self.assertEqual([r.name for r in results], ["Demo#0", "Demo#1"])
+
+    def test_parallel_instances_do_not_share_envmap(self) -> None:
+        envmap = {"BASE_URL": "http://example.test"}
+        rows = [{"row": i, "delay": 0.0} for i in range(3)]
+
+        self._run(rows, workers=3, envmap=envmap)
+
+        self.assertEqual(envmap, {"BASE_URL": "http://example.test"})
+
+    def test_parallel_mode_runs_on_worker_threads(self) -> None:
+        seen: set[str] = set()
+
+        class _ThreadRecordingRunner(_SleepyRunner):
+            def run_case(self, case, **kwargs):
+                seen.add(threading.current_thread().name)
+                return super().run_case(case, **kwargs)
+
+        run_case_instances(
+            _jobs([{"row": i, "delay": 0.01} for i in range(4)]),
+            runner=_ThreadRecordingRunner(self.log),
+            make_runner=_ThreadRecordingRunner,
+            global_vars={},
+            envmap={},
+            reveal_secrets=True,
+            failfast=False,
+            workers=2,
+            log=self.log,
+        )
+
+        self.assertTrue(seen)
+        self.assertTrue(all(name.startswith("drun-case") for name in seen))
+
+    def test_split_jobs_covers_every_job_in_order(self) -> None:
+        jobs = _jobs([{"row": i, "delay": 0.0} for i in range(10)])
+
+        shards = split_jobs(jobs, 2)
+
+        self.assertEqual(len(shards), 8)
+        self.assertEqual([job.index for shard in shards for job in shard], list(range(10)))
+
+    def test_process_mode_merges_results_and_logs_in_job_order(self) -> None:
+        rows = [{"row": i} for i in range(4)]
+
+        results = run_case_instances(
+            _jobs(rows),
+            runner=None,
+            make_runner=_SleepyRunner,
+            global_vars={},
+            envmap={},
+            reveal_secrets=True,
+            failfast=False,
+            workers=2,
+            log=self.log,
+            mode="process",
+            runner_options={},
+        )
+
+        self.assertEqual([r.parameters["row"] for r in results], [0, 1, 2, 3])
+        self.assertTrue(all(r.status == "passed" for r in results))
+        starts = [m for m in self.handler.messages if m.startswith("[CASE] Start")]
+        self.assertEqual(len(starts), 4)
+        self.assertIn("'row': 0", starts[0])
+        self.assertIn("'row': 3", starts[-1])
+
+    def test_process_failfast_stops_later_shards_only(self) -> None:
+        stop = ShardStop(SimpleNamespace(value=8), threading.Lock())
+        stop.mark_failed(3)
+        stop.mark_failed(5)
+
+        self.assertEqual(stop.first_failed.value, 3)
+        self.assertFalse(stop.should_stop(2))
+        self.assertFalse(stop.should_stop(3))
+        self.assertTrue(stop.should_stop(4))
+
+        shard = _jobs([{"row": 0}, {"row": 1}])
+        options = dict(
+            runner_options={},
+            global_vars={},
+            envmap={},
+            reveal_secrets=True,
+            failfast=True,
+            log_name=self.log.name,
+            stop=stop,
+        )
+        earlier, _ = run_job_shard(shard, shard=1, **options)
+        later, records = run_job_shard(shard, shard=4, **options)
+
+        self.assertEqual(len(earlier), 2)
+        self.assertEqual((later, records), ([], []))
+
+    def test_async_mode_keeps_job_order_and_caps_concurrency(self) -> None:
+        rows = [{"row": i} for i in range(6)]
+
+        results = run_case_instances(
+            _jobs(rows),
+            runner=None,
+            make_runner=_SleepyRunner,
+            global_vars={},
+            envmap={},
+            reveal_secrets=True,
+            failfast=False,
+            workers=3,
+            log=self.log,
+            mode="async",
+            runner_options={},
+        )
+
+        self.assertEqual([r.parameters["row"] for r in results], list(range(6)))
+        self.assertTrue(all(r.status == "passed" for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
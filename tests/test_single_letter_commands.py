@@ -27,6 +27,8 @@ SINGLE_LETTER_COMMANDS = {
     "s": "server",
     "o": "convert",
     "w": "convert-openapi",
+    "l": "load",
+    "d": "worker",
 }
 
 
@@ -80,7 +82,7 @@ class SingleLetterCommandHelpTests(unittest.TestCase):
         result = runner.invoke(cli.app, ["--help"])
         self.assertEqual(result.exit_code, 0)
         out = result.stdout
-        for letter in ("i", "r", "c", "f", "t", "q", "e", "s", "o", "w"):
+        for letter in ("i", "r", "c", "f", "t", "q", "e", "s", "o", "w", "l", "d"):
             with self.subTest(letter=letter):
                 self.assertIn(
                     f"\n  {letter}",
@@ -168,6 +170,16 @@ class LongNameRejectedTests(unittest.TestCase):
         result = runner.invoke(cli.app, ["export", "tc_demo.yaml"])
         self._assert_renamed_hint(result, "export", "e")
 
+    def test_long_load_is_rejected(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(cli.app, ["load", "tcases"])
+        self._assert_renamed_hint(result, "load", "l")
+
+    def test_long_worker_is_rejected(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(cli.app, ["worker", "http://127.0.0.1:8765"])
+        self._assert_renamed_hint(result, "worker", "d")
+
 
 class ExportDefaultToCurlTests(unittest.TestCase):
     """Q5=A: `drun e` should default to export curl."""
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import pickle
+import unittest
+
+import httpx
+
+from drun.engine.http import HTTPClient, _SSEStreamParser
+from drun.models.request import StepRequest
+
+
+def _feed_tokens(parser: _SSEStreamParser, tokens) -> None:
+    for token in tokens:
+        parser.feed("data: " + json.dumps({"choices": [{"delta": {"content": token}}]}))
+        parser.feed("")
+    parser.feed("data: [DONE]")
+    parser.feed("")
+
+
+class SSEStreamParserTests(unittest.TestCase):
+    def test_merged_content_and_progressive_deltas(self) -> None:
+        parser = _SSEStreamParser(0.0)
+        _feed_tokens(parser, ["He", "llo", " world"])
+
+        result = parser.result()
+
+        self.assertEqual(result["stream_content"], "Hello world")
+        self.assertEqual(
+            [(p["offset"], p["delta"]) for p in result["progressive_content"]],
+            [(0, "He"), (2, "llo"), (5, " world")],
+        )
+        self.assertEqual(len(result["stream_events"]), 4)
+        self.assertEqual(len(result["stream_raw_chunks"]), 8)
+        summary = result["stream_summary"]
+        self.assertEqual(summary["event_count"], 4)
+        self.assertEqual(summary["retained_events"], 4)
+        self.assertEqual(summary["content_length"], len("Hello world"))
+        self.assertEqual(summary["inter_event_ms"]["count"], 3)
+        self.assertLessEqual(summary["inter_event_ms"]["min"], summary["inter_event_ms"]["max"])
+
+    def test_progressive_entries_keep_accumulated_content(self) -> None:
+        parser = _SSEStreamParser(0.0)
+        _feed_tokens(parser, ["He", "llo", " world"])
+
+        progressive = parser.result()["progressive_content"]
+
+        self.assertEqual([p["content"] for p in progressive], ["He", "Hello", "Hello world"])
+        self.assertEqual(progressive[1].get("content"), "Hello")
+        # Snapshots are computed on access only, never serialized.
+        self.assertEqual(
+            json.loads(json.dumps(progressive))[1],
+            {"index": 2, "timestamp_ms": progressive[1]["timestamp_ms"], "offset": 2, "delta": "llo"},
+        )
+        self.assertNotIn("content", dict(progressive[2]))
+        self.assertEqual(pickle.loads(pickle.dumps(progressive))[2]["content"], "Hello world")
+
+    def test_keep_n_retains_first_and_last_events(self) -> None:
+        parser = _SSEStreamParser(0.0, keep=2)
+        _feed_tokens(parser, [str(i) for i in range(10)])
+
+        result = parser.result()
+
+        self.assertEqual([e["index"] for e in result["stream_events"]], [0, 1, 9, 10])
+        self.assertEqual(result["stream_content"], "0123456789")
+        self.assertEqual(result["progressive_content"], [])
+        self.assertEqual(result["stream_summary"]["event_count"], 11)
+        self.assertEqual(result["stream_summary"]["retained_events"], 4)
+        raw = "".join(result["stream_raw_chunks"])
+        self.assertIn(": 7 events omitted", raw)
+        self.assertTrue(raw.startswith('data: {"choices": [{"delta": {"content": "0"}}]}\n\n'))
+        self.assertTrue(raw.endswith("data: [DONE]\n\n"))
+
+    def test_summary_keeps_no_events(self) -> None:
+        parser = _SSEStreamParser(0.0, keep="summary")
+        _feed_tokens(parser, ["a", "b"])
+
+        result = parser.result()
+
+        self.assertEqual(result["stream_events"], [])
+        self.assertEqual(result["stream_raw_chunks"], [])
+        self.assertEqual(result["stream_content"], "ab")
+        self.assertEqual(result["stream_summary"]["event_count"], 3)
+
+    def test_client_passes_stream_keep_to_the_parser(self) -> None:
+        payload = "".join(f"data: {i}\n\n" for i in range(5))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=payload.encode("utf-8"), headers={"content-type": "text/event-stream"})
+
+        client = HTTPClient(base_url="https://example.test")
+        client.client = httpx.Client(base_url="https://example.test", transport=httpx.MockTransport(handler))
+
+        result = client.request({"method": "GET", "path": "/events", "stream": True, "stream_keep": 1})
+
+        self.assertEqual([e["data"] for e in result["stream_events"]], [0, 4])
+        self.assertEqual(result["stream_summary"]["event_count"], 5)
+        client.close()
+
+    def test_stream_keep_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            StepRequest(method="GET", path="/events", stream_keep=0)
+        self.assertEqual(StepRequest(method="GET", path="/e", stream_keep="summary").stream_keep, "summary")
+
+
+if __name__ == "__main__":
+    unittest.main()
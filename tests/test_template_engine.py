@@ -7,7 +7,12 @@ from drun.models.config import Config
 from drun.models.request import StepRequest
 from drun.models.step import Step
 from drun.runner.runner import Runner
-from drun.templating.engine import TemplateEngine, UnresolvedVarError
+from drun.templating.engine import (
+    TemplateEngine,
+    UnresolvedVarError,
+    _compile_expression,
+    _tokenize_template,
+)
 
 
 class TemplateEngineStrictModeTests(unittest.TestCase):
@@ -52,6 +57,59 @@ class TemplateEngineStrictModeTests(unittest.TestCase):
         self.assertEqual(rendered, "https://x/${missing_var}")
 
 
+class TemplateCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = TemplateEngine()
+
+    def test_expression_is_parsed_once_across_renders(self) -> None:
+        _compile_expression.cache_clear()
+
+        for value in range(3):
+            self.assertEqual(self.engine.render_value("${n + 1}", {"n": value}), value + 1)
+
+        info = _compile_expression.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertGreaterEqual(info.hits, 2)
+
+    def test_interpolated_template_is_tokenized_once(self) -> None:
+        _tokenize_template.cache_clear()
+
+        first = self.engine.render_value("/users/${uid}/orders/${oid}", {"uid": 1, "oid": 2})
+        second = self.engine.render_value("/users/${uid}/orders/${oid}", {"uid": 3, "oid": 4})
+
+        self.assertEqual((first, second), ("/users/1/orders/2", "/users/3/orders/4"))
+        self.assertEqual(_tokenize_template.cache_info().misses, 1)
+        self.assertEqual(
+            _tokenize_template("a${x}b"),
+            ((False, "a"), (True, "x"), (False, "b")),
+        )
+
+    def test_cached_syntax_error_is_raised_on_every_render(self) -> None:
+        for _ in range(2):
+            with self.assertRaises(SyntaxError):
+                self.engine.render_value("${1 +}", {}, strict=True)
+
+    def test_env_literal_argument_is_not_reported_missing(self) -> None:
+        rendered = self.engine.render_value("${ENV(API_KEY)}", {}, envmap={"API_KEY": "k"}, strict=True)
+
+        self.assertEqual(rendered, "k")
+
+    def test_context_layers_variables_without_copying_them(self) -> None:
+        variables = {"now": "frozen", "name": "Ada"}
+        ctx = self.engine._build_context(variables, {"name": lambda: "func"}, extra_ctx={"extra": 1})
+
+        variables["late"] = "seen"
+
+        self.assertEqual(ctx["now"], "frozen")
+        self.assertEqual(ctx["name"], "Ada")
+        self.assertEqual(ctx["late"], "seen")
+        self.assertIn("ENV", ctx)
+        self.assertEqual(
+            self.engine.render_value({"a": ["${name}", {"b": "${now}"}]}, variables),
+            {"a": ["Ada", {"b": "frozen"}]},
+        )
+
+
 class _FakeHTTPClient:
     def __init__(self) -> None:
         self.request_called = False
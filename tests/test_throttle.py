@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from drun.commands.run import _apply_host_limit_defaults
+from drun.engine.http import AsyncHTTPClient, HTTPClient
+from drun.engine.pool import ClientPool
+from drun.engine.throttle import HostThrottle, RateLimitError, TokenBucket, parse_rate
+from drun.models.case import Case
+from drun.models.config import Config
+from drun.runner.runner import Runner
+from drun.templating.engine import TemplateEngine
+
+
+class _ConcurrencyProbe:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return httpx.Response(200, json={"ok": True})
+
+
+class ThrottleTests(unittest.TestCase):
+    def test_parse_rate(self) -> None:
+        self.assertEqual(parse_rate("200/s"), (200.0, 1.0))
+        self.assertEqual(parse_rate("10/min"), (10.0, 60.0))
+        self.assertEqual(parse_rate("5 / 100ms"), (5.0, 0.1))
+        self.assertEqual(parse_rate("1/2s"), (1.0, 2.0))
+        for bad in ("200", "fast", "0/s", "10/day"):
+            with self.subTest(spec=bad), self.assertRaises(RateLimitError):
+                parse_rate(bad)
+
+    def test_token_bucket_allows_burst_then_paces(self) -> None:
+        bucket = TokenBucket(2, 1.0)
+
+        delays = [bucket.reserve() for _ in range(4)]
+
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.5, places=2)
+        self.assertAlmostEqual(delays[3], 1.0, places=2)
+
+    def test_strictest_registration_wins_and_survives_pickling(self) -> None:
+        throttle = HostThrottle()
+        throttle.configure("https://api.test/v1", rate_limit="100/s", concurrency=8)
+        throttle.configure("https://API.test:443", rate_limit="10/s")
+        throttle.configure("https://api.test", rate_limit="50/s", concurrency=4)
+
+        restored = pickle.loads(pickle.dumps(throttle))
+
+        for registry in (throttle, restored):
+            limit = registry.for_host("api.test:443")
+            self.assertEqual(limit.bucket.rate, 10.0)
+            self.assertEqual(limit.concurrency, 4)
+        self.assertIsNone(throttle.for_host("other.test:443"))
+
+    def test_client_waits_for_tokens_and_reports_throttle_time(self) -> None:
+        throttle = HostThrottle()
+        throttle.configure("http://api.test", rate_limit="1/100ms")
+        client = HTTPClient(
+            base_url="http://api.test",
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})),
+            throttle=throttle,
+        )
+        try:
+            first = client.request({"method": "GET", "path": "/a"})
+            second = client.request({"method": "GET", "path": "/b"})
+            other_host = client.request({"method": "GET", "path": "http://other.test/c"})
+        finally:
+            client.close()
+
+        self.assertLess(first["timing"]["throttle_ms"], 20.0)
+        self.assertGreater(second["timing"]["throttle_ms"], 60.0)
+        self.assertLess(second["elapsed_ms"], 60.0)
+        self.assertIsNone(other_host["timing"]["throttle_ms"])
+
+    def test_host_concurrency_is_shared_across_clients(self) -> None:
+        probe = _ConcurrencyProbe(delay=0.02)
+        pool = ClientPool()
+        runner = Runner(log=None, client_pool=pool)
+        case = Case(config=Config(base_url="http://api.test", host_concurrency=2), steps=[])
+        with patch.object(pool, "transport", return_value=httpx.MockTransport(probe)):
+            clients = [runner._build_client(case) for _ in range(6)]
+
+        threads = [
+            threading.Thread(target=client.request, args=({"method": "GET", "path": "/"},))
+            for client in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for client in clients:
+            client.close()
+        pool.close()
+
+        self.assertEqual(probe.peak, 2)
+
+    def test_async_client_respects_concurrency(self) -> None:
+        peak = 0
+        active = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal peak, active
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json={})
+
+        async def main() -> list:
+            throttle = HostThrottle()
+            throttle.configure("http://api.test", concurrency=3)
+            client = AsyncHTTPClient(
+                base_url="http://api.test", transport=httpx.MockTransport(handler), throttle=throttle
+            )
+            try:
+                return await asyncio.gather(
+                    *(client.request({"method": "GET", "path": "/"}) for _ in range(10))
+                )
+            finally:
+                await client.aclose()
+
+        results = asyncio.run(main())
+
+        self.assertEqual(peak, 3)
+        self.assertTrue(all(r["timing"]["throttle_ms"] is not None for r in results))
+
+    def test_env_file_defaults_fill_case_config(self) -> None:
+        config = Config(base_url="http://api.test")
+        _apply_host_limit_defaults(
+            config, {}, {"RATE_LIMIT": "20/s", "HOST_CONCURRENCY": "5"}, TemplateEngine(), None
+        )
+        self.assertEqual((config.rate_limit, config.host_concurrency), ("20/s", 5))
+
+        explicit = Config(base_url="http://api.test", rate_limit="1/s")
+        _apply_host_limit_defaults(explicit, {}, {"RATE_LIMIT": "20/s"}, TemplateEngine(), None)
+        self.assertEqual(explicit.rate_limit, "1/s")
+        with self.assertRaises(ValueError):
+            _apply_host_limit_defaults(Config(), {}, {"RATE_LIMIT": "lots"}, TemplateEngine(), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import unittest
+
+from drun.runner.hooks import run_setup_hooks, run_teardown_hooks
+from drun.templating.context import VarContext
+from drun.templating.engine import TemplateEngine
+
+
+class VarContextMergeTests(unittest.TestCase):
+    def test_merged_view_is_reused_until_a_layer_changes(self) -> None:
+        ctx = VarContext({"a": 1})
+        overrides = {"cli": True}
+
+        first = ctx.get_merged(overrides)
+
+        self.assertIs(ctx.get_merged(overrides), first)
+        ctx.set_base("token", "t-1")
+        second = ctx.get_merged(overrides)
+        self.assertIsNot(second, first)
+        self.assertEqual(second, {"a": 1, "token": "t-1", "cli": True})
+        self.assertNotIn("token", first)
+
+    def test_push_pop_and_overrides_keep_precedence(self) -> None:
+        ctx = VarContext({"name": "base", "keep": 1})
+        overrides = {"name": "cli"}
+
+        ctx.push({"name": "step", "local": 2})
+        self.assertEqual(ctx.get_merged(), {"name": "step", "keep": 1, "local": 2})
+        self.assertEqual(ctx.get_merged(overrides)["name"], "cli")
+        ctx.set("local", 3)
+        self.assertEqual(ctx.get_merged()["local"], 3)
+        ctx.pop()
+
+        self.assertEqual(ctx.get_merged(), {"name": "base", "keep": 1})
+        self.assertEqual(ctx.get_merged({"keep": 9})["keep"], 9)
+
+    def test_hooks_cannot_modify_the_shared_view(self) -> None:
+        ctx = VarContext({"a": 1})
+        merged = ctx.get_merged({})
+
+        def scribble(variables, step_variables, session_variables):
+            variables["a"] = "changed"
+            step_variables["a"] = "step"
+            session_variables["b"] = "added"
+
+        run_setup_hooks(
+            names=["${scribble(variables, step_variables, session_variables)}"],
+            funcs={"scribble": scribble},
+            req={},
+            variables=merged,
+            envmap={},
+            meta={"step_variables": merged, "session_variables": merged},
+            templater=TemplateEngine(),
+            log=None,
+            fmt_aligned=None,
+        )
+
+        self.assertEqual(ctx.get_merged({}), {"a": 1})
+
+        run_teardown_hooks(
+            names=["${scribble(variables, step_variables, session_variables)}"],
+            funcs={"scribble": scribble},
+            resp={},
+            variables=merged,
+            envmap={},
+            meta={"step_variables": merged, "session_variables": merged},
+            templater=TemplateEngine(),
+            log=None,
+            fmt_aligned=None,
+        )
+
+        self.assertEqual(ctx.get_merged({}), {"a": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from drun.loader import cache as load_cache
+from drun.loader import yaml_loader
+from drun.loader.yaml_loader import collect_yaml_diagnostics, load_yaml_file
+
+
+CASE_YAML = """config:
+  name: Cached
+  base_url: http://api.test
+
+steps:
+  - name: Get user
+    request:
+      method: GET
+      path: /users/${user_id}
+    check:
+      - eq: [status_code, 200]
+"""
+
+
+class YamlLoadCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.cache_root = self.root / "cache"
+        self.case_path = self.root / "tcases" / "tc_cached.yaml"
+        self.case_path.parent.mkdir()
+        self.case_path.write_text(CASE_YAML, encoding="utf-8")
+        env = patch.dict(os.environ, {"DRUN_CACHE_DIR": str(self.cache_root)})
+        env.start()
+        os.environ.pop("DRUN_NO_CACHE", None)
+        self.addCleanup(env.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def _count_validations(self):
+        return patch.object(
+            yaml_loader, "_build_cases_from_obj", side_effect=yaml_loader._build_cases_from_obj
+        )
+
+    def test_unchanged_file_is_served_from_cache(self) -> None:
+        with self._count_validations() as build:
+            first, meta = load_yaml_file(self.case_path)
+            second, second_meta = load_yaml_file(self.case_path)
+
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(second_meta, meta)
+        self.assertIsNot(second[0], first[0])
+        self.assertIsNotNone(second[0].steps[0]._render_plan)
+        self.assertEqual(len(list(self.cache_root.rglob("*.pickle"))), 1)
+
+    def test_edit_or_version_change_invalidates(self) -> None:
+        load_yaml_file(self.case_path)
+        self.case_path.write_text(CASE_YAML.replace("Cached", "Edited"), encoding="utf-8")
+
+        cases, _ = load_yaml_file(self.case_path)
+        self.assertEqual(cases[0].config.name, "Edited")
+
+        with patch.object(load_cache, "__version__", "0.0.0-other"), self._count_validations() as build:
+            load_yaml_file(self.case_path)
+        self.assertEqual(build.call_count, 1)
+
+        # Editing the models in a dev install changes the fingerprint, not the version.
+        with patch.object(load_cache, "schema_fingerprint", return_value="edited"), self._count_validations() as build:
+            load_yaml_file(self.case_path)
+        self.assertEqual(build.call_count, 1)
+
+    def test_default_cache_is_per_user_not_in_the_project(self) -> None:
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": str(self.root / "xdg")}):
+            os.environ.pop("DRUN_CACHE_DIR")
+            self.assertEqual(load_cache.cache_dir(), self.root / "xdg" / "drun" / "yaml")
+        self.assertNotEqual(load_cache.default_cache_dir().resolve(), (Path.cwd() / ".drun" / "cache").resolve())
+        self.assertEqual(load_cache.schema_fingerprint(), load_cache.schema_fingerprint())
+
+    def test_diagnostics_are_cached(self) -> None:
+        broken = self.root / "tcases" / "tc_broken.yaml"
+        broken.write_text("config:\n  name: Broken\nsteps: 3\n", encoding="utf-8")
+
+        first = collect_yaml_diagnostics(broken)
+        with patch.object(yaml_loader, "_collect_common_diagnostics") as collect:
+            second = collect_yaml_diagnostics(broken)
+
+        collect.assert_not_called()
+        self.assertTrue(first)
+        self.assertEqual(second, first)
+
+    def test_disabled_or_unwritable_cache_falls_back_to_loading(self) -> None:
+        with patch.dict(os.environ, {"DRUN_NO_CACHE": "1"}):
+            load_yaml_file(self.case_path)
+        self.assertFalse(self.cache_root.exists())
+
+        self.cache_root.write_text("not a directory", encoding="utf-8")
+        with self._count_validations() as build:
+            load_yaml_file(self.case_path)
+            cases, _ = load_yaml_file(self.case_path)
+        self.assertEqual(build.call_count, 2)
+        self.assertEqual(cases[0].config.name, "Cached")
+
+
+if __name__ == "__main__":
+    unittest.main()